@@ -0,0 +1,71 @@
+"""
+The benchmark suite as pytest-benchmark tests, so its results can be saved and compared
+with pytest-benchmark's own options. The scale is read from RITMO_BENCHMARK_SCALE.
+
+Usage: RITMO_BENCHMARK_SCALE=small python -m pytest benchmarks/bench_commands.py
+           [--benchmark-autosave] [--benchmark-compare] [--benchmark-json results.json]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from itertools import count
+
+import pytest
+
+from benchmarks.generate import SCALES, generate_database, get_habit_name
+from benchmarks.suite import CASES
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+HABITS, LOGS = SCALES[os.environ.get("RITMO_BENCHMARK_SCALE", "tiny")]
+
+ROUNDS = min(20, HABITS)
+
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("benchmarks") / "generated.db"
+    generate_database(db_path, HABITS, LOGS)
+    return db_path
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case.name)
+def test_command(benchmark, database, tmp_path, case):
+    db_path = tmp_path / "ritmo.db"
+    shutil.copy(database, db_path)
+    session = create_session(f"sqlite:///{db_path}")
+    runs = count()
+    sessions = []
+
+    def setup():
+        i = next(runs)
+        name = get_habit_name(i)
+        if case.setup:
+            with session() as sess:
+                case.setup(sess, name)
+
+        sessions.append(session())
+        return (sessions[-1], name, i), {}
+
+    benchmark.pedantic(case.run, setup=setup, rounds=ROUNDS)
+
+    for sess in sessions:
+        sess.close()
+    dispose_engines()
+
+
+@pytest.mark.parametrize("command", ["--help", "today"])
+def test_cold_start(benchmark, database, tmp_path, command):
+    config_folder = tmp_path / ".ritmo"
+    config_folder.mkdir()
+    shutil.copy(database, config_folder / "ritmo.db")
+    env = {**os.environ, "HOME": str(tmp_path), "RITMO_NO_DAEMON": "1"}
+
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-m", "ritmo.cli", command],),
+        kwargs={"env": env, "capture_output": True, "check": True},
+        rounds=5,
+    )
@@ -0,0 +1,187 @@
+"""
+Database size and read latency before and after `ritmo compact`, on a database upgraded
+to one log per day whose original logs of each completion were kept in the archive
+table, and with that history moved to a separate archive file.
+
+Usage: python -m benchmarks.bench_compact [--habits 50] [--days 730] [--per-day 5] [--repeat 5]
+"""
+
+import argparse
+import datetime
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from ritmo.analytics import completion_report
+from ritmo.commands.calendar_heatmap import load_year
+from ritmo.commands.compact import compact_logs, compact_to_file, optimize_database
+from ritmo.service import get_day_logs
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+from ritmo.stats import check_rollups, rebuild_rollups
+
+FIRST_DATE = datetime.date(2020, 1, 1)
+
+
+def populate(db_path: Path, habits: int, days: int, per_day: int) -> None:
+    """
+    Create a database where every habit is completed a number of times on each day,
+    with a log per day and the original log of each completion in the archive table.
+    """
+
+    create_session(f"sqlite:///{db_path}")
+    dispose_engines()
+
+    dates = [
+        (FIRST_DATE + datetime.timedelta(days=day)).isoformat() for day in range(days)
+    ]
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO habits (id, name, type, start_date) VALUES (?, ?, 'numerical', ?)",
+        ((i, f"habit-{i}", FIRST_DATE.isoformat()) for i in range(1, habits + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO habit_logs (habit_id, date, completed, completed_at, count) VALUES (?, ?, 1, ?, ?)",
+        (
+            (habit_id, date, date, per_day)
+            for date in dates
+            for habit_id in range(1, habits + 1)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO habit_logs_archive (habit_id, date, completed, completed_at, count) VALUES (?, ?, 1, ?, 1)",
+        (
+            (habit_id, date, date)
+            for date in dates
+            for habit_id in range(1, habits + 1)
+            for _ in range(per_day)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+    session = create_session(f"sqlite:///{db_path}")
+    with session.begin() as sess:
+        rebuild_rollups(sess)
+    optimize_database(session.kw["bind"])
+    dispose_engines()
+
+
+def get_size(*paths: Path) -> float:
+    """
+    Return the total size in MiB of database files and their write-ahead logs.
+    """
+
+    return (
+        sum(
+            path.with_name(path.name + suffix).stat().st_size
+            for path in paths
+            for suffix in ("", "-wal")
+            if path.with_name(path.name + suffix).exists()
+        )
+        / 2**20
+    )
+
+
+def measure(db_path: Path, days: int, repeat: int) -> dict[str, float]:
+    """
+    Return the best time in milliseconds of each read of the logs.
+    """
+
+    last_date = FIRST_DATE + datetime.timedelta(days=days - 1)
+    reads = {
+        "day logs": lambda sess: get_day_logs(sess, FIRST_DATE),
+        "report": lambda sess: completion_report(sess, FIRST_DATE, last_date),
+        "calendar": lambda sess: load_year(sess, FIRST_DATE.year),
+        "check stats": check_rollups,
+    }
+
+    session = create_session(f"sqlite:///{db_path}")
+    timings = {}
+    for name, read in reads.items():
+        best = float("inf")
+        for _ in range(repeat):
+            with session() as sess:
+                start = time.perf_counter()
+                read(sess)
+                best = min(best, time.perf_counter() - start)
+        timings[name] = best * 1000
+
+    dispose_engines()
+    return timings
+
+
+def compact(db_path: Path, before: datetime.date, archive_path: Path | None) -> float:
+    """
+    Compact the logs before a date and return the time it took in seconds.
+    """
+
+    session = create_session(f"sqlite:///{db_path}")
+    engine = session.kw["bind"]
+
+    start = time.perf_counter()
+    if archive_path:
+        with engine.connect() as conn:
+            compact_to_file(conn, before, archive_path)
+    else:
+        with session.begin() as sess:
+            compact_logs(sess, before)
+    optimize_database(engine)
+    elapsed = time.perf_counter() - start
+
+    dispose_engines()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=50)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--per-day", type=int, default=5)
+    parser.add_argument("--keep-days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    before = FIRST_DATE + datetime.timedelta(days=args.days - args.keep_days)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        original = Path(tmp_dir) / "original.db"
+        archive_path = Path(tmp_dir) / "archive.db"
+        populate(original, args.habits, args.days, args.per_day)
+
+        results = {
+            "original": (
+                0.0,
+                get_size(original),
+                measure(original, args.days, args.repeat),
+            )
+        }
+        for name, archive in (("archive table", None), ("archive file", archive_path)):
+            db_path = Path(tmp_dir) / f"{name.replace(' ', '-')}.db"
+            shutil.copy(original, db_path)
+            elapsed = compact(db_path, before, archive)
+            results[name] = (
+                elapsed,
+                get_size(db_path),
+                measure(db_path, args.days, args.repeat),
+            )
+
+        archive_size = get_size(archive_path)
+
+    reads = list(results["original"][2])
+    print(
+        f"{'database':<14} {'compact (s)':>12} {'size (MiB)':>10} "
+        + " ".join(f"{read + ' (ms)':>16}" for read in reads)
+    )
+    for name, (elapsed, size, timings) in results.items():
+        print(
+            f"{name:<14} {elapsed:>12.2f} {size:>10.1f} "
+            + " ".join(f"{timings[read]:>16.2f}" for read in reads)
+        )
+    print(f"Size of the archive file: {archive_size:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
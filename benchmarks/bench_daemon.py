@@ -0,0 +1,65 @@
+"""
+End-to-end latency of `ritmo done` run directly against the database versus forwarded
+to a running `ritmo serve` daemon.
+
+Usage: python -m benchmarks.bench_daemon [--runs 20]
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_startup import wall_clock
+
+
+def start_daemon(env: dict[str, str]) -> subprocess.Popen:
+    """
+    Start `ritmo serve` and wait until it listens on its socket.
+    """
+
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "ritmo.cli", "serve"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    socket_path = Path(env["HOME"]) / ".ritmo" / "ritmo.sock"
+    while not socket_path.exists():
+        time.sleep(0.01)
+
+    return daemon
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home_dir:
+        env = {**os.environ, "HOME": home_dir}
+        subprocess.run(
+            [sys.executable, "-m", "ritmo.cli", "add", "benchmark", "-t", "numerical"],
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+
+        command = ["done", "benchmark"]
+        direct = wall_clock(command, {**env, "RITMO_NO_DAEMON": "1"}, args.runs)
+        print(f"{'direct':<10} {direct:>8.1f} ms")
+
+        daemon = start_daemon(env)
+        try:
+            forwarded = wall_clock(command, env, args.runs)
+        finally:
+            daemon.send_signal(signal.SIGINT)
+            daemon.wait()
+        print(f"{'daemon':<10} {forwarded:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
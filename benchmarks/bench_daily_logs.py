@@ -0,0 +1,113 @@
+"""
+Write throughput and table size of numerical habits stored as one log per completion,
+as ritmo used to, versus one log per habit and day updated with an upsert.
+
+Usage: python -m benchmarks.bench_daily_logs [--habits 10] [--days 365] [--per-day 8]
+"""
+
+import argparse
+import datetime
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Sequence
+
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+FIRST_DATE = datetime.date(2020, 1, 1)
+
+# Schema of habit_logs before the count column and the unique index were added.
+PER_COMPLETION_SCHEMA = """
+CREATE TABLE habit_logs (
+    id INTEGER NOT NULL PRIMARY KEY,
+    habit_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    completed BOOLEAN NOT NULL,
+    completed_at DATE NOT NULL
+);
+CREATE INDEX ix_habit_logs_habit_id_date ON habit_logs (habit_id, date);
+"""
+
+PER_COMPLETION_INSERT = (
+    "INSERT INTO habit_logs (habit_id, date, completed, completed_at) "
+    "VALUES (?, ?, 1, ?)"
+)
+
+PER_DAY_UPSERT = (
+    "INSERT INTO habit_logs (habit_id, date, completed, completed_at, count) "
+    "VALUES (?, ?, 1, ?, 1) "
+    "ON CONFLICT (habit_id, date) DO UPDATE SET count = count + 1, "
+    "completed_at = excluded.completed_at"
+)
+
+
+def create_database(db_path: Path, per_day: bool) -> None:
+    if per_day:
+        create_session(f"sqlite:///{db_path}")
+        dispose_engines()
+    else:
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(PER_COMPLETION_SCHEMA)
+        conn.close()
+
+
+def write(db_path: Path, statement: str, completions: Sequence[tuple]) -> float:
+    """
+    Write each completion in its own transaction, like one `ritmo done` per completion,
+    and return the number of completions written per second.
+    """
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = wal")
+    conn.execute("PRAGMA synchronous = normal")
+
+    start = time.perf_counter()
+    for completion in completions:
+        conn.execute("BEGIN")
+        conn.execute(statement, completion)
+        conn.execute("COMMIT")
+    elapsed = time.perf_counter() - start
+
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return len(completions) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=10)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--per-day", type=int, default=8)
+    args = parser.parse_args()
+
+    completions = [
+        (habit_id, date, date)
+        for day in range(args.days)
+        for date in [(FIRST_DATE + datetime.timedelta(days=day)).isoformat()]
+        for habit_id in range(1, args.habits + 1)
+        for _ in range(args.per_day)
+    ]
+
+    print(f"{'model':<16} {'rows':>10} {'writes/s':>10} {'size (MiB)':>11}")
+    for model, per_day, statement in (
+        ("per completion", False, PER_COMPLETION_INSERT),
+        ("per day", True, PER_DAY_UPSERT),
+    ):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = Path(tmp_dir) / "ritmo.db"
+            create_database(db_path, per_day)
+            throughput = write(db_path, statement, completions)
+
+            with sqlite3.connect(db_path) as conn:
+                (rows,) = conn.execute("SELECT COUNT(*) FROM habit_logs").fetchone()
+            conn.close()
+            size = db_path.stat().st_size / 2**20
+
+        print(f"{model:<16} {rows:>10} {throughput:>10.0f} {size:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
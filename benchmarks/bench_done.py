@@ -0,0 +1,74 @@
+"""
+Time marking many habits as done at the end of the day, one habit per transaction as
+shell hooks used to do, versus a single batched transaction.
+
+Usage: python -m benchmarks.bench_done [--habits 40] [--days 1] [--repeat 5]
+"""
+
+import argparse
+import datetime
+import tempfile
+import time
+from pathlib import Path
+
+from ritmo.models import Habit
+from ritmo.service import mark_many_as_done
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+
+def per_habit(path: str, names: list[str], dates: list[datetime.date]) -> None:
+    """
+    Mark each habit as done with its own session and commit, like one process per habit.
+    """
+
+    for name in names:
+        for date in dates:
+            with create_session(path).begin() as sess:
+                mark_many_as_done(sess, [name], [date])
+
+
+def batched(path: str, names: list[str], dates: list[datetime.date]) -> None:
+    with create_session(path).begin() as sess:
+        mark_many_as_done(sess, names, dates)
+
+
+def measure(mark, habits: int, days: int, repeat: int) -> float:
+    """
+    Return the best time of marking every habit as done on some days.
+    """
+
+    names = [f"Habit {i}" for i in range(habits)]
+    today = datetime.datetime.utcnow().date()
+    dates = [today - datetime.timedelta(days=offset) for offset in range(days)]
+    best = float("inf")
+
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = f"sqlite:///{Path(tmp_dir) / 'ritmo.db'}"
+            with create_session(path).begin() as sess:
+                sess.add_all(Habit(name=name, type="numerical") for name in names)
+
+            start = time.perf_counter()
+            mark(path, names, dates)
+            best = min(best, time.perf_counter() - start)
+            dispose_engines()
+
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=40)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'habits':>8} {'days':>6} {'ms':>10}")
+    for mode, mark in (("per-habit", per_habit), ("batched", batched)):
+        elapsed = measure(mark, args.habits, args.days, args.repeat)
+        print(f"{mode:<10} {args.habits:>8} {args.days:>6} {elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
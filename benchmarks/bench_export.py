@@ -0,0 +1,91 @@
+"""
+Export throughput and peak RSS of `ritmo export` for every format at several database sizes.
+
+Usage: python -m benchmarks.bench_export [--habits 100] [--logs 100000 1000000]
+"""
+
+import argparse
+import datetime
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+FIRST_DATE = datetime.date(2020, 1, 1)
+
+
+def populate(db_path: Path, habits: int, logs: int) -> None:
+    """
+    Create a database with the given number of habits and logs spread over consecutive days.
+    """
+
+    create_session(f"sqlite:///{db_path}")
+    dispose_engines()
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO habits (id, name, type, start_date) VALUES (?, ?, 'numerical', ?)",
+        ((i, f"habit-{i}", FIRST_DATE.isoformat()) for i in range(1, habits + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO habit_logs (habit_id, date, completed, completed_at) VALUES (?, ?, 1, ?)",
+        (
+            (i % habits + 1, date, date)
+            for i in range(logs)
+            for date in [
+                (FIRST_DATE + datetime.timedelta(days=i // habits)).isoformat()
+            ]
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run_export(home_dir: str, output: Path) -> tuple[float, int]:
+    """
+    Run `ritmo export` and return its wall-clock time in seconds and peak RSS in MB.
+    """
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "ritmo.cli", "export", str(output)],
+        env={**os.environ, "HOME": home_dir},
+        stdout=subprocess.DEVNULL,
+    )
+    _, status, rusage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+
+    if status != 0:
+        raise RuntimeError(f"ritmo export exited with status {status}")
+
+    return elapsed, rusage.ru_maxrss // 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=100)
+    parser.add_argument("--logs", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'logs':>10} {'format':<8} {'rows/s':>10} {'peak RSS (MB)':>14}")
+    for logs in args.logs:
+        with tempfile.TemporaryDirectory() as home_dir:
+            config_folder = Path(home_dir) / ".ritmo"
+            config_folder.mkdir()
+            populate(config_folder / "ritmo.db", args.habits, logs)
+
+            for format in ("csv", "ndjson", "parquet"):
+                elapsed, peak_rss = run_export(
+                    home_dir, Path(home_dir) / f"logs.{format}"
+                )
+                print(f"{logs:>10} {format:<8} {logs / elapsed:>10.0f} {peak_rss:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Read path of `ritmo list`: ORM entities sorted in Python, as the command used to load
+them, versus Core selects returning named tuples sorted and paginated by SQLite.
+
+Usage: python -m benchmarks.bench_list [--habits 50000] [--repeat 5]
+"""
+
+import argparse
+import datetime
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from ritmo.models import Habit
+from ritmo.service import get_habits
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+
+def orm_habits(sess, sort_by: str) -> list:
+    habits = sess.query(Habit).all()
+    if sort_by == "name":
+        habits.sort(key=lambda habit: habit.name)
+    else:
+        habits.sort(key=lambda habit: habit.start_date)
+
+    return habits
+
+
+def measure(session, read, repeat: int) -> tuple[float, float]:
+    """
+    Return the best time in milliseconds and the peak memory in MiB of a read.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        with session() as sess:
+            start = time.perf_counter()
+            read(sess)
+            best = min(best, time.perf_counter() - start)
+
+    with session() as sess:
+        tracemalloc.start()
+        read(sess)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return best * 1000, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    first_day = datetime.date(2020, 1, 1)
+    reads = {
+        "orm, by name": lambda sess: orm_habits(sess, "name"),
+        "core, by name": lambda sess: get_habits(sess, "name"),
+        "orm, by start date": lambda sess: orm_habits(sess, "start-date"),
+        "core, by start date": lambda sess: get_habits(sess, "start-date"),
+        "core, by name, limit 50": lambda sess: get_habits(sess, "name", limit=50),
+        "core, filtered": lambda sess: get_habits(sess, name_filter="99"),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        session = create_session(f"sqlite:///{Path(tmp_dir) / 'ritmo.db'}")
+        with session.begin() as sess:
+            sess.execute(
+                insert(Habit),
+                [
+                    {
+                        "name": f"Habit {i:06}",
+                        "type": "boolean",
+                        "start_date": first_day + datetime.timedelta(days=i % 1000),
+                    }
+                    for i in range(args.habits)
+                ],
+            )
+
+        print(f"{'read':<26} {'ms':>8} {'peak MiB':>10}")
+        for name, read in reads.items():
+            milliseconds, peak = measure(session, read, args.repeat)
+            print(f"{name:<26} {milliseconds:>8.1f} {peak:>10.1f}")
+
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
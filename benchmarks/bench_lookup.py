@@ -0,0 +1,137 @@
+"""
+Lookup latency of habits by name and habit logs by (habit_id, date), before and after
+the lookup indexes migration.
+
+Usage: python -m benchmarks.bench_lookup [--habits 10000] [--logs 10000000]
+"""
+
+import argparse
+import datetime
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ritmo.models import Habit, HabitLog
+from ritmo.sessions import migrate
+
+UNVERSIONED_SCHEMA = """
+CREATE TABLE habits (
+    id INTEGER NOT NULL PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    description VARCHAR,
+    type VARCHAR NOT NULL CHECK (type='boolean' OR type='numerical'),
+    start_date DATE NOT NULL,
+    end_date DATE
+);
+CREATE TABLE habit_logs (
+    id INTEGER NOT NULL PRIMARY KEY,
+    habit_id INTEGER NOT NULL REFERENCES habits (id),
+    date DATE NOT NULL,
+    completed BOOLEAN NOT NULL,
+    completed_at DATE NOT NULL
+);
+"""
+
+FIRST_DATE = datetime.date(2020, 1, 1)
+
+
+def populate(db_path: Path, habits: int, logs: int) -> None:
+    """
+    Create an unversioned database with the given number of habits and logs.
+    """
+
+    rng = random.Random(0)
+    days = max(logs // habits, 1)
+
+    def generate_logs():
+        for _ in range(logs):
+            date = FIRST_DATE + datetime.timedelta(days=rng.randrange(days))
+            yield (rng.randint(1, habits), date.isoformat(), date.isoformat())
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript(UNVERSIONED_SCHEMA)
+    conn.executemany(
+        "INSERT INTO habits (id, name, type, start_date) VALUES (?, ?, 'numerical', ?)",
+        ((i, f"habit-{i}", FIRST_DATE.isoformat()) for i in range(1, habits + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO habit_logs (habit_id, date, completed, completed_at) VALUES (?, ?, 1, ?)",
+        generate_logs(),
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(sess: Session, habits: int, logs: int, lookups: int) -> dict[str, float]:
+    """
+    Return the median latency in milliseconds of name and (habit_id, date) lookups.
+    """
+
+    rng = random.Random(1)
+    days = max(logs // habits, 1)
+    results = {}
+
+    timings = []
+    for _ in range(lookups):
+        name = f"habit-{rng.randint(1, habits)}"
+        start = time.perf_counter()
+        sess.query(Habit).filter(Habit.name == name).first()
+        timings.append(time.perf_counter() - start)
+    results["name lookup"] = statistics.median(timings) * 1000
+
+    timings = []
+    for _ in range(lookups):
+        habit_id = rng.randint(1, habits)
+        date = FIRST_DATE + datetime.timedelta(days=rng.randrange(days))
+        start = time.perf_counter()
+        sess.query(HabitLog).filter(
+            HabitLog.habit_id == habit_id, HabitLog.date == date
+        ).count()
+        timings.append(time.perf_counter() - start)
+    results["log lookup"] = statistics.median(timings) * 1000
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=10_000)
+    parser.add_argument("--logs", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "ritmo.db"
+
+        start = time.perf_counter()
+        populate(db_path, args.habits, args.logs)
+        print(
+            f"populated {args.habits} habits and {args.logs} logs in {time.perf_counter() - start:.1f}s"
+        )
+
+        engine = create_engine(f"sqlite:///{db_path}", future=True)
+        with Session(engine) as sess:
+            before = measure(sess, args.habits, args.logs, args.lookups)
+
+        start = time.perf_counter()
+        migrate(engine)
+        print(f"migrated in {time.perf_counter() - start:.1f}s")
+
+        with Session(engine) as sess:
+            after = measure(sess, args.habits, args.logs, args.lookups)
+        engine.dispose()
+
+    print(f"{'lookup':<12} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>10}")
+    for name in before:
+        speedup = before[name] / after[name]
+        print(f"{name:<12} {before[name]:>12.3f} {after[name]:>12.3f} {speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
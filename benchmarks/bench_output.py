@@ -0,0 +1,101 @@
+"""
+Time to first row, total time and peak memory of `ritmo list` in each output format,
+piped into another process like a script would. Linux only.
+
+Usage: python -m benchmarks.bench_output [--habits 100000]
+"""
+
+import argparse
+import datetime
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from ritmo.models import Habit
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+# Runs ritmo and prints its peak resident memory on exit. VmHWM is reset by exec, unlike
+# the maximum RSS reported by getrusage, which includes the memory of this process.
+REPORT_PEAK_MEMORY = """
+import atexit, sys
+from ritmo.cli import run
+
+def report():
+    with open("/proc/self/status") as status:
+        print(next(line for line in status if line.startswith("VmHWM")), file=sys.stderr)
+
+atexit.register(report)
+sys.argv[0] = "ritmo"
+run()
+"""
+
+
+def run(args: list[str], env: dict[str, str]) -> tuple[float, float, float]:
+    """
+    Return the time to the first line and the total time in milliseconds, and the
+    peak memory in MiB of running `ritmo` with the given arguments.
+    """
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", REPORT_PEAK_MEMORY, *args],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    process.stdout.readline()
+    first_line = time.perf_counter() - start
+    for _ in process.stdout:
+        pass
+    peak_memory = int(process.stderr.read().split()[-2])
+    process.wait()
+    total = time.perf_counter() - start
+
+    return first_line * 1000, total * 1000, peak_memory / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home_dir:
+        db_path = Path(home_dir) / ".ritmo" / "ritmo.db"
+        db_path.parent.mkdir()
+        with create_session(f"sqlite:///{db_path}").begin() as sess:
+            sess.execute(
+                insert(Habit),
+                [
+                    {
+                        "name": f"Habit {i:06}",
+                        "type": "boolean",
+                        "start_date": datetime.date(2020, 1, 1),
+                    }
+                    for i in range(args.habits)
+                ],
+            )
+        dispose_engines()
+
+        env = {**os.environ, "HOME": home_dir, "RITMO_NO_DAEMON": "1"}
+        print(f"{'command':<32} {'first row ms':>12} {'total ms':>10} {'peak MiB':>12}")
+        for command in (
+            ["list", "-f", "tsv"],
+            ["list", "-f", "json"],
+            ["list", "-f", "table"],
+            ["list", "-f", "tsv", "--sort-by", "start-date"],
+        ):
+            first_line, total, memory = run(command, env)
+            print(
+                f"{'ritmo ' + ' '.join(command):<32} {first_line:>12.1f} "
+                f"{total:>10.1f} {memory:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Time of the vectorized completion report against per-row Python loops over the same rows.
+
+Usage: python -m benchmarks.bench_report [--habits 10000] [--logs 10000000]
+"""
+
+import argparse
+import datetime
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from sqlalchemy import select
+
+from ritmo.analytics import completion_report
+from ritmo.models import HabitLog
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+from .bench_export import FIRST_DATE, populate
+
+
+def python_report(sess, since: datetime.date, until: datetime.date) -> None:
+    """
+    Compute the daily, weekly and weekday completions with per-row Python loops.
+    """
+
+    rows = sess.execute(
+        select(HabitLog.date, HabitLog.count).where(
+            HabitLog.date >= since, HabitLog.date <= until
+        )
+    )
+
+    daily: Counter[datetime.date] = Counter()
+    weekly: Counter[datetime.date] = Counter()
+    weekdays: Counter[int] = Counter()
+    for date, count in rows:
+        daily[date] += count
+        weekly[date - datetime.timedelta(days=date.weekday())] += count
+        weekdays[date.weekday()] += count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=10_000)
+    parser.add_argument("--logs", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    until = FIRST_DATE + datetime.timedelta(days=args.logs // args.habits)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "ritmo.db"
+        populate(db_path, args.habits, args.logs)
+        session = create_session(f"sqlite:///{db_path}")
+
+        for name, report in (
+            ("python loops", python_report),
+            ("numpy", completion_report),
+        ):
+            with session() as sess:
+                start = time.perf_counter()
+                report(sess, FIRST_DATE, until)
+                print(f"{name:<14} {time.perf_counter() - start:>8.2f} s")
+
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
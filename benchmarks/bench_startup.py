@@ -0,0 +1,90 @@
+"""
+Cold start of the ritmo CLI: import time of the entry point and wall-clock time of
+`ritmo --help` and `ritmo done` against a warm database.
+
+Usage: python -m benchmarks.bench_startup [--runs 20]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def import_time(statement: str) -> tuple[float, int]:
+    """
+    Return the cumulative import time in milliseconds and the number of modules
+    imported by the given statement, as reported by `python -X importtime`.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative = 0
+    modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules += 1
+        # Nested imports are indented, the cumulative time of top level ones includes them.
+        if not name[1:].startswith(" "):
+            cumulative += int(cumulative_us)
+
+    return cumulative / 1000, modules
+
+
+def wall_clock(args: list[str], env: dict[str, str], runs: int) -> float:
+    """
+    Return the median wall-clock time in milliseconds of running `ritmo` with the given arguments.
+    """
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "ritmo.cli", *args],
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    for statement in (
+        "import ritmo.cli",
+        "from ritmo.commands.done_habit import mark_as_done_cmd",
+    ):
+        milliseconds, modules = import_time(statement)
+        print(f"{statement:<56} {milliseconds:>8.1f} ms {modules:>5} modules")
+
+    with tempfile.TemporaryDirectory() as home_dir:
+        env = {**os.environ, "HOME": home_dir}
+        subprocess.run(
+            [sys.executable, "-m", "ritmo.cli", "add", "benchmark", "-t", "numerical"],
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+
+        for command in (["--help"], ["done", "benchmark"]):
+            milliseconds = wall_clock(command, env, args.runs)
+            print(f"{'ritmo ' + ' '.join(command):<56} {milliseconds:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+The same workload run against every storage: adding habits, completing them day after
+day with a call per completion like `ritmo done`, undoing some, then scanning and
+counting the logs of a month. Files are created in a temporary folder.
+
+Usage: python -m benchmarks.bench_storage [--habits 50] [--days 100] [--runs 3]
+"""
+
+import argparse
+import contextlib
+import datetime
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+from benchmarks.generate import LAST_DAY, get_habit_name
+from ritmo.service import HabitRow
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+from ritmo.storage import LogStorage, MemoryStorage, SQLAlchemyStorage, Storage
+
+
+@contextlib.contextmanager
+def open_sqlalchemy(folder: Path) -> Iterator[Storage]:
+    session = create_session(f"sqlite:///{folder / 'ritmo.db'}")
+    with session() as sess:
+        yield SQLAlchemyStorage(sess)
+    dispose_engines()
+
+
+@contextlib.contextmanager
+def open_memory(folder: Path) -> Iterator[Storage]:
+    yield MemoryStorage()
+
+
+@contextlib.contextmanager
+def open_log(folder: Path) -> Iterator[Storage]:
+    store = LogStorage(folder / "ritmo.log")
+    yield store
+    store.close()
+
+
+STORAGES: dict[str, Callable[[Path], contextlib.AbstractContextManager[Storage]]] = {
+    "sqlalchemy": open_sqlalchemy,
+    "memory": open_memory,
+    "log": open_log,
+}
+
+
+def run_workload(store: Storage, habits: int, days: int) -> dict[str, float]:
+    """
+    Run the workload and return the time of each of its steps in seconds.
+    """
+
+    first_day = LAST_DAY - datetime.timedelta(days=days - 1)
+    names = [get_habit_name(index) for index in range(habits)]
+    dates = [first_day + datetime.timedelta(days=offset) for offset in range(days)]
+    timings = {}
+
+    start = time.perf_counter()
+    for index, name in enumerate(names):
+        type = "numerical" if index % 2 else "boolean"
+        store.put_habit(HabitRow(name, None, type, first_day, None))
+    timings["put_habit"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for date in dates:
+        for name in names:
+            store.append_logs([name], [date])
+    timings["append_logs"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in names:
+        store.remove_logs([name], [dates[-1]])
+    timings["remove_logs"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in store.scan_logs(dates[-30], dates[-1]):
+        pass
+    timings["scan_logs"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.count_logs(dates[-30], dates[-1])
+    timings["count_logs"] = time.perf_counter() - start
+
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=50)
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    completions = args.habits * args.days
+    print(f"{args.habits} habits, {completions} completions, median of {args.runs}")
+    print(
+        f"{'storage':<12} {'put (ms)':>10} {'append (us)':>12} {'remove (us)':>12} "
+        f"{'scan (ms)':>10} {'count (ms)':>11}"
+    )
+    for name, open_storage in STORAGES.items():
+        runs = []
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                with open_storage(Path(tmp_dir)) as store:
+                    runs.append(run_workload(store, args.habits, args.days))
+
+        timings = {
+            step: statistics.median(run[step] for run in runs) for step in runs[0]
+        }
+        print(
+            f"{name:<12} {timings['put_habit'] * 1000:>10.2f} "
+            f"{timings['append_logs'] / completions * 1e6:>12.2f} "
+            f"{timings['remove_logs'] / args.habits * 1e6:>12.2f} "
+            f"{timings['scan_logs'] * 1000:>10.2f} "
+            f"{timings['count_logs'] * 1000:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Latency of undoing the completions of a day for habits with a long history, compared
+with the undo of earlier versions, which counted the logs of a habit and then picked
+its latest log by completed_at over the whole history.
+
+Usage: python -m benchmarks.bench_undo [--habits 10] [--logs-per-habit 200000] [--runs 200]
+"""
+
+import argparse
+import datetime
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from benchmarks.generate import generate_database, get_habit_name
+from ritmo.models import HabitLog
+from ritmo.service import mark_many_as_done, mark_many_as_undone
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+# Statements run by the undo of earlier versions before deleting a log.
+HISTORY_UNDO = [
+    "SELECT COUNT(*) FROM habit_logs WHERE habit_id = ?",
+    "SELECT id FROM habit_logs WHERE habit_id = ? ORDER BY completed_at DESC LIMIT 1",
+]
+
+
+def time_undo(db_path: Path, habits: int, runs: int) -> list[float]:
+    """
+    Mark a habit as done on the day after the last generated one, like today, and time
+    undoing it, habit after habit. Return the time of each undo in seconds.
+    """
+
+    session = create_session(f"sqlite:///{db_path}")
+    with session() as sess:
+        today = sess.scalar(select(func.max(HabitLog.date))) + datetime.timedelta(1)
+
+    timings = []
+    for run in range(runs):
+        name = get_habit_name(run % habits)
+        with session() as sess:
+            mark_many_as_done(sess, [name], [today])
+
+        with session() as sess:
+            start = time.perf_counter()
+            mark_many_as_undone(sess, [name], [today])
+            timings.append(time.perf_counter() - start)
+
+    dispose_engines()
+    return timings
+
+
+def time_history_undo(db_path: Path, habits: int, runs: int) -> list[float]:
+    """
+    Return the time in seconds of the lookups of the former undo, without its delete.
+    """
+
+    conn = sqlite3.connect(db_path)
+    timings = []
+    for run in range(runs):
+        habit_id = run % habits + 1
+        start = time.perf_counter()
+        for statement in HISTORY_UNDO:
+            conn.execute(statement, (habit_id,)).fetchall()
+        timings.append(time.perf_counter() - start)
+
+    conn.close()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=10)
+    parser.add_argument(
+        "--logs-per-habit",
+        type=int,
+        default=200_000,
+        help="Each log is a day, so histories are limited to about 590k logs.",
+    )
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    logs = args.habits * args.logs_per_habit
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "ritmo.db"
+        generate_database(db_path, args.habits, logs)
+
+        print(f"{'undo':<22} {'median (ms)':>12} {'max (ms)':>10}")
+        for name, timings in (
+            ("per day log (index)", time_undo(db_path, args.habits, args.runs)),
+            (
+                "lookups over history",
+                time_history_undo(db_path, args.habits, args.runs),
+            ),
+        ):
+            print(
+                f"{name:<22} {statistics.median(timings) * 1000:>12.3f} "
+                f"{max(timings) * 1000:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
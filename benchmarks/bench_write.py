@@ -0,0 +1,98 @@
+"""
+Write throughput of `ritmo done`-like transactions (one completion per commit) with SQLite's
+default settings versus the tuned PRAGMAs, from one and from several concurrent processes.
+
+Usage: python -m benchmarks.bench_write [--commits 500] [--processes 4]
+"""
+
+import argparse
+import datetime
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import sqlalchemy.exc
+
+from ritmo.models import Habit
+from ritmo.service import upsert_logs
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+# SQLite defaults, as used before the PRAGMAs were tuned. pysqlite waits 5 seconds on locks.
+DEFAULT_PRAGMAS = {
+    "RITMO_SQLITE_JOURNAL_MODE": "delete",
+    "RITMO_SQLITE_SYNCHRONOUS": "full",
+    "RITMO_SQLITE_TEMP_STORE": "default",
+    "RITMO_SQLITE_MMAP_SIZE": "0",
+    "RITMO_SQLITE_CACHE_SIZE": "-2000",
+    "RITMO_SQLITE_BUSY_TIMEOUT": "5000",
+}
+
+
+def write_logs(path: str, commits: int) -> int:
+    """
+    Commit one completion per transaction and return the number of failed commits.
+    """
+
+    session = create_session(path)
+    today = datetime.date.today()
+    errors = 0
+    for _ in range(commits):
+        try:
+            with session.begin() as sess:
+                sess.execute(
+                    upsert_logs(),
+                    {"habit_id": 1, "date": today, "completed_at": today, "count": 1},
+                )
+        except sqlalchemy.exc.OperationalError:
+            errors += 1
+
+    dispose_engines()
+    return errors
+
+
+def measure(db_path: Path, commits: int, processes: int) -> tuple[float, int]:
+    """
+    Return the commits per second and failed commits of concurrent writer processes.
+    """
+
+    path = f"sqlite:///{db_path}"
+    with create_session(path).begin() as sess:
+        sess.add(Habit(name="benchmark", type="numerical"))
+    dispose_engines()
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        errors = pool.starmap(write_logs, [(path, commits)] * processes)
+    elapsed = time.perf_counter() - start
+
+    return (commits * processes - sum(errors)) / elapsed, sum(errors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=500)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    runs: list[tuple[str, dict[str, str]]] = [
+        ("default", DEFAULT_PRAGMAS),
+        ("tuned", {}),
+    ]
+    print(f"{'settings':<10} {'processes':>10} {'commits/s':>12} {'errors':>8}")
+    for settings, overrides in runs:
+        os.environ.update(overrides)
+        for processes in sorted({1, args.processes}):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                throughput, errors = measure(
+                    Path(tmp_dir) / "ritmo.db", args.commits, processes
+                )
+            print(f"{settings:<10} {processes:>10} {throughput:>12.0f} {errors:>8}")
+        for variable in overrides:
+            del os.environ[variable]
+
+
+if __name__ == "__main__":
+    main()
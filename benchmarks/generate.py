@@ -0,0 +1,134 @@
+"""
+Deterministic generator of ritmo databases at a given scale. The same scale and seed
+always produce the same habits and logs, so timings of different runs are comparable.
+
+Usage: python -m benchmarks.generate PATH [--scale small] [--habits N] [--logs N] [--seed 0]
+"""
+
+import argparse
+import datetime
+import random
+import sqlite3
+from pathlib import Path
+from typing import Iterator
+
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+from ritmo.stats import rebuild_rollups
+
+# Number of habits and logs of each named scale.
+SCALES = {
+    "tiny": (10, 1_000),
+    "small": (1_000, 100_000),
+    "medium": (10_000, 1_000_000),
+    "large": (100_000, 50_000_000),
+}
+
+# Last day with logs, so generated databases do not depend on the current date.
+LAST_DAY = datetime.date(2024, 12, 31)
+
+# Share of active days each habit is completed on.
+COMPLETION_RATE = 0.8
+
+
+def get_habit_name(index: int) -> str:
+    return f"habit-{index:06}"
+
+
+def iter_habits(
+    rng: random.Random, habits: int, first_day: datetime.date
+) -> Iterator[tuple]:
+    for index in range(habits):
+        type = "numerical" if rng.random() < 0.5 else "boolean"
+        yield index + 1, get_habit_name(index), type, first_day.isoformat()
+
+
+def iter_logs(
+    rng: random.Random, types: list[str], logs: int, first_day: datetime.date
+) -> Iterator[tuple]:
+    """
+    Yield one log per habit and completed day, day by day, until there are enough logs.
+    """
+
+    generated = 0
+    day = first_day
+    while generated < logs:
+        date = day.isoformat()
+        for habit_id, type in enumerate(types, start=1):
+            if rng.random() >= COMPLETION_RATE:
+                continue
+
+            count = rng.randint(1, 8) if type == "numerical" else 1
+            yield habit_id, date, date, count
+            generated += 1
+            if generated == logs:
+                return
+
+        day += datetime.timedelta(days=1)
+
+
+def generate_database(path: Path, habits: int, logs: int, seed: int = 0) -> None:
+    """
+    Create a database with the given number of habits and logs, ending around LAST_DAY.
+    Rows are written with sqlite3 in a single transaction and the rollups are rebuilt
+    from them afterwards.
+
+    Args:
+        path: The path of the database file to create.
+        habits: The number of habits.
+        logs: The number of habit logs, each one holding the completions of a day.
+        seed: The seed of the random generator.
+    """
+
+    rng = random.Random(seed)
+    days = -(-logs // max(int(habits * COMPLETION_RATE), 1))
+    first_day = LAST_DAY - datetime.timedelta(days=days)
+
+    create_session(f"sqlite:///{path}")
+    dispose_engines()
+
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO habits (id, name, type, start_date) VALUES (?, ?, ?, ?)",
+        iter_habits(rng, habits, first_day),
+    )
+    types = [type for (type,) in conn.execute("SELECT type FROM habits ORDER BY id")]
+    conn.executemany(
+        "INSERT INTO habit_logs (habit_id, date, completed, completed_at, count) "
+        "VALUES (?, ?, 1, ?, ?)",
+        iter_logs(rng, types, logs, first_day),
+    )
+    conn.commit()
+    conn.close()
+
+    session = create_session(f"sqlite:///{path}")
+    with session.begin() as sess:
+        rebuild_rollups(sess)
+    dispose_engines()
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--habits", type=int, help="Overrides the habits of the scale.")
+    parser.add_argument("--logs", type=int, help="Overrides the logs of the scale.")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def get_scale(args: argparse.Namespace) -> tuple[int, int]:
+    habits, logs = SCALES[args.scale]
+    return args.habits or habits, args.logs or logs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path)
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    habits, logs = get_scale(args)
+    generate_database(args.path, habits, logs, args.seed)
+    print(f"Generated {habits} habits and {logs} logs in {args.path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Load test of the async service: many concurrent clients marking habits as done against
+one database, each with a habit of its own and a habit shared by every client.
+
+Usage: python -m benchmarks.load_service [--clients 100] [--requests 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from ritmo.service import HabitService
+from ritmo.stats import check_rollups
+
+
+async def client(service: HabitService, name: str, requests: int) -> list[float]:
+    """
+    Mark a habit and the shared one as done, returning the latency of each request.
+    """
+
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await service.mark_done([name, "shared"])
+        latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+async def load(path: str, clients: int, requests: int) -> None:
+    service = await HabitService.connect(path)
+    try:
+        await service.add_habit("shared", type="numerical")
+        for i in range(clients):
+            await service.add_habit(f"Habit {i}", type="numerical")
+
+        start = time.perf_counter()
+        client_latencies = await asyncio.gather(
+            *(client(service, f"Habit {i}", requests) for i in range(clients))
+        )
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(latency for client in client_latencies for latency in client)
+        day_logs = await service.get_day_logs()
+        inconsistent = await service.read(check_rollups)
+    finally:
+        await service.close()
+
+    total = clients * requests
+    print(f"{clients} clients, {total} requests in {elapsed:.2f}s")
+    print(f"throughput {total / elapsed:>10.0f} requests/s")
+    print(f"p50        {statistics.median(latencies) * 1000:>10.1f} ms")
+    print(f"p95        {latencies[int(len(latencies) * 0.95)] * 1000:>10.1f} ms")
+    print(f"max        {latencies[-1] * 1000:>10.1f} ms")
+
+    shared = next(log.times_done for log in day_logs if log.name == "shared")
+    assert shared == total, f"expected {total} logs of the shared habit, got {shared}"
+    assert not inconsistent, f"inconsistent rollups for {inconsistent}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = f"sqlite+aiosqlite:///{Path(tmp_dir) / 'ritmo.db'}"
+        asyncio.run(load(path, args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Benchmark suite timing every command against a generated database, saving the results
+as JSON and comparing them with a baseline. The same cases can be run with
+pytest-benchmark through benchmarks/bench_commands.py.
+
+Usage: python -m benchmarks.suite [--scale small] [--repeat 20] [--output results.json]
+           [--baseline benchmarks/baseline.json] [--save-baseline] [--threshold 1.25]
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from benchmarks.bench_startup import wall_clock
+from benchmarks.generate import (
+    LAST_DAY,
+    add_scale_arguments,
+    generate_database,
+    get_habit_name,
+    get_scale,
+)
+from ritmo.commands.add_habit import add_habit
+from ritmo.commands.date_log import get_by_date
+from ritmo.commands.delete_habit import delete_habit
+from ritmo.commands.done_habit import mark_as_done, mark_as_undone
+from ritmo.commands.list_habit import list_habit
+from ritmo.commands.update_habit import update_habit
+from ritmo.service import mark_many_as_done
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+@dataclasses.dataclass(frozen=True)
+class Case:
+    """
+    A timed call of a command function. The i-th run gets its own habit, so commands
+    that change habits never run twice on the same one.
+    """
+
+    name: str
+    run: Callable[[Session, str, int], None]
+    setup: Callable[[Session, str], None] | None = None
+
+
+def mark_done_today(sess: Session, name: str) -> None:
+    mark_many_as_done(sess, [name], [datetime.datetime.utcnow().date()])
+
+
+CASES = [
+    Case(
+        "add_habit",
+        lambda sess, name, i: add_habit(sess, f"new-{i}", None, None, None, None),
+    ),
+    Case("mark_as_done", lambda sess, name, i: mark_as_done(sess, name)),
+    Case(
+        "mark_as_undone",
+        lambda sess, name, i: mark_as_undone(sess, name),
+        setup=mark_done_today,
+    ),
+    Case(
+        "get_by_date",
+        lambda sess, name, i: get_by_date(
+            sess, datetime.datetime.combine(LAST_DAY, datetime.time())
+        ),
+    ),
+    Case("list_habit", lambda sess, name, i: list_habit(sess, "name", False)),
+    Case(
+        "update_habit",
+        lambda sess, name, i: update_habit(
+            sess, name, None, f"Description {i}", None, None, None
+        ),
+    ),
+    Case("delete_habit", lambda sess, name, i: delete_habit(sess, name)),
+]
+
+
+def time_case(case: Case, db_path: Path, habits: int, repeat: int) -> list[float]:
+    """
+    Run a case against its own copy of a database and return the time of each run in
+    seconds. Each habit is used by a single run, so there are at most as many runs as
+    habits. Output of the commands is discarded.
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        case_path = Path(tmp_dir) / "ritmo.db"
+        shutil.copy(db_path, case_path)
+        session = create_session(f"sqlite:///{case_path}")
+
+        timings = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(min(repeat, habits)):
+                name = get_habit_name(i)
+                if case.setup:
+                    with session() as sess:
+                        case.setup(sess, name)
+
+                with session() as sess:
+                    start = time.perf_counter()
+                    case.run(sess, name, i)
+                    timings.append(time.perf_counter() - start)
+
+        dispose_engines()
+
+    return timings
+
+
+def time_cold_start(db_path: Path, runs: int) -> dict[str, list[float]]:
+    """
+    Return the wall-clock time in seconds of `ritmo --help` and `ritmo today` in new
+    processes, without forwarding to a running daemon.
+    """
+
+    with tempfile.TemporaryDirectory() as home_dir:
+        config_folder = Path(home_dir) / ".ritmo"
+        config_folder.mkdir()
+        shutil.copy(db_path, config_folder / "ritmo.db")
+        env = {**os.environ, "HOME": home_dir, "RITMO_NO_DAEMON": "1"}
+
+        return {
+            f"cold_start_{command.strip('-')}": [
+                wall_clock([command], env, 1) / 1000 for _ in range(runs)
+            ]
+            for command in ("--help", "today")
+        }
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    return {
+        "min_ms": min(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "runs": len(timings),
+    }
+
+
+def run_suite(
+    db_path: Path, habits: int, repeat: int, cold_start_runs: int
+) -> dict[str, dict]:
+    """
+    Time every case and the cold start of the CLI against a database.
+
+    Returns:
+        The minimum and median time in milliseconds and number of runs of each case.
+    """
+
+    results = {}
+    for case in CASES:
+        results[case.name] = summarize(time_case(case, db_path, habits, repeat))
+
+    if cold_start_runs:
+        for name, timings in time_cold_start(db_path, cold_start_runs).items():
+            results[name] = summarize(timings)
+
+    return results
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """
+    Print the median time of each case next to its baseline.
+
+    Returns:
+        The names of the cases slower than the baseline by more than the threshold.
+    """
+
+    regressions = []
+    print(f"{'case':<20} {'median (ms)':>12} {'baseline':>10} {'ratio':>7}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<20} {result['median_ms']:>12.2f} {'-':>10} {'-':>7}")
+            continue
+
+        ratio = result["median_ms"] / baseline[name]["median_ms"]
+        flag = " slower" if ratio > threshold else ""
+        print(
+            f"{name:<20} {result['median_ms']:>12.2f} "
+            f"{baseline[name]['median_ms']:>10.2f} {ratio:>7.2f}{flag}"
+        )
+        if ratio > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_scale_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cold-start-runs", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="Write the results to this file.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Replace the baseline."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio over the baseline reported as a regression.",
+    )
+    args = parser.parse_args()
+
+    habits, logs = get_scale(args)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "ritmo.db"
+        generate_database(db_path, habits, logs, args.seed)
+        results = run_suite(db_path, habits, args.repeat, args.cold_start_runs)
+
+    report = {
+        "scale": {"habits": habits, "logs": logs, "seed": args.seed},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    regressions = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["scale"] != report["scale"]:
+            print(f"Baseline was measured at another scale: {baseline['scale']}.")
+        else:
+            regressions = compare(results, baseline["results"], args.threshold)
+    else:
+        compare(results, {}, args.threshold)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+
+    if regressions:
+        print(f"Regressions over {args.threshold}x: {', '.join(regressions)}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+from .analytics import (
+    completion_report,
+    load_active_habits,
+    load_day_counts,
+    rolling_mean,
+)
@@ -0,0 +1,165 @@
+import datetime
+from itertools import chain
+
+import numpy as np
+from sqlalchemy import Integer, cast, func, or_, select
+from sqlalchemy.orm import Session
+
+from ritmo.models import Habit, HabitLog
+
+# Difference between SQLite's julianday() and Python's date.toordinal().
+JULIAN_DAY_OFFSET = 1721424.5
+
+# Python ordinal of 1970-01-01, the epoch of NumPy's datetime64.
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def to_ordinal(column):
+    """
+    Build a SQL expression converting a date column into Python's day ordinal.
+    """
+
+    return cast(func.julianday(column) - JULIAN_DAY_OFFSET, Integer)
+
+
+def load_day_counts(
+    sess: Session, since: datetime.date, until: datetime.date
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Load the number of logs per habit and day within a date range into NumPy arrays.
+    Dates are converted to day ordinals by SQLite so rows are fetched as plain integers
+    and copied straight into a flat array, without building a Python object per row.
+
+    Args:
+        sess: The database session.
+        since: First day of the range, inclusive.
+        until: Last day of the range, inclusive.
+
+    Returns:
+        The habit ids, the days as offsets from since and the counts.
+    """
+
+    stmt = select(HabitLog.habit_id, to_ordinal(HabitLog.date), HabitLog.count).where(
+        HabitLog.date >= since, HabitLog.date <= until
+    )
+    result = sess.connection().execute(stmt, execution_options={"stream_results": True})
+    rows = np.fromiter(chain.from_iterable(result), dtype=np.int64).reshape(-1, 3)
+
+    return rows[:, 0], rows[:, 1] - since.toordinal(), rows[:, 2]
+
+
+def load_active_habits(
+    sess: Session, since: datetime.date, until: datetime.date
+) -> np.ndarray:
+    """
+    Count the habits active on each day of a date range, between their start and end dates.
+
+    Args:
+        sess: The database session.
+        since: First day of the range, inclusive.
+        until: Last day of the range, inclusive.
+    """
+
+    days = (until - since).days + 1
+    stmt = select(to_ordinal(Habit.start_date), to_ordinal(Habit.end_date)).where(
+        Habit.start_date <= until,
+        or_(Habit.end_date.is_(None), Habit.end_date >= since),
+    )
+    rows = sess.connection().execute(stmt).all()
+    if not rows:
+        return np.zeros(days, dtype=np.int64)
+
+    start_days = np.array([start for start, _ in rows], dtype=np.int64)
+    end_days = np.array(
+        [until.toordinal() if end is None else end for _, end in rows], dtype=np.int64
+    )
+    start_days = np.clip(start_days - since.toordinal(), 0, days)
+    end_days = np.clip(end_days - since.toordinal() + 1, 0, days)
+
+    # Each habit adds one from its first active day and removes it after its last one.
+    changes = np.bincount(start_days, minlength=days + 1) - np.bincount(
+        end_days, minlength=days + 1
+    )
+    return np.cumsum(changes)[:days]
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Compute the trailing mean of each value over a window, using fewer values at the start.
+    """
+
+    sums = np.cumsum(values, dtype=np.float64)
+    sums[window:] = sums[window:] - sums[:-window]
+    sizes = np.minimum(np.arange(1, len(values) + 1), window)
+    return sums / sizes
+
+
+def group_rate(
+    groups: np.ndarray, completed: np.ndarray, active: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the completion rate of each group of consecutive days.
+
+    Returns:
+        The distinct groups and their completion rates.
+    """
+
+    labels, indices = np.unique(groups, return_inverse=True)
+    completed_sums = np.bincount(indices, weights=completed)
+    active_sums = np.bincount(indices, weights=active)
+    rates = np.divide(
+        completed_sums,
+        active_sums,
+        out=np.zeros_like(completed_sums),
+        where=active_sums > 0,
+    )
+    return labels, rates
+
+
+def completion_report(
+    sess: Session, since: datetime.date, until: datetime.date
+) -> dict[str, np.ndarray]:
+    """
+    Compute completion rates of every habit within a date range.
+
+    Args:
+        sess: The database session.
+        since: First day of the range, inclusive.
+        until: Last day of the range, inclusive.
+
+    Returns:
+        A dictionary with the following arrays:
+        - dates, daily_rate, rolling_7 and rolling_30: one value per day.
+        - weeks and weekly_rate: one value per week, weeks are labeled by their Monday.
+        - months and monthly_rate: one value per month.
+        - weekday_completions: completions per weekday, starting on Monday, counting
+          every completion of numerical habits.
+    """
+
+    days = (until - since).days + 1
+    _, day_offsets, counts = load_day_counts(sess, since, until)
+    active = load_active_habits(sess, since, until)
+
+    # Rates count the habits done on each day, there is a single log per habit and day.
+    completed = np.bincount(day_offsets, minlength=days)
+    daily_rate = np.divide(completed, active, out=np.zeros(days), where=active > 0)
+
+    ordinals = np.arange(since.toordinal(), until.toordinal() + 1)
+    dates = (ordinals - EPOCH_ORDINAL).astype("datetime64[D]")
+    weekdays = (ordinals - 1) % 7
+    weeks, weekly_rate = group_rate(dates - weekdays, completed, active)
+    months, monthly_rate = group_rate(dates.astype("datetime64[M]"), completed, active)
+
+    return {
+        "dates": dates,
+        "daily_rate": daily_rate,
+        "rolling_7": rolling_mean(daily_rate, 7),
+        "rolling_30": rolling_mean(daily_rate, 30),
+        "weeks": weeks,
+        "weekly_rate": weekly_rate,
+        "months": months,
+        "monthly_rate": monthly_rate,
+        "weekday_completions": np.bincount(
+            weekdays[day_offsets], weights=counts, minlength=7
+        ).astype(np.int64),
+    }
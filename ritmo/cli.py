@@ -1,36 +1,134 @@
+import importlib
+import os
+import sys
+import time
+
 import click
 
-from ritmo.commands import (
-    add_habit_cmd,
-    delete_habit_cmd,
-    list_habit_cmd,
-    mark_as_done_cmd,
-    mark_as_undone_cmd,
-    show_date_cmd,
-    show_today_cmd,
-    show_yesterday_cmd,
-    update_habit_cmd,
+from ritmo.main import run_fast_path
+
+# Key of the context meta holding the time spent importing the dispatched command.
+IMPORT_TIME_KEY = "ritmo.import_time"
+
+PROFILE_FORMATS = ["table", "json"]
+
+
+class LazyGroup(click.Group):
+    """
+    Click group that imports the module of a command only when the command is dispatched.
+    """
+
+    def __init__(self, *args, lazy_commands: dict[str, str] | None = None, **kwargs):
+        """
+        Args:
+            lazy_commands: Mapping of command names to 'module:attribute' import paths.
+        """
+
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_commands])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.lazy_commands:
+            return super().get_command(ctx, cmd_name)
+
+        start = time.perf_counter()
+        module_name, attribute = self.lazy_commands[cmd_name].split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        ctx.meta[IMPORT_TIME_KEY] = time.perf_counter() - start
+
+        return command
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_commands={
+        "add": "ritmo.commands.add_habit:add_habit_cmd",
+        "list": "ritmo.commands.list_habit:list_habit_cmd",
+        "update": "ritmo.commands.update_habit:update_habit_cmd",
+        "delete": "ritmo.commands.delete_habit:delete_habit_cmd",
+        "done": "ritmo.commands.done_habit:mark_as_done_cmd",
+        "undo": "ritmo.commands.done_habit:mark_as_undone_cmd",
+        "logs": "ritmo.commands.date_log:show_date_cmd",
+        "today": "ritmo.commands.date_log:show_today_cmd",
+        "yesterday": "ritmo.commands.date_log:show_yesterday_cmd",
+        "import": "ritmo.commands.import_logs:import_logs_cmd",
+        "export": "ritmo.commands.export_data:export_data_cmd",
+        "stats": "ritmo.commands.stats:stats_cmd",
+        "report": "ritmo.commands.report:show_report_cmd",
+        "calendar": "ritmo.commands.calendar_heatmap:show_calendar_cmd",
+        "compact": "ritmo.commands.compact:compact_cmd",
+        "serve": "ritmo.commands.serve:serve_cmd",
+        "flush": "ritmo.commands.flush_journal:flush_journal_cmd",
+        "prompt": "ritmo.commands.prompt:prompt_cmd",
+    },
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print the time spent in each phase of the command and its SQL statements "
+    "to the standard error. Also enabled by setting RITMO_TRACE.",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(PROFILE_FORMATS, case_sensitive=False),
+    help="Format of the profile, a summary table by default, or json if RITMO_TRACE=json.",
 )
+@click.option(
+    "--cprofile",
+    "cprofile_path",
+    type=click.Path(dir_okay=False),
+    help="Profile the command with cProfile and dump its stats to this file.",
+)
+@click.pass_context
+def cli(
+    ctx: click.Context,
+    profile: bool,
+    profile_format: str | None,
+    cprofile_path: str | None,
+):
+    trace = os.environ.get("RITMO_TRACE", "").lower()
+    if profile or cprofile_path or trace not in ("", "0"):
+        format = profile_format or ("json" if trace == "json" else "table")
+        start_profiling(ctx, format, cprofile_path)
+
+
+def start_profiling(
+    ctx: click.Context, format: str, cprofile_path: str | None = None
+) -> None:
+    """
+    Profile the dispatched command and print the profile when it ends.
+
+    Args:
+        ctx: The context of the group, closed after the command.
+        format: Either 'table' or 'json'.
+        cprofile_path: Dump cProfile stats of the command to this file.
+    """
 
+    from ritmo.profiling import Profiler
 
-@click.group()
-def cli():
-    pass
+    profiler = Profiler(cprofile_path)
+    # The command was imported before the group callback started the profiler.
+    if import_time := ctx.meta.get(IMPORT_TIME_KEY):
+        profiler.add_phase("import", import_time)
+        profiler.total += import_time
+    profiler.start()
 
+    def print_profile():
+        profiler.stop()
+        click.echo(profiler.format(format), err=True, nl=False)
 
-cli.add_command(add_habit_cmd)
-cli.add_command(list_habit_cmd)
-cli.add_command(update_habit_cmd)
-cli.add_command(delete_habit_cmd)
-cli.add_command(mark_as_done_cmd)
-cli.add_command(mark_as_undone_cmd)
-cli.add_command(show_date_cmd)
-cli.add_command(show_today_cmd)
-cli.add_command(show_yesterday_cmd)
+    ctx.call_on_close(print_profile)
 
 
 def run():
-    cli()
+    exit_code = run_fast_path(sys.argv[1:])
+    if exit_code is None:
+        cli()
+    else:
+        sys.exit(exit_code)
 
 
 if __name__ == "__main__":
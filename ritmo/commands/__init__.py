@@ -1,6 +1,35 @@
-from .add_habit import add_habit_cmd
-from .date_log import show_date_cmd, show_today_cmd, show_yesterday_cmd
-from .delete_habit import delete_habit_cmd
-from .done_habit import mark_as_done_cmd, mark_as_undone_cmd
-from .list_habit import list_habit_cmd
-from .update_habit import update_habit_cmd
+import importlib
+
+# Command modules are imported on first access so that importing a single command
+# does not pull in the dependencies of every other one.
+_COMMAND_MODULES = {
+    "add_habit_cmd": "add_habit",
+    "show_calendar_cmd": "calendar_heatmap",
+    "compact_cmd": "compact",
+    "show_date_cmd": "date_log",
+    "show_today_cmd": "date_log",
+    "show_yesterday_cmd": "date_log",
+    "delete_habit_cmd": "delete_habit",
+    "export_data_cmd": "export_data",
+    "flush_journal_cmd": "flush_journal",
+    "import_logs_cmd": "import_logs",
+    "mark_as_done_cmd": "done_habit",
+    "mark_as_undone_cmd": "done_habit",
+    "list_habit_cmd": "list_habit",
+    "prompt_cmd": "prompt",
+    "show_report_cmd": "report",
+    "serve_cmd": "serve",
+    "stats_cmd": "stats",
+    "update_habit_cmd": "update_habit",
+}
+
+
+def __getattr__(name: str):
+    if name not in _COMMAND_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{_COMMAND_MODULES[name]}", __name__)
+    return getattr(module, name)
+
+
+__all__ = list(_COMMAND_MODULES)
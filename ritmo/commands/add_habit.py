@@ -4,13 +4,19 @@ from typing import Optional
 import click
 from sqlalchemy.orm import Session
 
-from ritmo.decorators import with_sqlalchemy_error_handling
-from ritmo.models import Habit
+from ritmo.decorators import (
+    with_name_index_refresh,
+    with_snapshot_update,
+    with_sqlalchemy_error_handling,
+)
+from ritmo.service import HabitRow, ServiceError
 from ritmo.sessions import create_local_session
+from ritmo.storage import Storage, as_storage
+from ritmo.storage.base import to_date
 
 
 def add_habit(
-    sess: Session,
+    sess: Session | Storage,
     name: str,
     description: Optional[str | None],
     type: Optional[str | None],
@@ -21,7 +27,7 @@ def add_habit(
     Add a new habit to be tracked.
 
     Args:
-        sess: The database session.
+        sess: The database session, or any storage.
         name: The name of the habit.
         description: A description of the habit.
         type: The type of tracking system to use.
@@ -29,21 +35,18 @@ def add_habit(
         end_date: The date the habit ends.
     """
 
-    if end_date and start_date and end_date < start_date:
-        click.echo("End date must be after start date.")
-        return
-
-    if not name or name.isspace():
-        click.echo("Habit name must be specified.")
-        return
-
-    habit = sess.query(Habit).filter(Habit.name == name).first()
-
-    if habit:
-        return
-    else:
-        sess.add(Habit(name=name, description=description, type=type))
-        sess.commit()
+    try:
+        as_storage(sess).put_habit(
+            HabitRow(
+                name,
+                description,
+                type or "boolean",
+                to_date(start_date) or datetime.datetime.utcnow().date(),
+                to_date(end_date),
+            )
+        )
+    except ServiceError as e:
+        click.echo(e)
 
 
 @click.command(name="add", help="Add a new habit to be tracked.")
@@ -79,13 +82,17 @@ def add_habit(
     help="End date in 'Y-m-d' format.",
 )
 @with_sqlalchemy_error_handling
+@with_snapshot_update
+@with_name_index_refresh
 def add_habit_cmd(
     name: str,
     description: str,
     type: str,
     start_date: datetime.datetime,
     end_date: datetime.datetime,
-) -> None:
+) -> list[str]:
     local_session = create_local_session()
     with local_session.begin() as sess:
         add_habit(sess, name, description, type, start_date, end_date)
+
+    return [name]
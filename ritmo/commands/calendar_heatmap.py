@@ -0,0 +1,183 @@
+import calendar
+import datetime
+from array import array
+
+import click
+from rich.console import Console
+from rich.segment import Segment, Segments
+from rich.style import Style
+from sqlalchemy import Integer, and_, cast, func, select
+from sqlalchemy.orm import Session
+
+from ritmo.decorators import with_sqlalchemy_error_handling
+from ritmo.models import Habit, HabitDailyCount
+from ritmo.profiling import phase
+from ritmo.sessions import create_local_session
+
+# Colors of each intensity level, from not completed to completed the most times.
+LEVEL_STYLES = [
+    Style(color=color)
+    for color in ["#2d333b", "#0e4429", "#006d32", "#26a641", "#39d353"]
+]
+
+NAME_STYLE = Style(bold=True)
+
+NEW_LINE = Segment.line()
+
+WEEKDAY_LABELS = ["Mon ", "    ", "Wed ", "    ", "Fri ", "    ", "Sun "]
+
+
+def load_year(
+    sess: Session, year: int, name: str | None = None
+) -> tuple[list[str], array]:
+    """
+    Load the daily counts of a year with a single query into a dense array.
+
+    Args:
+        sess: The database session.
+        year: The year to load.
+        name: The name of the habit to load. Every habit is loaded if not given.
+
+    Returns:
+        The names of the habits, ordered by name, and their counts with one row of
+        days per habit, so the count of habit i on day d is at i * days + d.
+    """
+
+    first_day = datetime.date(year, 1, 1)
+    days = (datetime.date(year + 1, 1, 1) - first_day).days
+
+    day_offset = cast(
+        func.julianday(HabitDailyCount.date) - func.julianday(first_day.isoformat()),
+        Integer,
+    )
+    stmt = (
+        select(Habit.name, day_offset, HabitDailyCount.count)
+        .outerjoin(
+            HabitDailyCount,
+            and_(
+                HabitDailyCount.habit_id == Habit.id,
+                HabitDailyCount.date >= first_day,
+                HabitDailyCount.date < datetime.date(year + 1, 1, 1),
+            ),
+        )
+        .order_by(Habit.name)
+    )
+    if name:
+        stmt = stmt.where(Habit.name == name)
+
+    names: list[str] = []
+    counts = array("I")
+    for habit_name, day, count in sess.connection().execute(stmt):
+        if not names or names[-1] != habit_name:
+            names.append(habit_name)
+            counts.frombytes(bytes(days * counts.itemsize))
+
+        if day is not None:
+            counts[(len(names) - 1) * days + day] = count
+
+    return names, counts
+
+
+def render_heatmap(name: str, counts: array | memoryview, year: int) -> Segments:
+    """
+    Render the daily counts of a habit as a heatmap with a column per week and a row per weekday.
+    Consecutive cells with the same intensity are emitted as a single styled segment.
+
+    Args:
+        name: The name of the habit.
+        counts: The count of each day of the year.
+        year: The year of the counts.
+    """
+
+    first_weekday = datetime.date(year, 1, 1).weekday()
+    weeks = (first_weekday + len(counts) + 6) // 7
+    max_count = max(counts, default=0) or 1
+
+    month_row = [" "] * weeks
+    for month in range(1, 13):
+        day = datetime.date(year, month, 1).timetuple().tm_yday - 1
+        week = (first_weekday + day) // 7
+        if week + 3 <= weeks and month_row[week] == " ":
+            month_row[week : week + 3] = calendar.month_abbr[month]
+
+    segments = [
+        Segment(name, NAME_STYLE),
+        NEW_LINE,
+        Segment("    " + "".join(month_row)),
+        NEW_LINE,
+    ]
+
+    for weekday in range(7):
+        segments.append(Segment(WEEKDAY_LABELS[weekday]))
+
+        run_style, run_length = None, 0
+        for week in range(weeks):
+            day = week * 7 + weekday - first_weekday
+            if 0 <= day < len(counts):
+                style = LEVEL_STYLES[-(-4 * counts[day] // max_count)]
+            else:
+                style = None
+
+            if style is not run_style and run_length:
+                segments.append(to_segment(run_style, run_length))
+                run_length = 0
+            run_style = style
+            run_length += 1
+
+        segments.append(to_segment(run_style, run_length))
+        segments.append(NEW_LINE)
+
+    return Segments(segments)
+
+
+def to_segment(style: Style | None, length: int) -> Segment:
+    """
+    Build the segment of a run of cells with the same intensity, or of days outside the year.
+    """
+
+    return Segment("■" * length, style) if style else Segment(" " * length)
+
+
+def show_calendar(sess: Session, year: int, name: str | None = None) -> None:
+    """
+    Show a heatmap of the daily completions of a habit, or of every habit, during a year.
+
+    Args:
+        sess: The database session.
+        year: The year to show.
+        name: The name of the habit to show. Every habit is shown if not given.
+    """
+
+    names, counts = load_year(sess, year, name)
+    if len(names) == 0:
+        click.echo(f"Habit '{name}' not found." if name else "No habits to show.")
+        return
+
+    days = len(counts) // len(names)
+    view = memoryview(counts)
+
+    console = Console()
+    with phase("render"):
+        for index, habit_name in enumerate(names):
+            console.print(
+                render_heatmap(
+                    habit_name, view[index * days : (index + 1) * days], year
+                )
+            )
+
+
+@click.command(name="calendar", help="Show a heatmap of habit completions in a year.")
+@click.argument("name", nargs=1, type=str, required=False)
+@click.option(
+    "--year",
+    type=int,
+    help="Year to show (defaults to the current year).",
+)
+@with_sqlalchemy_error_handling
+def show_calendar_cmd(name: str | None, year: int | None):
+    if year is None:
+        year = datetime.datetime.utcnow().year
+
+    local_session = create_local_session()
+    with local_session.begin() as sess:
+        show_calendar(sess, year, name)
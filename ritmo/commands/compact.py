@@ -0,0 +1,188 @@
+import datetime
+from pathlib import Path
+
+import click
+from sqlalchemy import MetaData, Table, delete, insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ritmo.decorators import with_sqlalchemy_error_handling
+from ritmo.models import Habit, HabitLogArchive
+from ritmo.sessions import create_local_session
+
+# Name the archive database file is attached under.
+ARCHIVE_SCHEMA = "archive"
+
+# Number of recent days whose archived logs stay in the database by default.
+KEEP_DAYS = 90
+
+LOG_COLUMNS = ["id", "habit_id", "date", "completed", "completed_at", "count"]
+
+
+def get_archive_table(schema: str | None = None) -> Table:
+    """
+    Get the archive table, in an attached database if a schema is given.
+
+    Args:
+        schema: The name the archive database was attached under.
+    """
+
+    table = HabitLogArchive.__table__
+    if schema is None:
+        return table
+
+    return table.to_metadata(MetaData(), schema=schema)
+
+
+def compact_logs(
+    sess: Session | Connection, before: datetime.date, archive: Table | None = None
+) -> tuple[int, int]:
+    """
+    Compact the history of the habit logs before a date. Habit logs hold a single row
+    per habit and day, so reports are left unchanged, and the original logs of each
+    completion, kept in habit_logs_archive when they were merged, are moved to the
+    archive table. Archived logs of habits that no longer exist are removed.
+
+    Args:
+        sess: The database session.
+        before: The first day whose archived logs are kept in habit_logs_archive.
+        archive: The table to move the archived logs to, habit_logs_archive by default.
+
+    Returns:
+        The number of logs moved to the archive and the number of logs removed.
+    """
+
+    source = get_archive_table()
+    removed = sess.execute(
+        delete(source)
+        .where(source.c.habit_id.not_in(select(Habit.id)))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    if archive is None or archive is source:
+        return 0, removed
+
+    is_old = source.c.date < before
+    archived = sess.execute(
+        insert(archive).from_select(
+            LOG_COLUMNS,
+            select(*(source.c[column] for column in LOG_COLUMNS)).where(is_old),
+        )
+    ).rowcount
+    sess.execute(
+        delete(source).where(is_old).execution_options(synchronize_session=False)
+    )
+
+    return archived, removed
+
+
+def optimize_database(engine: Engine) -> None:
+    """
+    Refresh the query planner statistics and rebuild the database file to reclaim the
+    space freed by removed rows. VACUUM cannot run inside a transaction, so it runs on a
+    connection in autocommit mode.
+
+    Args:
+        engine: The engine bound to the database.
+    """
+
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.exec_driver_sql("ANALYZE")
+        conn.exec_driver_sql("VACUUM")
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def compact_to_file(
+    conn: Connection, before: datetime.date, archive_path: Path
+) -> tuple[int, int]:
+    """
+    Compact the logs before a date, moving the archived ones to a separate database
+    file. The file is attached to the connection for the duration of the compaction.
+
+    Args:
+        conn: The database connection, outside of any transaction.
+        before: The first day whose archived logs are kept in habit_logs_archive.
+        archive_path: The path of the archive database, created if it does not exist.
+
+    Returns:
+        The number of logs moved to the archive and the number of logs removed.
+    """
+
+    archive = get_archive_table(ARCHIVE_SCHEMA)
+    conn.exec_driver_sql(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (str(archive_path),))
+    conn.commit()
+    try:
+        with conn.begin():
+            archive.create(conn, checkfirst=True)
+            return compact_logs(conn, before, archive)
+    finally:
+        conn.exec_driver_sql(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+        conn.commit()
+
+
+@click.command(
+    name="compact",
+    help="Remove the archived logs of deleted habits, optionally move the archived "
+    "logs of old days to a separate file, and optimize the database.",
+)
+@click.option(
+    "--archive-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Move the archived logs of old days to this database file.",
+)
+@click.option(
+    "--keep-days",
+    type=click.IntRange(min=0),
+    help="Number of recent days whose archived logs stay in the database with "
+    f"--archive-file.  [default: {KEEP_DAYS}]",
+)
+@click.option(
+    "--before",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Move the archived logs before this date in 'Y-m-d' format instead, with "
+    "--archive-file.",
+)
+@click.option(
+    "--no-vacuum",
+    is_flag=True,
+    help="Do not rebuild the database file afterwards.",
+)
+@with_sqlalchemy_error_handling
+def compact_cmd(
+    archive_file: Path | None,
+    keep_days: int | None,
+    before: datetime.datetime | None,
+    no_vacuum: bool,
+):
+    # Logs are stored once per day, only the archive has a history to move.
+    if not archive_file and (keep_days is not None or before):
+        raise click.UsageError("--keep-days and --before require --archive-file.")
+
+    if before:
+        horizon = before.date()
+    else:
+        horizon = datetime.datetime.utcnow().date() - datetime.timedelta(
+            KEEP_DAYS if keep_days is None else keep_days
+        )
+
+    local_session = create_local_session()
+    engine = local_session.kw["bind"]
+    if archive_file:
+        with engine.connect() as conn:
+            archived, removed = compact_to_file(conn, horizon, archive_file)
+    else:
+        with local_session.begin() as sess:
+            archived, removed = compact_logs(sess, horizon)
+
+    if not no_vacuum:
+        optimize_database(engine)
+
+    message = f"Removed {removed} archived logs of deleted habits."
+    if archive_file:
+        message = (
+            f"Moved {archived} archived logs before {horizon.isoformat()} to "
+            f"{archive_file}. {message}"
+        )
+    click.echo(message)
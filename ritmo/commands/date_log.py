@@ -1,50 +1,53 @@
 import datetime
 
 import click
-from rich.console import Console
-from rich.table import Table
 from sqlalchemy.orm import Session
 
 from ritmo.decorators import with_sqlalchemy_error_handling
-from ritmo.models import Habit, HabitLog
+from ritmo.output import echo_rows, output_options
+from ritmo.service import DayLogRow
 from ritmo.sessions import create_local_session
+from ritmo.storage import Storage, as_storage
 
 
-def get_by_date(sess: Session, date: datetime.datetime) -> None:
+def get_by_date(
+    sess: Session | Storage,
+    date: datetime.datetime,
+    format: str = "table",
+    pager: bool = False,
+) -> None:
     """
     Get habit logs for a specific date.
 
     Args:
-        sess: The database session.
+        sess: The database session, or any storage.
         date: The date to show the habit logs for (defaults to today).
+        format: One of 'table', 'tsv' or 'json'.
+        pager: Show the habit logs in a pager.
     """
 
-    habits = sess.query(Habit).all()
-    if len(habits) == 0:
+    shown = echo_rows(
+        as_storage(sess).iter_day_logs(date.date()),
+        DayLogRow._fields,
+        format,
+        headers=["Name", "Completed"],
+        to_cells=to_cells,
+        title=f"{date.date()}",
+        pager=pager,
+    )
+
+    if shown == 0 and format == "table":
         click.echo("No habits to show.")
-        return
 
-    table = Table(show_header=True, title=f"{date.date()}")
-    table.add_column("Name")
-    table.add_column("Completed")
 
-    for habit in habits:
-        habit_logs = (
-            sess.query(HabitLog)
-            .filter(HabitLog.habit_id == habit.id, HabitLog.date == date.date())
-            .all()
-        )
+def to_cells(habit_log: DayLogRow) -> list[str]:
+    name, type, times_done = habit_log
+    if times_done == 0:
+        return [name, "No"]
+    elif type == "boolean":
+        return [name, "Yes"]
 
-        if len(habit_logs) == 0:
-            table.add_row(habit.name, "No")
-        else:
-            if habit.type == "boolean":
-                table.add_row(habit.name, "Yes")
-            else:
-                table.add_row(habit.name, f"{len(habit_logs)} times")
-
-    console = Console()
-    console.print(table)
+    return [name, f"{times_done} times"]
 
 
 @click.command(name="logs", help="Show habit logs for a specific date [%Y-%m-%d].")
@@ -52,30 +55,37 @@ def get_by_date(sess: Session, date: datetime.datetime) -> None:
     "date",
     nargs=1,
     type=click.DateTime(formats=["%Y-%m-%d"]),
-    default=datetime.datetime.utcnow().strftime("%Y-%m-%d"),
+    default=None,
 )
+@output_options
 @with_sqlalchemy_error_handling
-def show_date_cmd(date: datetime.datetime) -> None:
+def show_date_cmd(date: datetime.datetime | None, format: str, pager: bool) -> None:
+    # Today is resolved on each call, as the daemon keeps the command loaded for days.
+    if date is None:
+        date = datetime.datetime.utcnow()
+
     local_session = create_local_session()
     with local_session.begin() as sess:
-        get_by_date(sess, date)
+        get_by_date(sess, date, format, pager)
 
 
 @click.command(name="today", help="Show today's habit logs.")
+@output_options
 @with_sqlalchemy_error_handling
-def show_today_cmd() -> None:
+def show_today_cmd(format: str, pager: bool) -> None:
     """
     Show today's habit logs.
     """
 
     local_session = create_local_session()
     with local_session.begin() as sess:
-        get_by_date(sess, datetime.datetime.utcnow())
+        get_by_date(sess, datetime.datetime.utcnow(), format, pager)
 
 
 @click.command(name="yesterday", help="Show yesterday's habit logs.")
+@output_options
 @with_sqlalchemy_error_handling
-def show_yesterday_cmd() -> None:
+def show_yesterday_cmd(format: str, pager: bool) -> None:
     """
     Show yesterday's habit logs.
     """
@@ -83,4 +93,4 @@ def show_yesterday_cmd() -> None:
     yesterday_date = datetime.datetime.now() - datetime.timedelta(days=1)
     local_session = create_local_session()
     with local_session.begin() as sess:
-        get_by_date(sess, yesterday_date)
+        get_by_date(sess, yesterday_date, format, pager)
@@ -1,32 +1,79 @@
+from typing import Sequence
+
 import click
 from sqlalchemy.orm import Session
 
-from ritmo.decorators import with_sqlalchemy_error_handling
-from ritmo.models import Habit, HabitLog
+from ritmo.completion import complete_habit_names
+from ritmo.decorators import (
+    with_name_index_refresh,
+    with_snapshot_update,
+    with_sqlalchemy_error_handling,
+)
+from ritmo.service import remove_habits
 from ritmo.sessions import create_local_session
+from ritmo.storage import Storage, as_storage
+
+
+def echo_missing(
+    names: Sequence[str], pattern: str | None, deleted: Sequence[str]
+) -> None:
+    """
+    Print the names and the pattern that did not match any habit.
+    """
+
+    deleted_names = set(deleted)
+    for name in names:
+        if name not in deleted_names:
+            click.echo(f"Habit '{name}' not found.")
 
+    if pattern is not None and deleted_names.issubset(names):
+        click.echo(f"No habit matches '{pattern}'.")
 
-def delete_habit(sess: Session, name: str) -> None:
+
+def delete_habit(sess: Session | Storage, name: str) -> None:
     """
     Delete a habit.
 
     Args:
-        sess: The database session.
+        sess: The database session, or any storage.
         name: The name of the habit.
     """
 
-    habit = sess.query(Habit).filter(Habit.name == name).first()
+    echo_missing([name], None, as_storage(sess).delete_habits([name]))
 
-    if habit:
-        sess.query(HabitLog).filter(HabitLog.habit_id == habit.id).delete()
-        sess.delete(habit)
-        sess.commit()
 
+def delete_habits(
+    sess: Session | Storage, names: Sequence[str], pattern: str | None
+) -> None:
+    """
+    Delete habits by name or by pattern in a single transaction.
 
-@click.command(name="delete", help="Delete a habit.")
-@click.argument("name", nargs=1, type=str, required=True)
+    Args:
+        sess: The database session, or any storage.
+        names: The names of the habits.
+        pattern: A glob pattern matching the names of the habits.
+    """
+
+    echo_missing(names, pattern, as_storage(sess).delete_habits(names, pattern))
+
+
+@click.command(name="delete", help="Delete habits.")
+@click.argument("names", nargs=-1, type=str, shell_complete=complete_habit_names)
+@click.option(
+    "--pattern",
+    type=str,
+    help="Also delete the habits whose name matches this glob pattern, e.g. 'read-*'.",
+)
 @with_sqlalchemy_error_handling
-def delete_habit_cmd(name: str):
+@with_snapshot_update
+@with_name_index_refresh
+def delete_habit_cmd(names: tuple[str, ...], pattern: str | None) -> list[str]:
+    if not names and pattern is None:
+        raise click.UsageError("Give the names of the habits or a --pattern.")
+
     local_session = create_local_session()
     with local_session.begin() as sess:
-        delete_habit(sess, name)
+        deleted = remove_habits(sess, names, pattern)
+
+    echo_missing(names, pattern, deleted)
+    return deleted
@@ -3,81 +3,165 @@ import datetime
 import click
 from sqlalchemy.orm import Session
 
-from ritmo.decorators import with_sqlalchemy_error_handling
-from ritmo.models import Habit, HabitLog
+from ritmo.completion import complete_habit_names
+from ritmo.decorators import with_snapshot_update, with_sqlalchemy_error_handling
+from ritmo.service import mark_many_as_done, mark_many_as_undone
 from ritmo.sessions import create_local_session
+from ritmo.storage import Storage, as_storage
 
 
-def mark_as_done(sess: Session, name: str) -> None:
+def get_dates(
+    date: datetime.datetime | None,
+    date_range: tuple[datetime.datetime, datetime.datetime] | None,
+) -> list[datetime.date]:
+    """
+    Get the days selected with the --date and --date-range options, defaulting to today.
+
+    Args:
+        date: A single day.
+        date_range: The first and last days of a range, inclusive.
+
+    Raises:
+        click.UsageError: If both options are given.
+        click.BadParameter: If the last day of the range is before the first one.
+    """
+
+    if date and date_range:
+        raise click.UsageError("--date and --date-range cannot be used together.")
+
+    if date_range:
+        first_day, last_day = (day.date() for day in date_range)
+        if last_day < first_day:
+            raise click.BadParameter(
+                "The last day must not be before the first day.",
+                param_hint="--date-range",
+            )
+
+        return [
+            first_day + datetime.timedelta(days=offset)
+            for offset in range((last_day - first_day).days + 1)
+        ]
+
+    if date:
+        return [date.date()]
+
+    return [datetime.datetime.utcnow().date()]
+
+
+def echo_results(results: dict[str, int | None], action: str, none_message: str):
+    """
+    Print the number of logs changed per habit.
+    """
+
+    for name, changed in results.items():
+        if changed is None:
+            click.echo(f"Habit '{name}' not found.")
+        elif changed == 0:
+            click.echo(f"Habit '{name}' {none_message}.")
+        else:
+            times = "time" if changed == 1 else "times"
+            click.echo(f"Habit '{name}' marked as {action} {changed} {times}.")
+
+
+def mark_as_done(sess: Session | Storage, name: str) -> None:
     """
     Mark a habit as done.
     If the habit is of type 'numerical', the number of completed days will be incremented.
 
     Args:
-        sess: The database session.
+        sess: The database session, or any storage.
         name: The name of the habit to mark as done. If the habit does not exist, it will not be created.
     """
 
-    habit = sess.query(Habit).filter(Habit.name == name).first()
-
-    if not habit:
+    today = datetime.datetime.utcnow().date()
+    results = as_storage(sess).append_logs([name], [today])
+    if results[name] is None:
         click.echo(f"Habit '{name}' not found.")
 
-    habit_log = sess.query(HabitLog).filter(HabitLog.habit_id == habit.id)
-    if habit_log.count() == 0 or habit.type == "numerical":
-        habit_day = HabitLog(habit_id=habit.id)
-        sess.add(habit_day)
-        sess.commit()
-
 
-@click.command(name="done", help="Mark a habit as done.")
-@click.argument("name", nargs=1, type=str)
+@click.command(name="done", help="Mark habits as done.")
+@click.argument(
+    "names", nargs=-1, type=str, required=True, shell_complete=complete_habit_names
+)
+@click.option(
+    "--date",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Day in 'Y-m-d' format (defaults to today).",
+)
+@click.option(
+    "--date-range",
+    nargs=2,
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="First and last days in 'Y-m-d' format.",
+)
 @with_sqlalchemy_error_handling
-def mark_as_done_cmd(name: str):
+@with_snapshot_update
+def mark_as_done_cmd(
+    names: tuple[str, ...],
+    date: datetime.datetime | None,
+    date_range: tuple[datetime.datetime, datetime.datetime] | None,
+) -> list[str]:
     local_session = create_local_session()
     with local_session.begin() as sess:
-        mark_as_done(sess, name)
+        results = mark_many_as_done(sess, names, get_dates(date, date_range))
+
+    echo_results(results, "done", "was already done")
+    return list(names)
 
 
-def mark_as_undone(sess: Session, name: str) -> None:
+def mark_as_undone(sess: Session | Storage, name: str, times: int = 1) -> None:
     """
     Mark a habit as undone.
     If the habit is of type 'numerical', the number of times completed will be decremented. If the number of times completed
     reaches 0, the habit_day will be deleted.
 
     Args:
-        sess: The database session.
+        sess: The database session, or any storage.
         name: The name of the habit to mark as undone.
+        times: The number of completions to remove.
     """
 
-    habit = sess.query(Habit).filter(Habit.name == name).first()
-
-    if not habit:
+    today = datetime.datetime.utcnow().date()
+    results = as_storage(sess).remove_logs([name], [today], times)
+    if results[name] is None:
         click.echo(f"Habit '{name}' not found.")
-        return
-
-    habit_log = (
-        sess.query(HabitLog)
-        .filter(
-            HabitLog.habit_id == habit.id
-            and habit.completed_at == datetime.datetime.today()
-        )
-        .order_by(HabitLog.completed_at)
-    )
-
-    if habit_log.count() == 0:
+    elif results[name] == 0:
         click.echo(f"Habit '{name}' has not been done today.")
-        return
-    else:
-        habit_log = habit_log.first()
-        sess.delete(habit_log)
-        sess.commit()
 
 
-@click.command(name="undo", help="Mark a habit as undone.")
-@click.argument("name", nargs=1, type=str)
+@click.command(name="undo", help="Mark habits as undone.")
+@click.argument(
+    "names", nargs=-1, type=str, required=True, shell_complete=complete_habit_names
+)
+@click.option(
+    "--date",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Day in 'Y-m-d' format (defaults to today).",
+)
+@click.option(
+    "--date-range",
+    nargs=2,
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="First and last days in 'Y-m-d' format.",
+)
+@click.option(
+    "--times",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of completions to remove from each day.",
+)
 @with_sqlalchemy_error_handling
-def mark_as_undone_cmd(name: str):
+@with_snapshot_update
+def mark_as_undone_cmd(
+    names: tuple[str, ...],
+    date: datetime.datetime | None,
+    date_range: tuple[datetime.datetime, datetime.datetime] | None,
+    times: int,
+) -> list[str]:
     local_session = create_local_session()
     with local_session.begin() as sess:
-        mark_as_undone(sess, name)
+        results = mark_many_as_undone(sess, names, get_dates(date, date_range), times)
+
+    echo_results(results, "undone", "was not done")
+    return list(names)
@@ -0,0 +1,247 @@
+import csv
+import datetime
+import json
+from typing import IO, Iterable, Iterator, Sequence
+
+import click
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from ritmo.decorators import with_sqlalchemy_error_handling
+from ritmo.models import Habit, HabitLog
+from ritmo.sessions import create_local_session
+
+FORMATS = ["csv", "ndjson", "parquet"]
+EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "jsonl": "ndjson", "parquet": "parquet"}
+
+
+def select_habits(habits: Sequence[str]) -> Select:
+    """
+    Build the query for the habits to export.
+
+    Args:
+        habits: Names of the habits to export. All habits are exported if empty.
+    """
+
+    stmt = select(
+        Habit.name,
+        Habit.description,
+        Habit.type,
+        Habit.start_date,
+        Habit.end_date,
+    ).order_by(Habit.id)
+
+    if habits:
+        stmt = stmt.where(Habit.name.in_(habits))
+
+    return stmt
+
+
+def select_logs(
+    habits: Sequence[str],
+    since: datetime.date | None,
+    until: datetime.date | None,
+) -> Select:
+    """
+    Build the query for the habit logs to export.
+
+    Args:
+        habits: Names of the habits whose logs are exported. All habits are exported if empty.
+        since: First date to export, inclusive.
+        until: Last date to export, inclusive.
+    """
+
+    stmt = (
+        select(
+            Habit.name.label("habit"),
+            HabitLog.date,
+            HabitLog.completed,
+            HabitLog.completed_at,
+            HabitLog.count,
+        )
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .order_by(HabitLog.id)
+    )
+
+    if habits:
+        stmt = stmt.where(Habit.name.in_(habits))
+    if since:
+        stmt = stmt.where(HabitLog.date >= since)
+    if until:
+        stmt = stmt.where(HabitLog.date <= until)
+
+    return stmt
+
+
+def to_text(value) -> str | int | bool | None:
+    """
+    Convert dates to ISO strings, leaving any other value untouched.
+    """
+
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+
+    return value
+
+
+def write_csv(file: IO[str], columns: list[str], batches: Iterable[list]) -> None:
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(batch)
+
+
+def write_ndjson(file: IO[str], columns: list[str], batches: Iterable[list]) -> None:
+    for batch in batches:
+        file.writelines(
+            json.dumps(dict(zip(columns, map(to_text, row)))) + "\n" for row in batch
+        )
+
+
+def write_parquet(
+    path: str, columns: list[str], types: list[type], batches: Iterable[list]
+) -> None:
+    """
+    Write each batch as a row group of a Parquet file. Requires pyarrow.
+    """
+
+    import pyarrow
+    import pyarrow.parquet
+
+    arrow_types = {
+        bool: pyarrow.bool_(),
+        int: pyarrow.int64(),
+        str: pyarrow.string(),
+        datetime.date: pyarrow.date32(),
+    }
+    schema = pyarrow.schema(
+        [(column, arrow_types[type]) for column, type in zip(columns, types)]
+    )
+
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for batch in batches:
+            writer.write_table(
+                pyarrow.Table.from_pylist(
+                    [dict(zip(columns, row)) for row in batch], schema=schema
+                )
+            )
+
+
+def export_data(
+    sess: Session,
+    output: str,
+    stmt: Select,
+    format: str,
+    batch_size: int = 10000,
+) -> int:
+    """
+    Stream the rows of a query to a file, fetching them in batches from a server-side cursor.
+
+    Args:
+        sess: The database session.
+        output: The path of the file to write, or '-' for the standard output.
+        stmt: The query whose rows are exported.
+        format: One of 'csv', 'ndjson' or 'parquet'.
+        batch_size: The number of rows fetched and written at a time.
+
+    Returns:
+        The number of exported rows.
+    """
+
+    result = sess.execute(
+        stmt, execution_options={"stream_results": True, "yield_per": batch_size}
+    )
+    columns = list(result.keys())
+    exported = 0
+
+    def batches() -> Iterator[list]:
+        nonlocal exported
+
+        for batch in result.partitions():
+            exported += len(batch)
+            yield batch
+
+    if format == "parquet":
+        types = [column.type.python_type for column in stmt.selected_columns]
+        write_parquet(output, columns, types, batches())
+    else:
+        writer = write_csv if format == "csv" else write_ndjson
+        with click.open_file(output, "w") as file:
+            writer(file, columns, batches())
+
+    return exported
+
+
+@click.command(name="export", help="Export habits or habit logs to a file.")
+@click.argument("output", type=click.Path(dir_okay=False, allow_dash=True))
+@click.option(
+    "--table",
+    type=click.Choice(["logs", "habits"], case_sensitive=False),
+    default="logs",
+    show_default=True,
+    help="What to export.",
+)
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(FORMATS, case_sensitive=False),
+    help="Format of the file. Guessed from the file extension by default.",
+)
+@click.option(
+    "--habit",
+    "habits",
+    multiple=True,
+    help="Only export this habit. Can be repeated.",
+)
+@click.option(
+    "--from",
+    "since",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Only export logs from this date in 'Y-m-d' format.",
+)
+@click.option(
+    "--to",
+    "until",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Only export logs up to this date in 'Y-m-d' format.",
+)
+@with_sqlalchemy_error_handling
+def export_data_cmd(
+    output: str,
+    table: str,
+    format: str | None,
+    habits: tuple[str, ...],
+    since: datetime.datetime | None,
+    until: datetime.datetime | None,
+):
+    if not format:
+        extension = output.rsplit(".", 1)[-1].lower()
+        format = EXTENSIONS.get(extension, "csv")
+
+    if format == "parquet":
+        if output == "-":
+            click.echo("Parquet files cannot be written to the standard output.")
+            return
+
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            click.echo("Exporting to Parquet requires pyarrow to be installed.")
+            return
+
+    if table == "habits":
+        stmt = select_habits(habits)
+    else:
+        stmt = select_logs(
+            habits,
+            since.date() if since else None,
+            until.date() if until else None,
+        )
+
+    local_session = create_local_session()
+    with local_session.begin() as sess:
+        exported = export_data(sess, output, stmt, format)
+
+    if output != "-":
+        click.echo(f"Exported {exported} rows to {output}.")
@@ -0,0 +1,23 @@
+import click
+
+from ritmo.decorators import with_snapshot_update, with_sqlalchemy_error_handling
+from ritmo.journal.merge import merge_journal
+from ritmo.sessions import get_local_path
+from ritmo.sessions.sessions import create_session
+
+
+@click.command(
+    name="flush",
+    help="Merge the completions journaled by 'ritmo done' into the database.",
+)
+@with_sqlalchemy_error_handling
+@with_snapshot_update
+def flush_journal_cmd() -> list[str]:
+    # The local session would merge the journal on creation, without reporting it.
+    local_session = create_session(f"sqlite:///{get_local_path()}")
+    results = merge_journal(local_session)
+
+    merged = sum(added for added in results.values() if added)
+    times = "completion" if merged == 1 else "completions"
+    click.echo(f"Merged {merged} journaled {times}.")
+    return [name for name, added in results.items() if added]
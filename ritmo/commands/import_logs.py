@@ -0,0 +1,219 @@
+import csv
+import datetime
+import json
+import time
+from collections import Counter
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+import click
+from sqlalchemy.orm import Session
+
+from ritmo.decorators import with_snapshot_update, with_sqlalchemy_error_handling
+from ritmo.models import Habit
+from ritmo.service import upsert_logs
+from ritmo.sessions import create_local_session
+from ritmo.stats import record_imported, update_streaks
+
+
+def read_rows(file: IO[str], format: str) -> Iterator[dict | None]:
+    """
+    Read rows one at a time from a CSV file with a header or from a JSON Lines file.
+    Lines that are not valid JSON are read as None, so they are skipped by import_logs
+    instead of failing the whole import.
+
+    Args:
+        file: The file to read from.
+        format: Either 'csv' or 'ndjson'.
+    """
+
+    if format == "csv":
+        yield from csv.DictReader(file)
+    else:
+        for line in file:
+            if line and not line.isspace():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    yield None
+
+
+def parse_count(value: object) -> int | None:
+    """
+    Parse the count of completions of a row, 1 when it has none.
+
+    Args:
+        value: The count of the row, an integer from JSON or a string from CSV.
+
+    Returns:
+        The count, or None if it is not a positive integer.
+    """
+
+    # An empty CSV cell is a missing count.
+    if value is None or value == "":
+        return 1
+
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return None
+
+    try:
+        count = int(value)
+    except ValueError:
+        return None
+
+    return count if count >= 1 else None
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """
+    Split an iterable into lists of at most the given size.
+
+    Args:
+        iterable: The iterable to split.
+        size: The maximum size of each batch.
+    """
+
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def import_logs(
+    sess: Session, rows: Iterable[dict | None], batch_size: int = 10000
+) -> tuple[int, int]:
+    """
+    Import habit logs in batches inside a single transaction. The rows of a batch are
+    summed per habit and day and added to the count of the existing logs, boolean habits
+    being done at most once per day.
+    Each row must have a 'habit' name and a 'date' in 'Y-m-d' format, and may have the
+    'count' of completions it stands for, as exported from daily logs. Rows that are
+    not objects, for habits that do not exist or with invalid dates or counts that are
+    not positive integers are skipped.
+
+    Args:
+        sess: The database session.
+        rows: The rows to import.
+        batch_size: The number of rows imported per statement.
+
+    Returns:
+        The number of imported and skipped rows.
+    """
+
+    habit_ids = {}
+    boolean_ids = set()
+    for name, habit_id, type in sess.query(Habit.name, Habit.id, Habit.type):
+        habit_ids[name] = habit_id
+        if type == "boolean":
+            boolean_ids.add(habit_id)
+    skipped = 0
+
+    def resolve_logs() -> Iterator[dict]:
+        nonlocal skipped
+
+        for row in rows:
+            if not isinstance(row, dict):
+                skipped += 1
+                continue
+
+            name = row.get("habit")
+            habit_id = habit_ids.get(name) if isinstance(name, str) else None
+            try:
+                date = datetime.date.fromisoformat(row.get("date") or "")
+            except (TypeError, ValueError):
+                date = None
+            count = parse_count(row.get("count"))
+
+            if habit_id is None or date is None or count is None:
+                skipped += 1
+                continue
+
+            yield {"habit_id": habit_id, "date": date, "count": count}
+
+    imported = 0
+    imported_habit_ids: set[int] = set()
+    for batch in batched(resolve_logs(), batch_size):
+        daily_counts: Counter[tuple[int, datetime.date]] = Counter()
+        for log in batch:
+            daily_counts[log["habit_id"], log["date"]] += log["count"]
+
+        boolean_counts = {}
+        numerical_counts = {}
+        for (habit_id, date), count in daily_counts.items():
+            if habit_id in boolean_ids:
+                boolean_counts[habit_id, date] = 1
+            else:
+                numerical_counts[habit_id, date] = count
+
+        for counts, max_count in ((boolean_counts, 1), (numerical_counts, None)):
+            if not counts:
+                continue
+
+            sess.execute(
+                upsert_logs(max_count),
+                [
+                    {
+                        "habit_id": habit_id,
+                        "date": date,
+                        "completed_at": date,
+                        "count": count,
+                    }
+                    for (habit_id, date), count in counts.items()
+                ],
+            )
+            record_imported(sess, counts, max_count)
+        imported += len(batch)
+
+        imported_habit_ids.update(habit_id for habit_id, _ in daily_counts)
+
+    for habit_id in imported_habit_ids:
+        update_streaks(sess, habit_id)
+
+    sess.commit()
+
+    return imported, skipped
+
+
+@click.command(name="import", help="Import habit logs from a CSV or JSON Lines file.")
+@click.argument("file", type=click.File("r"))
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(["csv", "ndjson"], case_sensitive=False),
+    help="Format of the file. Guessed from the file extension by default.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=10000,
+    show_default=True,
+    help="Number of rows imported per statement.",
+)
+@with_sqlalchemy_error_handling
+@with_snapshot_update
+def import_logs_cmd(file: IO[str], format: str | None, batch_size: int) -> list[str]:
+    if not format:
+        format = "csv" if file.name.lower().endswith(".csv") else "ndjson"
+
+    # Only the habits logged today change the snapshot of today's habits.
+    today = datetime.datetime.utcnow().date().isoformat()
+    logged_today: set[str] = set()
+
+    def read_logs() -> Iterator[dict | None]:
+        for row in read_rows(file, format):
+            if isinstance(row, dict) and row.get("date") == today:
+                name = row.get("habit")
+                if isinstance(name, str):
+                    logged_today.add(name)
+            yield row
+
+    start = time.perf_counter()
+    local_session = create_local_session()
+    with local_session.begin() as sess:
+        imported, skipped = import_logs(sess, read_logs(), batch_size)
+    elapsed = time.perf_counter() - start
+
+    click.echo(
+        f"Imported {imported} logs ({skipped} skipped) in {elapsed:.2f}s "
+        f"({imported / elapsed:.0f} rows/s)."
+    )
+    return sorted(logged_today)
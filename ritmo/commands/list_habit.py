@@ -1,56 +1,60 @@
 import click
-from rich.console import Console
-from rich.table import Table
 from sqlalchemy.orm import Session
 
 from ritmo.decorators import with_sqlalchemy_error_handling
-from ritmo.models import Habit
+from ritmo.output import echo_rows, output_options
+from ritmo.service import HabitRow
 from ritmo.sessions import create_local_session
+from ritmo.storage import Storage, as_storage
 
 
-def list_habit(sess: Session, sort_by: str, reverse: bool) -> None:
+def list_habit(
+    sess: Session | Storage,
+    sort_by: str,
+    reverse: bool,
+    limit: int | None = None,
+    offset: int = 0,
+    name_filter: str | None = None,
+    format: str = "table",
+    pager: bool = False,
+) -> None:
     """
-    List all habits.
+    List habits, printing them as they are read.
 
     Args:
-        sess: The database session.
+        sess: The database session, or any storage.
         sort_by: Sorting criteria
         reverse: Reverse sorting criteria
+        limit: Maximum number of habits to list
+        offset: Number of habits to skip
+        name_filter: Only list habits whose name contains this text
+        format: One of 'table', 'tsv' or 'json'
+        pager: Show the habits in a pager
     """
 
-    table = Table(show_header=True, title="Habits")
-    table.add_column("Name")
-    table.add_column("Description")
-    table.add_column("Type")
-    table.add_column("Start date")
-    table.add_column("End date")
+    habits = as_storage(sess).iter_habits(sort_by, reverse, limit, offset, name_filter)
+    listed = echo_rows(
+        habits,
+        HabitRow._fields,
+        format,
+        headers=["Name", "Description", "Type", "Start date", "End date"],
+        to_cells=to_cells,
+        title="Habits",
+        pager=pager,
+    )
 
-    habits = sess.query(Habit).all()
-    if len(habits) == 0:
+    if listed == 0 and format == "table":
         click.echo("No habits found")
-        return
 
-    if sort_by == "name":
-        habits.sort(key=lambda habit: habit.name, reverse=reverse)
-    elif sort_by == "start-date":
-        print("sorting by date")
-        habits.sort(key=lambda habit: habit.start_date, reverse=reverse)
-    elif sort_by == "end-date":
-        habits.sort(
-            key=lambda habit: (habit.end_date is None, habit.end_date), reverse=reverse
-        )
 
-    for habit in habits:
-        table.add_row(
-            habit.name,
-            habit.description if habit.description else "None",
-            habit.type,
-            habit.start_date.strftime("%Y-%m-%d"),
-            habit.end_date.strftime("%Y-%m-%d") if habit.end_date else "None",
-        )
-
-    console = Console()
-    console.print(table)
+def to_cells(habit: HabitRow) -> list[str]:
+    return [
+        habit.name,
+        habit.description if habit.description else "None",
+        habit.type,
+        habit.start_date.strftime("%Y-%m-%d"),
+        habit.end_date.strftime("%Y-%m-%d") if habit.end_date else "None",
+    ]
 
 
 @click.command(name="list", help="List habits.")
@@ -68,8 +72,33 @@ def list_habit(sess: Session, sort_by: str, reverse: bool) -> None:
     default=False,
     show_default=True,
 )
+@click.option(
+    "--limit",
+    type=click.IntRange(min=0),
+    help="Maximum number of habits to list.",
+)
+@click.option(
+    "--offset",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Number of habits to skip.",
+)
+@click.option(
+    "--filter",
+    "name_filter",
+    help="Only list habits whose name contains this text.",
+)
+@output_options
 @with_sqlalchemy_error_handling
-def list_habit_cmd(sort_by: str, reverse: bool):
+def list_habit_cmd(
+    sort_by: str,
+    reverse: bool,
+    limit: int | None,
+    offset: int,
+    name_filter: str | None,
+    format: str,
+    pager: bool,
+):
     local_session = create_local_session()
     with local_session.begin() as sess:
-        list_habit(sess, sort_by, reverse)
+        list_habit(sess, sort_by, reverse, limit, offset, name_filter, format, pager)
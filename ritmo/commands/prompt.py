@@ -0,0 +1,31 @@
+import click
+
+from ritmo.decorators import with_sqlalchemy_error_handling
+from ritmo.sessions import create_local_session
+from ritmo.snapshot import DEFAULT_PROMPT_FORMAT, format_prompt
+from ritmo.snapshot.refresh import refresh_snapshot
+
+
+@click.command(
+    name="prompt",
+    help="Print a compact summary of today's habits for a shell prompt. It is read "
+    "from a snapshot kept up to date by the commands changing habits.",
+)
+@click.option(
+    "--format",
+    default=DEFAULT_PROMPT_FORMAT,
+    show_default=True,
+    help="Format string with the {done}, {total} and {pending} placeholders.",
+)
+@with_sqlalchemy_error_handling
+def prompt_cmd(format: str):
+    # The snapshot is read without this command when it exists, so it is created here.
+    local_session = create_local_session()
+    with local_session.begin() as sess:
+        rows = refresh_snapshot(sess)
+
+    habits = [(row.type, row.times_done, row.name) for row in rows]
+    try:
+        click.echo(format_prompt(habits, format))
+    except (KeyError, IndexError, ValueError) as e:
+        raise click.BadParameter(f"Invalid format: {e}", param_hint="--format")
@@ -0,0 +1,95 @@
+import calendar
+import datetime
+
+import click
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy.orm import Session
+
+from ritmo.decorators import with_sqlalchemy_error_handling
+from ritmo.profiling import phase
+from ritmo.sessions import create_local_session
+
+
+def show_report(sess: Session, since: datetime.date, until: datetime.date) -> None:
+    """
+    Show weekly and monthly completion rates, rolling averages and the weekday
+    distribution of completions within a date range.
+
+    Args:
+        sess: The database session.
+        since: First day of the report, inclusive.
+        until: Last day of the report, inclusive.
+    """
+
+    try:
+        from ritmo.analytics import completion_report
+    except ImportError:
+        click.echo("Reports require numpy to be installed.")
+        return
+
+    if until < since:
+        click.echo("End date must be after start date.")
+        return
+
+    with phase("analytics"):
+        report = completion_report(sess, since, until)
+
+    with phase("render"):
+        console = Console()
+
+        table = Table(show_header=True, title="Monthly completion")
+        table.add_column("Month")
+        table.add_column("Completion rate")
+        for month, rate in zip(report["months"], report["monthly_rate"]):
+            table.add_row(str(month), f"{rate:.0%}")
+        console.print(table)
+
+        table = Table(show_header=True, title="Weekly completion")
+        table.add_column("Week of")
+        table.add_column("Completion rate")
+        for week, rate in zip(report["weeks"], report["weekly_rate"]):
+            table.add_row(str(week), f"{rate:.0%}")
+        console.print(table)
+
+        total_completions = max(report["weekday_completions"].sum(), 1)
+        table = Table(show_header=True, title="Completions by weekday")
+        table.add_column("Weekday")
+        table.add_column("Completions")
+        table.add_column("Share")
+        for weekday, completions in enumerate(report["weekday_completions"]):
+            table.add_row(
+                calendar.day_name[weekday],
+                str(completions),
+                f"{completions / total_completions:.0%}",
+            )
+        console.print(table)
+
+        console.print(
+            f"Rolling average on {until}: "
+            f"{report['rolling_7'][-1]:.0%} over 7 days, "
+            f"{report['rolling_30'][-1]:.0%} over 30 days."
+        )
+
+
+@click.command(name="report", help="Show completion rates within a date range.")
+@click.option(
+    "--from",
+    "since",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="First day of the report in 'Y-m-d' format (defaults to 90 days ago).",
+)
+@click.option(
+    "--to",
+    "until",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Last day of the report in 'Y-m-d' format (defaults to today).",
+)
+@with_sqlalchemy_error_handling
+def show_report_cmd(since: datetime.datetime | None, until: datetime.datetime | None):
+    until_date = until.date() if until else datetime.datetime.utcnow().date()
+    since_date = since.date() if since else until_date - datetime.timedelta(days=89)
+
+    local_session = create_local_session()
+    with local_session.begin() as sess:
+        show_report(sess, since_date, until_date)
@@ -0,0 +1,23 @@
+import click
+
+from ritmo.daemon import get_socket_path
+from ritmo.daemon.server import create_server
+
+
+@click.command(name="serve", help="Run commands from other ritmo processes.")
+def serve_cmd():
+    socket_path = get_socket_path()
+    try:
+        server = create_server(socket_path)
+    except FileExistsError as e:
+        click.echo(e)
+        return
+
+    click.echo(f"Listening on {socket_path}.")
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
@@ -0,0 +1,90 @@
+import datetime
+
+import click
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy.orm import Session
+
+from ritmo.decorators import with_sqlalchemy_error_handling
+from ritmo.profiling import phase
+from ritmo.sessions import create_local_session
+from ritmo.stats import check_rollups, get_stats, rebuild_rollups
+
+
+def show_stats(sess: Session, today: datetime.date) -> None:
+    """
+    Show the streaks and completion rate of every habit.
+
+    Args:
+        sess: The database session.
+        today: The day to show the stats for.
+    """
+
+    stats = get_stats(sess, today)
+    if len(stats) == 0:
+        click.echo("No habits to show.")
+        return
+
+    table = Table(show_header=True, title="Stats")
+    table.add_column("Name")
+    table.add_column("Current streak")
+    table.add_column("Longest streak")
+    table.add_column("Last completed")
+    table.add_column("Completion rate")
+
+    for habit_stats in stats:
+        last_completed = habit_stats["last_completed"]
+        table.add_row(
+            habit_stats["name"],
+            f"{habit_stats['current_streak']} days",
+            f"{habit_stats['longest_streak']} days",
+            last_completed.strftime("%Y-%m-%d") if last_completed else "Never",
+            f"{habit_stats['completion_rate']:.0%}",
+        )
+
+    console = Console()
+    with phase("render"):
+        console.print(table)
+
+
+def rebuild_stats(sess: Session) -> None:
+    """
+    Check the rollups for inconsistencies and recompute them from the habit logs.
+
+    Args:
+        sess: The database session.
+    """
+
+    inconsistent_habits = check_rollups(sess)
+    if inconsistent_habits:
+        click.echo(f"Inconsistent stats found for: {', '.join(inconsistent_habits)}.")
+    else:
+        click.echo("No inconsistent stats found.")
+
+    rebuild_rollups(sess)
+    sess.commit()
+    click.echo("Stats rebuilt.")
+
+
+@click.group(
+    name="stats",
+    help="Show streaks and completion rates of habits.",
+    invoke_without_command=True,
+)
+@click.pass_context
+@with_sqlalchemy_error_handling
+def stats_cmd(ctx: click.Context):
+    if ctx.invoked_subcommand is not None:
+        return
+
+    local_session = create_local_session()
+    with local_session.begin() as sess:
+        show_stats(sess, datetime.datetime.utcnow().date())
+
+
+@stats_cmd.command(name="rebuild", help="Recompute stats from the habit logs.")
+@with_sqlalchemy_error_handling
+def rebuild_stats_cmd():
+    local_session = create_local_session()
+    with local_session.begin() as sess:
+        rebuild_stats(sess)
@@ -4,13 +4,20 @@ from typing import Optional
 import click
 from sqlalchemy.orm import Session
 
-from ritmo.decorators import with_sqlalchemy_error_handling
-from ritmo.models import Habit
+from ritmo.completion import complete_habit_names
+from ritmo.decorators import (
+    with_name_index_refresh,
+    with_snapshot_update,
+    with_sqlalchemy_error_handling,
+)
+from ritmo.service import HabitNotFoundError, HabitRow, ServiceError
 from ritmo.sessions import create_local_session
+from ritmo.storage import Storage, as_storage
+from ritmo.storage.base import to_date
 
 
 def update_habit(
-    sess: Session,
+    sess: Session | Storage,
     name: str,
     new_name: Optional[str | None],
     description: Optional[str | None],
@@ -22,7 +29,7 @@ def update_habit(
     Update an existing habit.
 
     Args:
-        sess: The database session.
+        sess: The database session, or any storage.
         name: The name of the habit.
         new_name: The new name of the habit.
         description: A description of the habit.
@@ -31,37 +38,28 @@ def update_habit(
         end_date: The date the habit ends.
     """
 
-    if not name:
-        click.echo("Habit name must be provided.")
-        return
-
-    if end_date and start_date and end_date < start_date:
-        click.echo("End date must be after start date.")
-        return
-
-    if not name or name.isspace():
-        click.echo("A new valid habit name must be specified.")
-        return
+    try:
+        store = as_storage(sess)
+        habit = store.get_habit(name)
+        if habit is None:
+            raise HabitNotFoundError(name)
 
-    habit = sess.query(Habit).filter(Habit.name == name).first()
-    if habit:
-        if new_name:
-            habit.name = new_name
-        if description:
-            habit.description = description
-        if type:
-            habit.type = type
-        if start_date:
-            habit.start_date = start_date
-        if end_date:
-            habit.end_date = end_date
-        sess.commit()
-    else:
-        click.echo(f"Habit '{name}' not found.")
+        store.put_habit(
+            HabitRow(
+                new_name or habit.name,
+                description or habit.description,
+                type or habit.type,
+                to_date(start_date) or habit.start_date,
+                to_date(end_date) or habit.end_date,
+            ),
+            name,
+        )
+    except ServiceError as e:
+        click.echo(e)
 
 
 @click.command(name="update", help="Update an existing habit.")
-@click.argument("name", nargs=1, type=str)
+@click.argument("name", nargs=1, type=str, shell_complete=complete_habit_names)
 @click.option(
     "--new-name",
     "-n",
@@ -100,6 +98,8 @@ def update_habit(
     help="End date in UTC format",
 )
 @with_sqlalchemy_error_handling
+@with_snapshot_update
+@with_name_index_refresh
 def update_habit_cmd(
     name: str,
     new_name: str,
@@ -107,7 +107,9 @@ def update_habit_cmd(
     type: str,
     start_date: datetime.datetime,
     end_date: datetime.datetime,
-):
+) -> list[str]:
     local_session = create_local_session()
     with local_session.begin() as sess:
         update_habit(sess, name, new_name, description, type, start_date, end_date)
+
+    return [name, new_name] if new_name else [name]
@@ -0,0 +1,13 @@
+# The index is refreshed from the database by ritmo.completion.refresh, so that
+# completing a habit name only imports the standard library.
+from .names import (
+    COMPLETE_VAR,
+    complete,
+    complete_habit_names,
+    get_name_index_path,
+    load_names,
+    match_names,
+    read_name_index,
+    rebuild_name_index,
+    write_name_index,
+)
@@ -0,0 +1,240 @@
+import bisect
+import os
+import sys
+
+# Shell completion runs on every Tab press, so this module only imports the standard
+# library and reads habit names from a sorted index instead of the database. The
+# index is rewritten by the commands changing habits and rebuilt with sqlite3 when
+# the database changed after it was written.
+
+COMPLETE_VAR = "_RITMO_COMPLETE"
+
+# Commands whose arguments are habit names, and whether they take several of them.
+NAME_COMMANDS = {"done": True, "undo": True, "delete": True, "update": False}
+
+
+def get_name_index_path() -> str:
+    """
+    Get the path of the index of habit names, ~/.ritmo/names.idx.
+    """
+
+    return os.path.join(os.path.expanduser("~"), ".ritmo", "names.idx")
+
+
+def get_database_path() -> str:
+    """
+    Get the path of the local database, ~/.ritmo/ritmo.db.
+    """
+
+    return os.path.join(os.path.expanduser("~"), ".ritmo", "ritmo.db")
+
+
+def read_name_index(path: str) -> list[str] | None:
+    """
+    Read an index of habit names, one sorted name per line.
+
+    Returns:
+        The sorted names, or None if the index does not exist or cannot be read.
+    """
+
+    try:
+        with open(path, encoding="utf-8") as file:
+            return file.read().splitlines()
+    except (OSError, ValueError):
+        return None
+
+
+def write_name_index(path: str, names: list[str]) -> None:
+    """
+    Replace an index of habit names atomically, so readers never see a partial one.
+
+    Args:
+        path: The path of the index.
+        names: The names of the habits, in any order.
+    """
+
+    names = sorted(name for name in names if "\n" not in name)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write("".join(f"{name}\n" for name in names))
+    os.replace(temporary_path, path)
+
+
+def get_mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def is_stale(index_path: str, db_path: str) -> bool:
+    """
+    Check if the database or its write-ahead log changed after the index was written.
+    """
+
+    db_mtime = max(get_mtime(db_path), get_mtime(f"{db_path}-wal"))
+    return db_mtime >= get_mtime(index_path)
+
+
+def rebuild_name_index(index_path: str, db_path: str) -> list[str] | None:
+    """
+    Rebuild an index from the habits of a database, opened read-only with sqlite3.
+
+    Returns:
+        The sorted names, or None if the database cannot be read.
+    """
+
+    import sqlite3
+
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            names = [name for (name,) in conn.execute("SELECT name FROM habits")]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+    write_name_index(index_path, names)
+    return sorted(name for name in names if "\n" not in name)
+
+
+def load_names(index_path: str | None = None, db_path: str | None = None) -> list[str]:
+    """
+    Get the sorted names of the habits from the index, rebuilding it first if stale.
+
+    Args:
+        index_path: The path of the index. Defaults to get_name_index_path().
+        db_path: The path of the database. Defaults to get_database_path().
+    """
+
+    index_path = index_path or get_name_index_path()
+    db_path = db_path or get_database_path()
+
+    names = None
+    if is_stale(index_path, db_path):
+        names = rebuild_name_index(index_path, db_path)
+    if names is None:
+        names = read_name_index(index_path)
+
+    return names or []
+
+
+def is_subsequence(needle: str, name: str) -> bool:
+    characters = iter(name)
+    return all(character in characters for character in needle)
+
+
+def match_names(names: list[str], incomplete: str) -> list[str]:
+    """
+    Find the names starting with a prefix by binary search on the sorted names. If none
+    does, fall back to the names containing it ignoring case, then to the names
+    containing its characters in order.
+
+    Args:
+        names: The sorted names of the habits.
+        incomplete: The prefix typed so far.
+    """
+
+    matches = []
+    for name in names[bisect.bisect_left(names, incomplete) :]:
+        if not name.startswith(incomplete):
+            break
+        matches.append(name)
+
+    if matches or not incomplete:
+        return matches
+
+    needle = incomplete.casefold()
+    ranked = []
+    for name in names:
+        folded = name.casefold()
+        if folded.startswith(needle):
+            ranked.append((0, name))
+        elif needle in folded:
+            ranked.append((1, name))
+        elif is_subsequence(needle, folded):
+            ranked.append((2, name))
+
+    return [name for _, name in sorted(ranked)]
+
+
+def complete_habit_names(ctx, param, incomplete: str) -> list[str]:
+    """
+    Shell completion of the habit name arguments of the CLI.
+    """
+
+    return match_names(load_names(), incomplete)
+
+
+def format_completions(shell: str, names: list[str]) -> str:
+    """
+    Format names like Click's shell completion of plain values for bash, zsh and fish.
+    """
+
+    if shell == "zsh":
+        return "".join(f"plain\n{name}\n_\n" for name in names)
+
+    return "".join(f"plain,{name}\n" for name in names)
+
+
+def get_completion_args(shell: str) -> tuple[list[str], str] | None:
+    """
+    Get the arguments before the cursor and the word being completed from the
+    environment set by the completion scripts of Click.
+
+    Returns:
+        The arguments and the incomplete word, or None if the line has quotes or
+        escapes that only Click can split.
+    """
+
+    line = os.environ.get("COMP_WORDS", "")
+    cword = os.environ.get("COMP_CWORD", "")
+    if any(character in line + cword for character in "'\"\\"):
+        return None
+
+    words = line.split()
+    if shell == "fish":
+        args = words[1:]
+        if cword and args and args[-1] == cword:
+            args.pop()
+        return args, cword
+
+    try:
+        index = int(cword)
+    except ValueError:
+        return None
+
+    return words[1:index], words[index] if index < len(words) else ""
+
+
+def complete() -> int | None:
+    """
+    Complete the habit names of `ritmo done`, `undo`, `delete` and `update` from the
+    index. Options and their values are left to Click.
+
+    Returns:
+        The exit code, or None if the completion must run through the CLI.
+    """
+
+    shell, _, instruction = os.environ.get(COMPLETE_VAR, "").partition("_")
+    if instruction != "complete" or shell not in ("bash", "zsh", "fish"):
+        return None
+
+    completion_args = get_completion_args(shell)
+    if completion_args is None:
+        return None
+
+    args, incomplete = completion_args
+    if (
+        not args
+        or args[0] not in NAME_COMMANDS
+        or any(arg.startswith("-") for arg in args + [incomplete])
+        or (len(args) > 1 and not NAME_COMMANDS[args[0]])
+    ):
+        return None
+
+    sys.stdout.write(format_completions(shell, match_names(load_names(), incomplete)))
+    return 0
@@ -0,0 +1,23 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ritmo.completion.names import get_name_index_path, write_name_index
+from ritmo.models import Habit
+
+
+def refresh_name_index(sess: Session, path: str | None = None) -> list[str]:
+    """
+    Rewrite the index of habit names from the database.
+
+    Args:
+        sess: The database session.
+        path: The path of the index. Defaults to get_name_index_path().
+
+    Returns:
+        The names of the habits.
+    """
+
+    names = list(sess.scalars(select(Habit.name)))
+    write_name_index(path or get_name_index_path(), names)
+
+    return names
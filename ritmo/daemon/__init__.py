@@ -0,0 +1,3 @@
+# The server is imported from ritmo.daemon.server, so that forwarding a command only
+# imports the client.
+from .client import FORWARDED_COMMANDS, forward, get_socket_path
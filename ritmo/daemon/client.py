@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+import socket
+import sys
+from pathlib import Path
+
+# Commands the daemon runs on behalf of the CLI. Commands reading or writing files
+# relative to the working directory, like import and export, always run locally.
+FORWARDED_COMMANDS = {
+    "add",
+    "list",
+    "update",
+    "delete",
+    "done",
+    "undo",
+    "logs",
+    "today",
+    "yesterday",
+}
+
+# Seconds to wait for the daemon to accept a command and to answer it before running
+# the command locally.
+TIMEOUT = 10
+
+
+def get_socket_path() -> Path:
+    """
+    Get the path of the daemon socket, ~/.ritmo/ritmo.sock unless RITMO_SOCKET is set.
+    """
+
+    if path := os.environ.get("RITMO_SOCKET"):
+        return Path(path)
+
+    return Path.home() / ".ritmo" / "ritmo.sock"
+
+
+def forward(args: list[str], socket_path: Path | None = None) -> int | None:
+    """
+    Run a command in the daemon and print its output.
+    Only standard library modules are imported, so forwarding a command skips loading
+    SQLAlchemy, Rich and the database.
+
+    Args:
+        args: The command line arguments, without the program name.
+        socket_path: The path of the daemon socket. Defaults to get_socket_path().
+
+    Returns:
+        The exit code of the command, or None if the command must run locally because
+        it is not forwarded, RITMO_NO_DAEMON or RITMO_TRACE is set, or the daemon is not
+        running or does not answer in time.
+    """
+
+    if (
+        not args
+        or args[0] not in FORWARDED_COMMANDS
+        or os.environ.get("RITMO_NO_DAEMON")
+        or os.environ.get("RITMO_TRACE")
+    ):
+        return None
+
+    request = {
+        "args": args,
+        "width": shutil.get_terminal_size().columns,
+        "color": sys.stdout.isatty() and "NO_COLOR" not in os.environ,
+    }
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(TIMEOUT)
+    try:
+        with client:
+            client.connect(str(socket_path or get_socket_path()))
+            with client.makefile("rwb") as stream:
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+                response = json.loads(stream.readline())
+            stdout, stderr = response["stdout"], response["stderr"]
+            exit_code = response["exit_code"]
+    except (OSError, ValueError, KeyError, TypeError):
+        # Not running, timed out, or closed the connection without a valid answer.
+        return None
+
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+
+    return exit_code
@@ -0,0 +1,158 @@
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Iterator
+
+from ritmo.cli import cli
+from ritmo.daemon.client import FORWARDED_COMMANDS
+from ritmo.sessions import create_local_session
+
+
+@contextmanager
+def client_terminal(width: int, color: bool) -> Iterator[None]:
+    """
+    Make Rich render for the client terminal instead of the captured output, and give
+    commands an empty standard input so prompts are aborted instead of blocking.
+
+    Args:
+        width: The number of columns of the client terminal.
+        color: Whether the client terminal supports colors.
+    """
+
+    saved_environ = {name: os.environ.get(name) for name in ("COLUMNS", "FORCE_COLOR")}
+    saved_stdin = sys.stdin
+
+    os.environ["COLUMNS"] = str(width)
+    if color:
+        os.environ["FORCE_COLOR"] = "1"
+    else:
+        os.environ.pop("FORCE_COLOR", None)
+    sys.stdin = io.StringIO()
+
+    try:
+        yield
+    finally:
+        sys.stdin = saved_stdin
+        for name, value in saved_environ.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_command(args: list[str], width: int = 80, color: bool = False) -> dict:
+    """
+    Run a command of the CLI, capturing its output.
+
+    Args:
+        args: The command line arguments, without the program name.
+        width: The number of columns of the client terminal.
+        color: Whether the client terminal supports colors.
+
+    Returns:
+        The exit code and the standard output and error of the command.
+    """
+
+    if not args or args[0] not in FORWARDED_COMMANDS:
+        return {
+            "exit_code": 2,
+            "stdout": "",
+            "stderr": f"Command not supported by the daemon: {' '.join(args)}\n",
+        }
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with (
+        redirect_stdout(stdout),
+        redirect_stderr(stderr),
+        client_terminal(width, color),
+    ):
+        try:
+            cli.main(args=args, prog_name="ritmo")
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+
+    return {
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    """
+    Handle a request of the JSON protocol: a line with the arguments of the command and
+    the client terminal, answered with a line with its exit code and output.
+    """
+
+    # Seconds to wait for a client to send its request or read the answer, since the
+    # server handles one client at a time.
+    timeout = 5
+
+    def handle(self) -> None:
+        try:
+            line = self.rfile.readline()
+        except OSError:
+            return
+
+        try:
+            request = json.loads(line)
+            response = run_command(
+                request["args"], request.get("width", 80), request.get("color", False)
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"exit_code": 2, "stdout": "", "stderr": f"Bad request: {e}\n"}
+
+        try:
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+        except OSError:
+            pass
+
+
+def is_running(socket_path: Path) -> bool:
+    """
+    Check whether a daemon is listening on a socket.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            return False
+
+    return True
+
+
+def create_server(socket_path: Path) -> socketserver.UnixStreamServer:
+    """
+    Create a server handling one command at a time on a Unix socket, warming up the
+    engine of the local database first. A stale socket of a stopped daemon is replaced.
+    The socket is only accessible by the current user.
+
+    Args:
+        socket_path: The path of the socket.
+    """
+
+    if socket_path.exists():
+        if is_running(socket_path):
+            raise FileExistsError(f"A daemon is already listening on {socket_path}")
+
+        socket_path.unlink()
+
+    with create_local_session().begin():
+        pass
+
+    umask = os.umask(0o077)
+    try:
+        return socketserver.UnixStreamServer(str(socket_path), CommandHandler)
+    finally:
+        os.umask(umask)
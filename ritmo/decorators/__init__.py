@@ -1 +1,5 @@
-from .decorators import with_sqlalchemy_error_handling
+from .decorators import (
+    with_name_index_refresh,
+    with_snapshot_update,
+    with_sqlalchemy_error_handling,
+)
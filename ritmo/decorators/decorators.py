@@ -1,6 +1,10 @@
 import click
 import sqlalchemy.exc
 
+from ritmo.completion.refresh import refresh_name_index
+from ritmo.sessions import create_local_session
+from ritmo.snapshot.refresh import refresh_snapshot_habits
+
 
 def with_sqlalchemy_error_handling(command):
     """
@@ -17,3 +21,41 @@ def with_sqlalchemy_error_handling(command):
             click.echo(f"Error: {e}")
 
     return wrapper
+
+
+def with_snapshot_update(command):
+    """
+    Decorator that rewrites today's state of the habits changed by a command in the
+    snapshot read by `ritmo prompt`, leaving the others as they are.
+
+    Args:
+        command: The command to decorate, returning the names of the habits it added,
+            changed, deleted or logged.
+    """
+
+    def wrapper(*args, **kwargs):
+        names = command(*args, **kwargs)
+        if names:
+            with create_local_session().begin() as sess:
+                refresh_snapshot_habits(sess, names)
+
+    return wrapper
+
+
+def with_name_index_refresh(command):
+    """
+    Decorator that rewrites the index of habit names used by shell completion after a
+    command adding, renaming or deleting habits.
+
+    Args:
+        command: The command to decorate.
+    """
+
+    def wrapper(*args, **kwargs):
+        result = command(*args, **kwargs)
+        with create_local_session().begin() as sess:
+            refresh_name_index(sess)
+
+        return result
+
+    return wrapper
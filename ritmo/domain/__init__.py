@@ -0,0 +1,4 @@
+# Rows and errors shared by the database queries and the storages, which only import
+# the standard library so that storages not using SQL do not load SQLAlchemy.
+from .errors import HabitNotFoundError, ServiceError
+from .rows import DayLogRow, HabitRow
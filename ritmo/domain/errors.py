@@ -0,0 +1,14 @@
+class ServiceError(Exception):
+    """
+    Raised when a request to the service is invalid, with a message meant for the user.
+    """
+
+
+class HabitNotFoundError(ServiceError):
+    """
+    Raised when a request refers to a habit that does not exist.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(f"Habit '{name}' not found.")
+        self.name = name
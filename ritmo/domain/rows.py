@@ -0,0 +1,24 @@
+import datetime
+from typing import NamedTuple
+
+
+class HabitRow(NamedTuple):
+    """
+    A habit as listed, without the cost of an ORM entity.
+    """
+
+    name: str
+    description: str | None
+    type: str
+    start_date: datetime.date
+    end_date: datetime.date | None
+
+
+class DayLogRow(NamedTuple):
+    """
+    The number of times a habit was completed on a day.
+    """
+
+    name: str
+    type: str
+    times_done: int
@@ -0,0 +1,11 @@
+# The merge is imported from ritmo.journal.merge, so that journaling a completion only
+# imports the standard library.
+from .journal import (
+    JournalEntry,
+    append_done,
+    append_entries,
+    get_journal_path,
+    has_pending_entries,
+    is_journal_enabled,
+    read_entries,
+)
@@ -0,0 +1,199 @@
+import datetime
+import fcntl
+import os
+import zlib
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from ritmo.snapshot import get_snapshot_path, record_done
+
+
+class JournalEntry(NamedTuple):
+    """
+    A completion of a habit written to the journal, waiting to be merged into the database.
+    """
+
+    id: str
+    date: datetime.date
+    completed_at: datetime.date
+    name: str
+
+
+def get_journal_path() -> Path:
+    """
+    Get the path of the journal next to the local database, ~/.ritmo/ritmo.journal.
+    """
+
+    return Path.home() / ".ritmo" / "ritmo.journal"
+
+
+def get_merging_path(path: Path) -> Path:
+    """
+    Get the path a journal is moved to while its entries are merged.
+    """
+
+    return path.with_name(f"{path.name}.merging")
+
+
+def is_journal_enabled() -> bool:
+    return os.environ.get("RITMO_JOURNAL", "") not in ("", "0")
+
+
+def has_pending_entries(path: Path) -> bool:
+    """
+    Check whether a journal or an unfinished merge of it is waiting to be merged.
+    """
+
+    return path.exists() or get_merging_path(path).exists()
+
+
+def format_entry(entry: JournalEntry) -> bytes:
+    """
+    Format an entry as a line holding its id, dates, a CRC32 of its fields and the
+    habit name, e.g. '9f86d081884c7d65 2024-01-02 2024-01-02 5d8a4e3c Read'.
+    """
+
+    fields = f"{entry.id} {entry.date} {entry.completed_at}"
+    checksum = zlib.crc32(f"{fields} {entry.name}".encode())
+    return f"{fields} {checksum:08x} {entry.name}\n".encode()
+
+
+def parse_entry(line: bytes) -> JournalEntry | None:
+    """
+    Parse a line of the journal, returning None if it is truncated or corrupted.
+    """
+
+    if not line.endswith(b"\n"):
+        return None
+
+    try:
+        id, date, completed_at, checksum, name = line[:-1].decode().split(" ", 4)
+        if zlib.crc32(f"{id} {date} {completed_at} {name}".encode()) != int(
+            checksum, 16
+        ):
+            return None
+
+        return JournalEntry(
+            id,
+            datetime.date.fromisoformat(date),
+            datetime.date.fromisoformat(completed_at),
+            name,
+        )
+    except ValueError:
+        return None
+
+
+def read_entries(fd: int) -> list[JournalEntry]:
+    """
+    Read the valid entries of an open journal. A line cut short by a crash while it was
+    written is skipped.
+
+    Args:
+        fd: The file descriptor of the journal.
+    """
+
+    chunks = []
+    while chunk := os.read(fd, 1 << 16):
+        chunks.append(chunk)
+
+    lines = b"".join(chunks).splitlines(keepends=True)
+    return [entry for entry in map(parse_entry, lines) if entry is not None]
+
+
+def append_entries(entries: Iterable[JournalEntry], path: Path) -> None:
+    """
+    Append entries to a journal with a single O_APPEND write, so concurrent writers
+    never interleave their lines.
+    Writers hold a shared lock on the journal while writing, and a merge moves the
+    journal away before taking an exclusive lock on it. A writer that opened the
+    journal before it was moved writes again to the new one.
+
+    Args:
+        entries: The entries to append.
+        path: The path of the journal.
+    """
+
+    data = b"".join(map(format_entry, entries))
+    path.parent.mkdir(exist_ok=True)
+
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            opened = os.fstat(fd)
+            if (opened.st_dev, opened.st_ino) != (current.st_dev, current.st_ino):
+                continue
+
+            if os.write(fd, data) != len(data):
+                raise OSError(f"Short write to the journal {path}")
+            return
+        finally:
+            os.close(fd)
+
+
+def parse_done_args(args: list[str]) -> tuple[list[str], datetime.date] | None:
+    """
+    Parse the arguments of `ritmo done` that can be journaled, habit names and an
+    optional --date. Returns None for any other option, which needs the full command.
+    """
+
+    names = []
+    date = datetime.datetime.utcnow().date()
+    remaining = iter(args)
+    for arg in remaining:
+        if arg == "--date" or arg.startswith("--date="):
+            value = arg.partition("=")[2] if "=" in arg else next(remaining, "")
+            if len(value) != 10:
+                return None
+            try:
+                date = datetime.date.fromisoformat(value)
+            except ValueError:
+                return None
+        elif arg.startswith("-") or not arg or "\n" in arg:
+            return None
+        else:
+            names.append(arg)
+
+    return (names, date) if names else None
+
+
+def append_done(args: list[str], path: Path | None = None) -> int | None:
+    """
+    Journal the completions of `ritmo done` instead of writing them to the database,
+    when RITMO_JOURNAL is set, and add them to the snapshot read by `ritmo prompt`.
+    Only standard library modules are imported. Habit names are not checked, unknown
+    habits are reported when the journal is merged.
+
+    Args:
+        args: The command line arguments, without the program name.
+        path: The path of the journal. Defaults to get_journal_path().
+
+    Returns:
+        0 once the completions are journaled, or None if the command must run normally
+        because it is not a journaled `done` or RITMO_JOURNAL is not set.
+    """
+
+    if not args or args[0] != "done" or not is_journal_enabled():
+        return None
+
+    parsed = parse_done_args(args[1:])
+    if parsed is None:
+        return None
+
+    names, date = parsed
+    completed_at = datetime.datetime.utcnow().date()
+    append_entries(
+        [
+            JournalEntry(os.urandom(8).hex(), date, completed_at, name)
+            for name in dict.fromkeys(names)
+        ],
+        path or get_journal_path(),
+    )
+    record_done(get_snapshot_path(), names, date.isoformat())
+
+    return 0
@@ -0,0 +1,124 @@
+import fcntl
+import os
+from pathlib import Path
+
+import click
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from ritmo.journal.journal import get_journal_path, get_merging_path, read_entries
+from ritmo.models import JournalRecord
+from ritmo.service import add_completions
+
+
+def take_pending(path: Path) -> Path | None:
+    """
+    Move the journal aside so that new entries go to a new journal while it is merged.
+    A journal left aside by a merge that did not finish is merged first. Must be called
+    with the merge lock held.
+
+    Args:
+        path: The path of the journal.
+
+    Returns:
+        The path of the journal to merge, or None if there is nothing to merge.
+    """
+
+    merging_path = get_merging_path(path)
+    if merging_path.exists():
+        return merging_path
+
+    try:
+        os.rename(path, merging_path)
+    except FileNotFoundError:
+        return None
+
+    return merging_path
+
+
+def merge_file(session: sessionmaker, merging_path: Path) -> dict[str, int | None]:
+    """
+    Merge the entries of a journal moved aside in a single transaction, then delete it.
+    The ids of the merged entries are committed along with them, so when a crash
+    happens before the journal is deleted, replaying it skips them.
+
+    Args:
+        session: The session factory of the database.
+        merging_path: The path of the journal.
+
+    Returns:
+        The number of completions added per habit name, None for habits that were not found.
+    """
+
+    try:
+        fd = os.open(merging_path, os.O_RDONLY)
+    except FileNotFoundError:
+        return {}
+
+    try:
+        # Waits for the writers that opened the journal before it was moved aside.
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        entries = read_entries(fd)
+        with session.begin() as sess:
+            merged_ids = set(sess.scalars(select(JournalRecord.id)))
+            entries = [entry for entry in entries if entry.id not in merged_ids]
+            results = {}
+            if entries:
+                sess.execute(
+                    insert(JournalRecord), [{"id": entry.id} for entry in entries]
+                )
+                results = add_completions(
+                    sess,
+                    [(entry.name, entry.date, entry.completed_at) for entry in entries],
+                )
+
+        os.unlink(merging_path)
+    finally:
+        os.close(fd)
+
+    with session.begin() as sess:
+        sess.execute(delete(JournalRecord))
+
+    return results
+
+
+def merge_journal(
+    session: sessionmaker, path: Path | None = None
+) -> dict[str, int | None]:
+    """
+    Merge the pending entries of the journal into the database, reporting the habits
+    that do not exist on the standard error.
+
+    Args:
+        session: The session factory of the database.
+        path: The path of the journal. Defaults to get_journal_path().
+
+    Returns:
+        The number of completions added per habit name, None for habits that were not found.
+    """
+
+    path = path or get_journal_path()
+    results: dict[str, int | None] = {}
+
+    # Merges run one at a time, so a journal is never moved over one being merged.
+    lock_fd = os.open(
+        path.with_name(f"{path.name}.lock"), os.O_RDWR | os.O_CREAT, 0o600
+    )
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        while merging_path := take_pending(path):
+            for name, added in merge_file(session, merging_path).items():
+                results[name] = (
+                    added if added is None else (results.get(name) or 0) + added
+                )
+    finally:
+        os.close(lock_fd)
+
+    for name, added in results.items():
+        if added is None:
+            click.echo(
+                f"Habit '{name}' not found, its journaled completions were dropped.",
+                err=True,
+            )
+
+    return results
@@ -0,0 +1,49 @@
+import importlib
+import os
+import sys
+
+# Commands that can be served without importing click, SQLAlchemy or Rich, by a
+# function returning their exit code, or None when they must run through the CLI.
+FAST_PATHS = {
+    "prompt": "ritmo.snapshot:show_prompt",
+    "done": "ritmo.journal:append_done",
+}
+
+
+def run_fast_path(args: list[str]) -> int | None:
+    """
+    Run a command through its fast path or in the daemon, importing neither the CLI nor
+    the database. Shell completion of habit names is served from the name index and
+    never forwarded to the daemon.
+
+    Args:
+        args: The command line arguments, without the program name.
+
+    Returns:
+        The exit code of the command, or None if it must run through the CLI.
+    """
+
+    if "_RITMO_COMPLETE" in os.environ:
+        from ritmo.completion import complete
+
+        return complete()
+
+    if args and args[0] in FAST_PATHS:
+        module_name, attribute = FAST_PATHS[args[0]].split(":")
+        exit_code = getattr(importlib.import_module(module_name), attribute)(args)
+        if exit_code is not None:
+            return exit_code
+
+    from ritmo.daemon import forward
+
+    return forward(args)
+
+
+def run():
+    exit_code = run_fast_path(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from ritmo.cli import cli
+
+    cli()
@@ -1 +1,10 @@
-from .models import Base, Habit, HabitLog
+from .models import (
+    Base,
+    Habit,
+    HabitDailyCount,
+    HabitLog,
+    HabitLogArchive,
+    HabitStats,
+    HabitsVersion,
+    JournalRecord,
+)
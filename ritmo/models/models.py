@@ -7,8 +7,10 @@ from sqlalchemy import (
     Column,
     Date,
     ForeignKey,
+    Index,
     Integer,
     String,
+    event,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import backref, relationship
@@ -22,6 +24,7 @@ class Habit(Base):
     """
 
     __tablename__ = "habits"
+    __table_args__ = (Index("ix_habits_name", "name", unique=True),)
 
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
@@ -38,14 +41,121 @@ class Habit(Base):
 
 class HabitLog(Base):
     """
-    HabitLog define the habit_logs table which contains the habit id, date, completed, and completed_at of an habit.
+    HabitLog define the habit_logs table which contains the habit id, date, completed, completed_at and count
+    of an habit. Each habit has at most one log per day, which holds the number of times it was completed.
     """
 
     __tablename__ = "habit_logs"
+    __table_args__ = (
+        Index("ix_habit_logs_habit_id_date", "habit_id", "date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
-    habit_id = Column(Integer, ForeignKey("habits.id"), nullable=False)
-    habit = relationship("Habit", backref=backref("habit_logs", order_by=id))
+    habit_id = Column(
+        Integer, ForeignKey("habits.id", ondelete="CASCADE"), nullable=False
+    )
+    habit = relationship(
+        "Habit",
+        backref=backref(
+            "habit_logs",
+            order_by=id,
+            cascade="all, delete-orphan",
+            passive_deletes=True,
+        ),
+    )
     date = Column(Date, nullable=False, default=datetime.datetime.utcnow)
     completed = Column(Boolean, nullable=False, default=True)
     completed_at = Column(Date, nullable=False, default=datetime.datetime.utcnow)
+    count = Column(Integer, nullable=False, default=1, server_default="1")
+
+
+class HabitLogArchive(Base):
+    """
+    HabitLogArchive define the habit_logs_archive table which keeps the original habit logs, one per
+    completion, that were merged into a single log per day when upgrading the database.
+    """
+
+    __tablename__ = "habit_logs_archive"
+    __table_args__ = (Index("ix_habit_logs_archive_habit_id_date", "habit_id", "date"),)
+
+    id = Column(Integer, primary_key=True)
+    habit_id = Column(Integer, nullable=False)
+    date = Column(Date, nullable=False)
+    completed = Column(Boolean, nullable=False)
+    completed_at = Column(Date, nullable=False)
+    count = Column(Integer, nullable=False)
+
+
+class HabitStats(Base):
+    """
+    HabitStats define the habit_stats table which contains the rolled up current streak, longest streak,
+    last completion date and number of completed days of an habit.
+    """
+
+    __tablename__ = "habit_stats"
+
+    habit_id = Column(
+        Integer, ForeignKey("habits.id", ondelete="CASCADE"), primary_key=True
+    )
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_completed = Column(Date)
+    completed_days = Column(Integer, nullable=False, default=0)
+
+
+class HabitDailyCount(Base):
+    """
+    HabitDailyCount define the habit_daily_counts table which contains the number of times an habit
+    was completed on each day.
+    """
+
+    __tablename__ = "habit_daily_counts"
+
+    habit_id = Column(
+        Integer, ForeignKey("habits.id", ondelete="CASCADE"), primary_key=True
+    )
+    date = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class JournalRecord(Base):
+    """
+    JournalRecord define the journal_records table which contains the ids of the journaled completions
+    merged from the journal file being merged, so replaying it after a crash does not add them twice.
+    """
+
+    __tablename__ = "journal_records"
+
+    id = Column(String, primary_key=True)
+
+
+class HabitsVersion(Base):
+    """
+    HabitsVersion define the habits_version table which contains a single row with a version incremented by triggers
+    whenever habits are added, changed or deleted, by any process, so caches of habits can tell when they are stale.
+    """
+
+    __tablename__ = "habits_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+def create_habits_version_triggers(target, connection, **kwargs) -> None:
+    """
+    Add the row of the habits_version table and the triggers incrementing it, after the
+    tables are created. Both are kept if they already exist.
+    """
+
+    connection.exec_driver_sql(
+        "INSERT OR IGNORE INTO habits_version (id, version) VALUES (1, 0)"
+    )
+    for operation in ("INSERT", "UPDATE", "DELETE"):
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS habits_version_after_{operation.lower()} "
+            f"AFTER {operation} ON habits BEGIN "
+            "UPDATE habits_version SET version = version + 1; END"
+        )
+
+
+event.listen(Base.metadata, "after_create", create_habits_version_triggers)
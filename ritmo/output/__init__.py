@@ -0,0 +1 @@
+from .streaming import FORMATS, echo_rows, output_options
@@ -0,0 +1,204 @@
+import datetime
+import json
+import os
+import sys
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
+
+import click
+
+from ritmo.profiling import phase
+
+FORMATS = ["table", "tsv", "json"]
+
+Row = TypeVar("Row", bound=tuple)
+
+
+def output_options(command):
+    """
+    Decorator adding the --format and --pager options of commands listing rows.
+    """
+
+    command = click.option(
+        "--pager",
+        is_flag=True,
+        default=False,
+        help="Show the output in a pager.",
+    )(command)
+    command = click.option(
+        "--format",
+        "-f",
+        type=click.Choice(FORMATS, case_sensitive=False),
+        default="table",
+        show_default=True,
+        help="Output format. tsv and json (one object per line) are meant for scripts.",
+    )(command)
+
+    return command
+
+
+def to_text(value) -> str:
+    """
+    Convert a value to a TSV cell: dates in ISO format, None as an empty cell and
+    tabs and new lines replaced by spaces.
+    """
+
+    if value is None:
+        return ""
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+
+def to_json(value):
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+
+    return value
+
+
+def iter_tsv(fields: Sequence[str], chunks: Iterable[list]) -> Iterator[str]:
+    yield "\t".join(fields) + "\n"
+    for chunk in chunks:
+        yield "".join("\t".join(map(to_text, row)) + "\n" for row in chunk)
+
+
+def iter_json(fields: Sequence[str], chunks: Iterable[list]) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(dict(zip(fields, map(to_json, row)))) + "\n" for row in chunk
+        )
+
+
+def iter_tables(
+    headers: Sequence[str],
+    chunks: Iterable[list[Row]],
+    to_cells: Callable[[Row], Sequence[str]],
+    title: str | None,
+) -> Iterator[str]:
+    """
+    Render rows as Rich tables, one per chunk.
+    A single chunk is rendered as a regular table. Otherwise the width of the columns
+    is fixed from the first chunk, folding longer cells, and the following chunks are
+    rendered without header and edges, so they continue the first one.
+    """
+
+    from rich.cells import cell_len
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+
+    def render(table: Table) -> str:
+        with console.capture() as capture:
+            console.print(table)
+        return capture.get()
+
+    cell_chunks = ([to_cells(row) for row in chunk] for chunk in chunks)
+    first_chunk = next(cell_chunks, None)
+    if first_chunk is None:
+        return
+
+    second_chunk = next(cell_chunks, None)
+    if second_chunk is None:
+        table = Table(show_header=True, title=title)
+        for header in headers:
+            table.add_column(header)
+        for cells in first_chunk:
+            table.add_row(*cells)
+
+        yield render(table)
+        return
+
+    widths = [
+        max(cell_len(header), *(cell_len(cells[i]) for cells in first_chunk))
+        for i, header in enumerate(headers)
+    ]
+
+    for i, chunk in enumerate(chain([first_chunk, second_chunk], cell_chunks)):
+        table = Table(
+            show_header=i == 0, show_edge=False, title=title if i == 0 else None
+        )
+        for header, width in zip(headers, widths):
+            table.add_column(header, width=width, overflow="fold")
+        for cells in chunk:
+            table.add_row(*cells)
+
+        yield render(table)
+
+
+def batched(rows: Iterable[Row], size: int) -> Iterator[list[Row]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def echo_rows(
+    rows: Iterable[Row],
+    fields: Sequence[str],
+    format: str = "table",
+    headers: Sequence[str] | None = None,
+    to_cells: Callable[[Row], Sequence[str]] | None = None,
+    title: str | None = None,
+    pager: bool = False,
+    chunk_size: int = 500,
+) -> int:
+    """
+    Print rows in chunks as they are read, so the first ones are shown right away and
+    memory use does not grow with the number of rows.
+
+    Args:
+        rows: The rows to print.
+        fields: The names of the values of each row, used by the tsv and json formats.
+        format: One of 'table', 'tsv' or 'json'. Rich is only imported for tables.
+        headers: The column headers of the table, defaults to the fields.
+        to_cells: Convert a row to the cells of the table, defaults to str of each value.
+        title: The title of the table.
+        pager: Show the output in a pager.
+        chunk_size: The number of rows printed at a time.
+
+    Returns:
+        The number of printed rows. Nothing is printed for tables without rows.
+        Rows are fetched while printing, so the time to fetch them is part of the
+        render phase of a profile.
+    """
+
+    printed = 0
+
+    def chunks() -> Iterator[list[Row]]:
+        nonlocal printed
+
+        for chunk in batched(rows, chunk_size):
+            printed += len(chunk)
+            yield chunk
+
+    if format == "tsv":
+        texts = iter_tsv(fields, chunks())
+    elif format == "json":
+        texts = iter_json(fields, chunks())
+    else:
+        texts = iter_tables(
+            headers or fields,
+            chunks(),
+            to_cells or (lambda row: [to_text(value) for value in row]),
+            title,
+        )
+
+    if pager:
+        with phase("render"):
+            click.echo_via_pager(texts)
+        return printed
+
+    try:
+        with phase("render"):
+            for text in texts:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader, e.g. head, is gone: stop and do not fail when Python flushes
+        # the standard output on exit.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+    return printed
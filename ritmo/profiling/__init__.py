@@ -0,0 +1,14 @@
+import importlib
+
+from .phases import get_profiler, phase, set_profiler
+
+# The profiler is imported on first access, so that timing phases does not import
+# sqlite3 or SQLAlchemy's event system when profiling is off.
+_PROFILER_NAMES = {"Profiler", "StatementTrace"}
+
+
+def __getattr__(name: str):
+    if name not in _PROFILER_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(".profiler", __name__), name)
@@ -0,0 +1,45 @@
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from ritmo.profiling.profiler import Profiler
+
+# Profiler of the running command, None unless profiling was requested.
+_profiler: "Profiler | None" = None
+
+
+def get_profiler() -> "Profiler | None":
+    """
+    Get the profiler of the running command, None if it is not profiled.
+    """
+
+    return _profiler
+
+
+def set_profiler(profiler: "Profiler | None") -> None:
+    global _profiler
+
+    _profiler = profiler
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Time a phase of the running command if it is profiled. Phases with the same name
+    add up. Only the standard library is imported, so any module can time its phases.
+
+    Args:
+        name: The name of the phase.
+    """
+
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add_phase(name, time.perf_counter() - start)
@@ -0,0 +1,225 @@
+import json
+import sqlite3
+import time
+from typing import TYPE_CHECKING
+
+from ritmo.profiling.phases import set_profiler
+
+if TYPE_CHECKING:
+    import cProfile
+
+
+class CountingCursor(sqlite3.Cursor):
+    """
+    SQLite cursor counting the rows fetched from it.
+    """
+
+    rows = 0
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            self.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = super().fetchmany(*args, **kwargs)
+        self.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self.rows += len(rows)
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        self.rows += 1
+        return row
+
+
+class CountingConnection(sqlite3.Connection):
+    """
+    SQLite connection whose cursors count the rows fetched from them.
+    """
+
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+class StatementTrace:
+    """
+    The SQL, duration and rows of an executed statement. Rows of queries are counted as
+    they are fetched, rows of other statements are the ones they changed.
+    """
+
+    __slots__ = ("statement", "start", "duration", "cursor", "rowcount")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.cursor = None
+        self.rowcount = -1
+
+    @property
+    def rows(self) -> int:
+        return getattr(self.cursor, "rows", self.rowcount)
+
+
+class Profiler:
+    """
+    Collect the time spent in each phase of a command and the statements it executed.
+    SQLAlchemy's cursor events are listened on every engine while the profiler runs.
+    """
+
+    def __init__(self, cprofile_path: str | None = None):
+        """
+        Args:
+            cprofile_path: Dump cProfile stats of the command to this file.
+        """
+
+        self.cprofile_path = cprofile_path
+        self.cprofile: "cProfile.Profile | None" = None
+        self.phases: dict[str, float] = {}
+        self.statements: list[StatementTrace] = []
+        self.started = 0.0
+        self.total = 0.0
+
+    def add_phase(self, name: str, duration: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def before_cursor_execute(self, conn, cursor, statement, *args) -> None:
+        conn.info.setdefault("ritmo_traces", []).append(StatementTrace(statement))
+
+    def after_cursor_execute(self, conn, cursor, statement, *args) -> None:
+        trace = conn.info["ritmo_traces"].pop()
+        trace.duration = time.perf_counter() - trace.start
+        trace.rowcount = cursor.rowcount
+        if cursor.description is not None:
+            trace.cursor = cursor
+        self.statements.append(trace)
+
+    def do_connect(self, dialect, conn_rec, cargs, cparams) -> None:
+        if dialect.name == "sqlite" and dialect.driver == "pysqlite":
+            cparams.setdefault("factory", CountingConnection)
+
+    def listeners(self) -> list[tuple]:
+        from sqlalchemy.engine import Engine
+
+        return [
+            (Engine, "before_cursor_execute", self.before_cursor_execute),
+            (Engine, "after_cursor_execute", self.after_cursor_execute),
+            (Engine, "do_connect", self.do_connect),
+        ]
+
+    def start(self) -> None:
+        """
+        Start profiling, making this the profiler of the running command.
+        """
+
+        from sqlalchemy import event
+
+        for target, name, listener in self.listeners():
+            event.listen(target, name, listener)
+
+        if self.cprofile_path:
+            import cProfile
+
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+        set_profiler(self)
+        self.started = time.perf_counter()
+
+    def stop(self) -> None:
+        """
+        Stop profiling and dump the cProfile stats if requested.
+        """
+
+        from sqlalchemy import event
+
+        self.total += time.perf_counter() - self.started
+        set_profiler(None)
+
+        if self.cprofile:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.cprofile_path)
+
+        for target, name, listener in self.listeners():
+            event.remove(target, name, listener)
+
+    def to_dict(self) -> dict:
+        """
+        Get the profile as a JSON serializable trace. Time not spent in any phase is
+        reported as the 'other' phase.
+        """
+
+        phases = {**self.phases, "other": self.total - sum(self.phases.values())}
+        return {
+            "total_ms": self.total * 1000,
+            "phases_ms": {name: duration * 1000 for name, duration in phases.items()},
+            "sql": {
+                "statements": len(self.statements),
+                "total_ms": sum(trace.duration for trace in self.statements) * 1000,
+                "rows": sum(max(trace.rows, 0) for trace in self.statements),
+            },
+            "statements": [
+                {
+                    "statement": trace.statement,
+                    "duration_ms": trace.duration * 1000,
+                    "rows": trace.rows,
+                }
+                for trace in self.statements
+            ],
+            "cprofile": self.cprofile_path,
+        }
+
+    def format_table(self, slowest: int = 10) -> str:
+        """
+        Format the phases and the slowest statements as plain text tables.
+
+        Args:
+            slowest: The number of statements listed.
+        """
+
+        trace = self.to_dict()
+        lines = [f"{'phase':<24} {'ms':>10}"]
+        for name, duration in trace["phases_ms"].items():
+            lines.append(f"{name:<24} {duration:>10.2f}")
+        lines.append(f"{'total':<24} {trace['total_ms']:>10.2f}")
+
+        sql = trace["sql"]
+        lines.append("")
+        lines.append(
+            f"{sql['statements']} SQL statements in {sql['total_ms']:.2f} ms, "
+            f"{sql['rows']} rows"
+        )
+        if self.statements:
+            lines.append(f"{'ms':>10} {'rows':>8}  statement")
+            statements = sorted(
+                trace["statements"], key=lambda statement: -statement["duration_ms"]
+            )
+            for statement in statements[:slowest]:
+                text = " ".join(statement["statement"].split())
+                if len(text) > 80:
+                    text = text[:77] + "..."
+                lines.append(
+                    f"{statement['duration_ms']:>10.3f} {statement['rows']:>8}  {text}"
+                )
+
+        if self.cprofile_path:
+            lines.append("")
+            lines.append(f"cProfile stats written to {self.cprofile_path}.")
+
+        return "\n".join(lines) + "\n"
+
+    def format(self, format: str) -> str:
+        """
+        Format the profile as 'table' or as a 'json' trace.
+        """
+
+        if format == "json":
+            return json.dumps(self.to_dict()) + "\n"
+
+        return self.format_table()
@@ -0,0 +1,31 @@
+import importlib
+
+from ritmo.domain import DayLogRow, HabitNotFoundError, HabitRow, ServiceError
+
+from .queries import (
+    add_completions,
+    create_habit,
+    get_day_logs,
+    get_habits,
+    iter_day_logs,
+    iter_habits,
+    mark_many_as_done,
+    mark_many_as_undone,
+    modify_habit,
+    remove_habit,
+    remove_habits,
+    replace_habit,
+    upsert_logs,
+)
+from .registry import HabitRecord, HabitRegistry, get_registry
+
+# The async service is imported on first access, so that the commands using the
+# queries do not pay for importing SQLAlchemy's async extension and aiosqlite.
+_ASYNC_NAMES = {"HabitService", "create_async_engine_for"}
+
+
+def __getattr__(name: str):
+    if name not in _ASYNC_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(".service", __name__), name)
@@ -0,0 +1,500 @@
+import datetime
+from collections import Counter
+from typing import Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Result
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Insert, Select
+
+from ritmo.domain import DayLogRow, HabitNotFoundError, HabitRow, ServiceError
+from ritmo.models import Habit, HabitLog, HabitLogArchive
+from ritmo.service.registry import get_registry
+from ritmo.stats import record_many_done, record_undone
+
+
+def stream(sess: Session, stmt: Select, batch_size: int) -> Result:
+    """
+    Execute a Core select on the connection of a session, fetching rows in batches.
+    """
+
+    result = sess.connection().execution_options(stream_results=True).execute(stmt)
+    return result.yield_per(batch_size)
+
+
+def create_habit(
+    sess: Session,
+    name: str,
+    description: Optional[str | None] = None,
+    type: Optional[str | None] = None,
+    start_date: Optional[datetime.date | None] = None,
+    end_date: Optional[datetime.date | None] = None,
+) -> bool:
+    """
+    Add a new habit to be tracked.
+
+    Args:
+        sess: The database session.
+        name: The name of the habit.
+        description: A description of the habit.
+        type: The type of tracking system to use.
+        start_date: The date the habit starts, defaults to today.
+        end_date: The date the habit ends.
+
+    Returns:
+        Whether the habit was added, False if a habit with the same name already exists.
+
+    Raises:
+        ServiceError: If the name is empty or the end date is before the start date.
+    """
+
+    if end_date and start_date and end_date < start_date:
+        raise ServiceError("End date must be after start date.")
+
+    if not name or name.isspace():
+        raise ServiceError("Habit name must be specified.")
+
+    registry = get_registry(sess.get_bind())
+    if registry.get(sess, name):
+        return False
+
+    habit = Habit(name=name, description=description, type=type, end_date=end_date)
+    if start_date:
+        habit.start_date = start_date
+    sess.add(habit)
+    sess.commit()
+    registry.invalidate(name)
+
+    return True
+
+
+def iter_habits(
+    sess: Session,
+    sort_by: str = "name",
+    reverse: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+    name_filter: str | None = None,
+    batch_size: int = 1000,
+) -> Iterator[HabitRow]:
+    """
+    Stream habits, sorted and paginated by the database and fetched in batches.
+
+    Args:
+        sess: The database session, which must stay open while iterating.
+        sort_by: One of 'name', 'start-date' or 'end-date'. Habits without an end date
+            are sorted last by end date. Ties are kept in the order habits were added.
+        reverse: Reverse the order.
+        limit: The maximum number of habits to get, all of them by default.
+        offset: The number of habits to skip.
+        name_filter: Only get habits whose name contains this text, ignoring case.
+        batch_size: The number of rows fetched at a time.
+
+    Yields:
+        The name, description, type, start date and end date of each habit.
+    """
+
+    stmt = select(
+        Habit.name, Habit.description, Habit.type, Habit.start_date, Habit.end_date
+    )
+
+    if sort_by == "start-date":
+        order_by = [Habit.start_date]
+    elif sort_by == "end-date":
+        order_by = [Habit.end_date.is_(None), Habit.end_date]
+    else:
+        order_by = [Habit.name]
+
+    if reverse:
+        order_by = [column.desc() for column in order_by]
+    stmt = stmt.order_by(*order_by, Habit.id)
+
+    if name_filter:
+        stmt = stmt.where(Habit.name.contains(name_filter, autoescape=True))
+    if limit is not None or offset:
+        stmt = stmt.limit(limit).offset(offset)
+
+    yield from map(HabitRow._make, stream(sess, stmt, batch_size))
+
+
+def get_habits(
+    sess: Session,
+    sort_by: str = "name",
+    reverse: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+    name_filter: str | None = None,
+) -> list[HabitRow]:
+    """
+    Get habits, sorted and paginated by the database. See iter_habits.
+    """
+
+    return list(iter_habits(sess, sort_by, reverse, limit, offset, name_filter))
+
+
+def modify_habit(
+    sess: Session,
+    name: str,
+    new_name: Optional[str | None] = None,
+    description: Optional[str | None] = None,
+    type: Optional[str | None] = None,
+    start_date: Optional[datetime.date | None] = None,
+    end_date: Optional[datetime.date | None] = None,
+) -> None:
+    """
+    Update an existing habit. Only the given values are changed.
+
+    Args:
+        sess: The database session.
+        name: The name of the habit.
+        new_name: The new name of the habit.
+        description: A description of the habit.
+        type: The type of tracking system to use.
+        start_date: The date the habit starts.
+        end_date: The date the habit ends.
+
+    Raises:
+        HabitNotFoundError: If the habit does not exist.
+        ServiceError: If the name is empty or the end date is before the start date.
+    """
+
+    if not name:
+        raise ServiceError("Habit name must be provided.")
+
+    if end_date and start_date and end_date < start_date:
+        raise ServiceError("End date must be after start date.")
+
+    if name.isspace():
+        raise ServiceError("A new valid habit name must be specified.")
+
+    record = get_registry(sess.get_bind()).get(sess, name)
+    if not record:
+        raise HabitNotFoundError(name)
+
+    habit = sess.get(Habit, record.id)
+    replace_habit(
+        sess,
+        name,
+        HabitRow(
+            new_name or habit.name,
+            description or habit.description,
+            type or habit.type,
+            start_date or habit.start_date,
+            end_date or habit.end_date,
+        ),
+    )
+
+
+def replace_habit(sess: Session, name: str, habit: HabitRow) -> None:
+    """
+    Replace every value of an existing habit, keeping its logs.
+
+    Args:
+        sess: The database session.
+        name: The current name of the habit.
+        habit: The new values of the habit.
+
+    Raises:
+        HabitNotFoundError: If the habit does not exist.
+        ServiceError: If the habit is renamed to the name of another habit.
+    """
+
+    registry = get_registry(sess.get_bind())
+    record = registry.get(sess, name)
+    if not record:
+        raise HabitNotFoundError(name)
+    if habit.name != name and registry.get(sess, habit.name):
+        raise ServiceError(f"Habit '{habit.name}' already exists.")
+
+    entity = sess.get(Habit, record.id)
+    values = habit._asdict()
+    # The habit is only updated, and its version incremented, if a value changed.
+    changes = int(
+        any(getattr(entity, field) != value for field, value in values.items())
+    )
+    for field, value in values.items():
+        setattr(entity, field, value)
+    sess.commit()
+    registry.invalidate(name, habit.name, changes=changes)
+
+
+def remove_habits(
+    sess: Session, names: Sequence[str] = (), pattern: str | None = None
+) -> list[str]:
+    """
+    Delete habits by name or by pattern in a single transaction. Their logs and rollups
+    are deleted by the database along with them, without being loaded.
+
+    Args:
+        sess: The database session.
+        names: The names of the habits.
+        pattern: A glob pattern matching the names of the habits, e.g. 'read-*'.
+
+    Returns:
+        The names of the deleted habits.
+    """
+
+    conditions = []
+    if names:
+        conditions.append(Habit.name.in_(names))
+    if pattern is not None:
+        conditions.append(Habit.name.op("GLOB")(pattern))
+    if not conditions:
+        return []
+
+    matched_ids = select(Habit.id).where(or_(*conditions)).scalar_subquery()
+    deleted = sess.scalars(select(Habit.name).where(Habit.id.in_(matched_ids))).all()
+    if deleted:
+        # Archived logs have no foreign key, they are kept apart from the habit logs.
+        sess.execute(
+            delete(HabitLogArchive)
+            .where(HabitLogArchive.habit_id.in_(matched_ids))
+            .execution_options(synchronize_session=False)
+        )
+        changes = sess.execute(
+            delete(Habit)
+            .where(Habit.id.in_(matched_ids))
+            .execution_options(synchronize_session="fetch")
+        ).rowcount
+        sess.commit()
+        get_registry(sess.get_bind()).invalidate(*deleted, changes=changes)
+
+    return deleted
+
+
+def remove_habit(sess: Session, name: str) -> bool:
+    """
+    Delete a habit with its logs and rollups.
+
+    Args:
+        sess: The database session.
+        name: The name of the habit.
+
+    Returns:
+        Whether the habit was deleted, False if it does not exist.
+    """
+
+    return bool(remove_habits(sess, [name]))
+
+
+def upsert_logs(max_count: int | None = None) -> Insert:
+    """
+    Build the statement adding completions to the log of a habit on a day, creating the
+    log if the habit was not completed on that day yet.
+
+    Args:
+        max_count: The maximum count of a log, like 1 for boolean habits.
+    """
+
+    stmt = sqlite_insert(HabitLog)
+    count = HabitLog.count + stmt.excluded.count
+    if max_count is not None:
+        count = func.min(count, max_count)
+
+    return stmt.on_conflict_do_update(
+        index_elements=[HabitLog.habit_id, HabitLog.date],
+        set_={"count": count, "completed_at": stmt.excluded.completed_at},
+    )
+
+
+def add_completions(
+    sess: Session, completions: Iterable[tuple[str, datetime.date, datetime.date]]
+) -> dict[str, int | None]:
+    """
+    Add completions of habits without committing them. Boolean habits are done at most
+    once per day, the completions of numerical habits on a day are added to the count
+    of its log with a single upsert.
+
+    Args:
+        sess: The database session.
+        completions: The name of the habit, the day it was done and the day it was
+            logged of each completion.
+
+    Returns:
+        The number of completions added per habit name, None for habits that were not found.
+    """
+
+    latest_completions: dict[tuple[str, datetime.date], datetime.date] = {}
+    counts: Counter[tuple[str, datetime.date]] = Counter()
+    for name, date, completed_at in completions:
+        counts[name, date] += 1
+        latest_completions[name, date] = max(
+            completed_at, latest_completions.get((name, date), completed_at)
+        )
+
+    results: dict[str, int | None] = dict.fromkeys(name for name, _ in counts)
+    habits = get_registry(sess.get_bind()).get_many(sess, results)
+    for name in habits:
+        results[name] = 0
+
+    boolean_counts: dict[tuple[int, datetime.date], int] = {}
+    numerical_counts: dict[tuple[int, datetime.date], int] = {}
+    for (name, date), count in counts.items():
+        habit = habits.get(name)
+        if habit is None:
+            continue
+
+        if habit.type == "boolean":
+            boolean_counts[habit.id, date] = 1
+        else:
+            numerical_counts[habit.id, date] = count
+
+    habit_names = {habit.id: name for name, habit in habits.items()}
+    for day_counts, max_count in ((boolean_counts, 1), (numerical_counts, None)):
+        if not day_counts:
+            continue
+
+        # The rollups tell the days that were not done yet once written, even if
+        # another process completed the same habits meanwhile.
+        added_days = record_many_done(sess, day_counts, max_count)
+        # Boolean habits already done on a day are left as they are.
+        logged_counts = dict.fromkeys(added_days, 1) if max_count == 1 else day_counts
+        if not logged_counts:
+            continue
+
+        sess.execute(
+            upsert_logs(max_count),
+            [
+                {
+                    "habit_id": habit_id,
+                    "date": date,
+                    "completed_at": latest_completions[habit_names[habit_id], date],
+                    "count": count,
+                }
+                for (habit_id, date), count in logged_counts.items()
+            ],
+        )
+        for (habit_id, _), count in logged_counts.items():
+            results[habit_names[habit_id]] += count
+
+    return results
+
+
+def mark_many_as_done(
+    sess: Session, names: Sequence[str], dates: Sequence[datetime.date]
+) -> dict[str, int | None]:
+    """
+    Mark habits as done on some days in a single transaction.
+    Boolean habits are marked as done at most once per day, numerical habits have the
+    count of their log on each day incremented with a single upsert.
+
+    Args:
+        sess: The database session.
+        names: The names of the habits to mark as done. Habits that do not exist will not be created.
+        dates: The days to mark the habits as done.
+
+    Returns:
+        The number of logs added per habit name, None for habits that were not found.
+    """
+
+    completed_at = datetime.datetime.utcnow().date()
+    added = add_completions(
+        sess,
+        [
+            (name, date, completed_at)
+            for name in dict.fromkeys(names)
+            for date in dict.fromkeys(dates)
+        ],
+    )
+    results = dict.fromkeys(names) | added
+    if any(added.values()):
+        sess.commit()
+
+    return results
+
+
+def mark_many_as_undone(
+    sess: Session,
+    names: Sequence[str],
+    dates: Sequence[datetime.date],
+    times: int = 1,
+) -> dict[str, int | None]:
+    """
+    Mark habits as undone on some days in a single transaction.
+    The count of the log of each habit on each day is decremented, and the log removed
+    once its count reaches zero. Logs are found through the (habit_id, date) index, so
+    undoing does not depend on the length of the history of a habit.
+
+    Args:
+        sess: The database session.
+        names: The names of the habits to mark as undone.
+        dates: The days to mark the habits as undone.
+        times: The number of completions removed from each log.
+
+    Returns:
+        The number of completions removed per habit name, None for habits that were not found.
+
+    Raises:
+        ServiceError: If times is not positive.
+    """
+
+    if times < 1:
+        raise ServiceError("Times must be a positive number.")
+
+    results: dict[str, int | None] = dict.fromkeys(names)
+    habits = get_registry(sess.get_bind()).get_many(sess, results)
+    habit_names = {habit.id: name for name, habit in habits.items()}
+    for name in habit_names.values():
+        results[name] = 0
+
+    is_undone = and_(HabitLog.habit_id.in_(habit_names), HabitLog.date.in_(dates))
+    undone_logs = sess.execute(
+        select(HabitLog.habit_id, HabitLog.date, HabitLog.count).where(is_undone)
+    ).all()
+
+    if undone_logs:
+        sess.execute(delete(HabitLog).where(is_undone, HabitLog.count <= times))
+        sess.execute(
+            update(HabitLog).where(is_undone).values(count=HabitLog.count - times)
+        )
+        for habit_id, date, count in undone_logs:
+            removed = min(count, times)
+            record_undone(sess, habit_id, date, removed)
+            results[habit_names[habit_id]] += removed
+        sess.commit()
+
+    return results
+
+
+def iter_day_logs(
+    sess: Session,
+    date: datetime.date,
+    batch_size: int = 1000,
+    names: Sequence[str] | None = None,
+) -> Iterator[DayLogRow]:
+    """
+    Stream how many times each habit was completed on a day, with a single query.
+
+    Args:
+        sess: The database session, which must stay open while iterating.
+        date: The day to get the habit logs for.
+        batch_size: The number of rows fetched at a time.
+        names: Only get the logs of these habits.
+
+    Yields:
+        The name, type and times done of each habit, in the order they were added.
+    """
+
+    stmt = (
+        select(Habit.name, Habit.type, func.coalesce(HabitLog.count, 0))
+        .outerjoin(
+            HabitLog,
+            and_(HabitLog.habit_id == Habit.id, HabitLog.date == date),
+        )
+        .order_by(Habit.id)
+    )
+    if names is not None:
+        stmt = stmt.where(Habit.name.in_(names))
+
+    yield from map(DayLogRow._make, stream(sess, stmt, batch_size))
+
+
+def get_day_logs(
+    sess: Session, date: datetime.date, names: Sequence[str] | None = None
+) -> list[DayLogRow]:
+    """
+    Get how many times each habit was completed on a day. See iter_day_logs.
+    """
+
+    return list(iter_day_logs(sess, date, names=names))
@@ -0,0 +1,143 @@
+import datetime
+from dataclasses import dataclass
+from typing import Iterable
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ritmo.models import Habit, HabitsVersion
+
+
+@dataclass(frozen=True, slots=True)
+class HabitRecord:
+    """
+    The columns of a habit needed to log it, without the cost of an ORM entity.
+    """
+
+    id: int
+    type: str
+    start_date: datetime.date
+    end_date: datetime.date | None
+
+
+class HabitRegistry:
+    """
+    Cache of the habits of a database by name, filled on lookup.
+    Every lookup reads the version of the habits, incremented by triggers on each habit
+    row written, which is cheaper than reading the habits. Queries changing habits
+    invalidate the names they touch and expect the version to grow by the number of
+    rows they wrote. Any other change, like by another process or connection, leaves
+    the version off and drops the whole cache.
+    """
+
+    def __init__(self):
+        self.records: dict[str, HabitRecord] = {}
+        self.hits = 0
+        self.misses = 0
+        # Incremented on invalidation, so lookups that started before it do not cache
+        # records that may be outdated.
+        self.generation = 0
+        # Version of the habits the cached records are up to date with.
+        self.version: int | None = None
+
+    def get_many(self, sess: Session, names: Iterable[str]) -> dict[str, HabitRecord]:
+        """
+        Look up habits by name, loading the missing ones with a single query.
+
+        Args:
+            sess: The database session.
+            names: The names of the habits.
+
+        Returns:
+            The record of each habit found by name.
+        """
+
+        version = sess.execute(select(HabitsVersion.version)).scalar()
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+        found = {}
+        missing = []
+        for name in names:
+            record = self.records.get(name)
+            if record is None:
+                missing.append(name)
+            else:
+                found[name] = record
+
+        self.hits += len(found)
+        self.misses += len(missing)
+        if not missing:
+            return found
+
+        generation = self.generation
+        rows = sess.execute(
+            select(
+                Habit.name, Habit.id, Habit.type, Habit.start_date, Habit.end_date
+            ).where(Habit.name.in_(missing))
+        )
+        loaded = {name: HabitRecord(*record) for name, *record in rows}
+        if generation == self.generation:
+            self.records.update(loaded)
+
+        return found | loaded
+
+    def get(self, sess: Session, name: str) -> HabitRecord | None:
+        """
+        Look up a habit by name.
+
+        Args:
+            sess: The database session.
+            name: The name of the habit.
+        """
+
+        return self.get_many(sess, [name]).get(name)
+
+    def invalidate(self, *names: str, changes: int | None = None) -> None:
+        """
+        Drop the cached records of some habits after they were added, changed or deleted.
+
+        Args:
+            names: The names of the habits.
+            changes: The number of habit rows written, one per name by default.
+        """
+
+        self.generation += 1
+        for name in names:
+            self.records.pop(name, None)
+
+        if self.version is not None:
+            self.version += len(names) if changes is None else changes
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.records.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the number of cache hits, misses and cached habits.
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.records)}
+
+
+# Registries of each engine, dropped with their engine.
+_registries: WeakKeyDictionary[Engine, HabitRegistry] = WeakKeyDictionary()
+
+
+def get_registry(engine: Engine) -> HabitRegistry:
+    """
+    Get the habit registry of the database of an engine.
+
+    Args:
+        engine: The engine bound to the database, e.g. sess.get_bind().
+    """
+
+    registry = _registries.get(engine)
+    if registry is None:
+        registry = _registries[engine] = HabitRegistry()
+
+    return registry
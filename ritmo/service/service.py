@@ -0,0 +1,167 @@
+import asyncio
+import datetime
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from ritmo.domain import DayLogRow, HabitRow
+from ritmo.service.queries import (
+    create_habit,
+    get_day_logs,
+    get_habits,
+    mark_many_as_done,
+    mark_many_as_undone,
+    modify_habit,
+    remove_habit,
+)
+from ritmo.service.registry import get_registry
+from ritmo.sessions import get_local_path, upgrade_schema
+from ritmo.sessions.sessions import is_memory_database, set_sqlite_pragmas
+from ritmo.sessions.settings import get_pool_options
+from ritmo.stats import get_stats
+
+
+async def create_async_engine_for(path: str) -> AsyncEngine:
+    """
+    Create and migrate a new async engine for the database at the given path.
+    SQLite file databases get a queue pool and the configured PRAGMAs on connect, like
+    the engines of the CLI.
+
+    Args:
+        path: The path to the database. It must be a valid SQLAlchemy connection string
+            with an async driver, e.g. 'sqlite+aiosqlite:///ritmo.db'.
+    """
+
+    if is_memory_database(path):
+        engine = create_async_engine(path, future=True)
+    else:
+        engine = create_async_engine(
+            path, future=True, poolclass=AsyncAdaptedQueuePool, **get_pool_options()
+        )
+
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade_schema)
+
+    return engine
+
+
+class HabitService:
+    """
+    Async API over the habit queries, returning plain data instead of printing it.
+    Each call runs its query in a session of its own. SQLite allows a single writer,
+    so calls changing data wait for each other instead of for the database lock.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        """
+        Args:
+            engine: The async engine bound to a migrated database.
+        """
+
+        self.engine = engine
+        self.session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        self.write_lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, path: str | None = None) -> "HabitService":
+        """
+        Create a service for the database at the given path.
+
+        Args:
+            path: The path to the database. Defaults to the local database at
+                ~/.ritmo/ritmo.db using aiosqlite.
+        """
+
+        path = path or f"sqlite+aiosqlite:///{get_local_path()}"
+        return cls(await create_async_engine_for(path))
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+    def cache_stats(self) -> dict[str, int]:
+        """
+        Get the hits, misses and size of the habit registry of the database.
+        """
+
+        return get_registry(self.engine.sync_engine).stats()
+
+    async def read(self, query: Callable[..., object], *args):
+        """
+        Run a query taking a session as its first argument and return its result.
+        """
+
+        async with self.session() as sess:
+            return await sess.run_sync(query, *args)
+
+    async def write(self, query: Callable[..., object], *args):
+        """
+        Run a query changing data, after any other one has finished.
+        """
+
+        async with self.write_lock:
+            return await self.read(query, *args)
+
+    async def add_habit(
+        self,
+        name: str,
+        description: Optional[str | None] = None,
+        type: Optional[str | None] = None,
+        start_date: Optional[datetime.date | None] = None,
+        end_date: Optional[datetime.date | None] = None,
+    ) -> bool:
+        return await self.write(
+            create_habit, name, description, type, start_date, end_date
+        )
+
+    async def list_habits(
+        self,
+        sort_by: str = "name",
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        name_filter: str | None = None,
+    ) -> list[HabitRow]:
+        return await self.read(get_habits, sort_by, reverse, limit, offset, name_filter)
+
+    async def update_habit(
+        self,
+        name: str,
+        new_name: Optional[str | None] = None,
+        description: Optional[str | None] = None,
+        type: Optional[str | None] = None,
+        start_date: Optional[datetime.date | None] = None,
+        end_date: Optional[datetime.date | None] = None,
+    ) -> None:
+        await self.write(
+            modify_habit, name, new_name, description, type, start_date, end_date
+        )
+
+    async def delete_habit(self, name: str) -> bool:
+        return await self.write(remove_habit, name)
+
+    async def mark_done(
+        self, names: Sequence[str], dates: Sequence[datetime.date] | None = None
+    ) -> dict[str, int | None]:
+        dates = dates or [datetime.datetime.utcnow().date()]
+        return await self.write(mark_many_as_done, names, dates)
+
+    async def mark_undone(
+        self,
+        names: Sequence[str],
+        dates: Sequence[datetime.date] | None = None,
+        times: int = 1,
+    ) -> dict[str, int | None]:
+        dates = dates or [datetime.datetime.utcnow().date()]
+        return await self.write(mark_many_as_undone, names, dates, times)
+
+    async def get_day_logs(self, date: datetime.date | None = None) -> list[DayLogRow]:
+        return await self.read(get_day_logs, date or datetime.datetime.utcnow().date())
+
+    async def get_stats(self, today: datetime.date | None = None) -> list[dict]:
+        return await self.read(get_stats, today or datetime.datetime.utcnow().date())
@@ -1 +1,8 @@
-from .sessions import create_local_session, create_memory_session
+from .migrations import SCHEMA_VERSION, migrate, upgrade_schema
+from .sessions import (
+    create_local_session,
+    create_memory_session,
+    dispose_engines,
+    get_engine,
+    get_local_path,
+)
@@ -0,0 +1,234 @@
+from typing import Callable
+
+from sqlalchemy import Table, inspect
+from sqlalchemy.engine import Connection, Engine
+
+from ritmo.models import Base, HabitDailyCount, HabitLog, HabitStats
+from ritmo.stats import rebuild_streaks
+
+
+def add_lookup_indexes(conn: Connection) -> None:
+    """
+    Add a unique index on habits.name and a composite index on habit_logs(habit_id, date).
+    Habits sharing a name are merged into the oldest one before the unique index is created.
+
+    Args:
+        conn: The connection to migrate.
+    """
+
+    duplicated_ids = "SELECT id FROM habits WHERE id NOT IN (SELECT MIN(id) FROM habits GROUP BY name)"
+    conn.exec_driver_sql(
+        f"""
+        UPDATE habit_logs SET habit_id = (
+            SELECT MIN(oldest.id) FROM habits AS oldest
+            JOIN habits AS duplicate ON duplicate.name = oldest.name
+            WHERE duplicate.id = habit_logs.habit_id
+        )
+        WHERE habit_id IN ({duplicated_ids})
+        """
+    )
+    conn.exec_driver_sql(f"DELETE FROM habits WHERE id IN ({duplicated_ids})")
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_habits_name ON habits (name)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_habit_logs_habit_id_date "
+        "ON habit_logs (habit_id, date)"
+    )
+
+
+def add_rollups(conn: Connection) -> None:
+    """
+    Fill the habit_stats and habit_daily_counts tables from the existing habit logs.
+    Every log is a single completion at this version, so logs are counted rather than
+    summed.
+
+    Args:
+        conn: The connection to migrate.
+    """
+
+    conn.exec_driver_sql(
+        """
+        INSERT INTO habit_daily_counts (habit_id, date, count)
+        SELECT habit_id, date, COUNT(*) FROM habit_logs GROUP BY habit_id, date
+        """
+    )
+    rebuild_streaks(conn)
+
+
+def add_log_counts(conn: Connection) -> None:
+    """
+    Add the count column to habit_logs, so a log can hold several completions.
+    The habit_logs_archive table is created along with the other missing tables.
+
+    Args:
+        conn: The connection to migrate.
+    """
+
+    conn.exec_driver_sql(
+        "ALTER TABLE habit_logs ADD COLUMN count INTEGER NOT NULL DEFAULT 1"
+    )
+
+
+def merge_daily_logs(conn: Connection) -> None:
+    """
+    Merge the logs of each habit and day into a single log holding their count, and make
+    the index on habit_logs(habit_id, date) unique. The merged log keeps the id of the
+    latest log of its day and the original logs are moved to habit_logs_archive.
+
+    Args:
+        conn: The connection to migrate.
+    """
+
+    merged_days = "SELECT habit_id, date FROM habit_logs GROUP BY habit_id, date HAVING COUNT(*) > 1"
+    same_day = "FROM habit_logs AS log WHERE log.habit_id = habit_logs.habit_id AND log.date = habit_logs.date"
+    conn.exec_driver_sql(
+        f"""
+        INSERT OR IGNORE INTO habit_logs_archive
+        SELECT id, habit_id, date, completed, completed_at, count FROM habit_logs
+        WHERE (habit_id, date) IN ({merged_days})
+        """
+    )
+    conn.exec_driver_sql(
+        f"""
+        UPDATE habit_logs SET
+            count = (SELECT SUM(log.count) {same_day}),
+            completed_at = (SELECT MAX(log.completed_at) {same_day})
+        WHERE id IN (
+            SELECT MAX(id) FROM habit_logs GROUP BY habit_id, date HAVING COUNT(*) > 1
+        )
+        """
+    )
+    conn.exec_driver_sql(
+        """
+        DELETE FROM habit_logs WHERE id NOT IN (
+            SELECT MAX(id) FROM habit_logs GROUP BY habit_id, date
+        )
+        """
+    )
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_habit_logs_habit_id_date")
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX ix_habit_logs_habit_id_date ON habit_logs (habit_id, date)"
+    )
+
+
+def rebuild_table(conn: Connection, table: Table) -> None:
+    """
+    Recreate a table referencing habits with its current definition, since SQLite cannot
+    alter the constraints of a column. Rows of habits that no longer exist are dropped,
+    so they do not violate the foreign key.
+
+    Args:
+        conn: The connection to migrate.
+        table: The table to recreate.
+    """
+
+    columns = ", ".join(column.name for column in table.columns)
+    conn.exec_driver_sql(f"ALTER TABLE {table.name} RENAME TO {table.name}_old")
+    for index in table.indexes:
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+
+    table.create(conn)
+    conn.exec_driver_sql(
+        f"""
+        INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {table.name}_old
+        WHERE habit_id IN (SELECT id FROM habits)
+        """
+    )
+    conn.exec_driver_sql(f"DROP TABLE {table.name}_old")
+
+
+def cascade_habit_deletes(conn: Connection) -> None:
+    """
+    Make the foreign keys to habits delete the logs and rollups of a habit along with it.
+
+    Args:
+        conn: The connection to migrate.
+    """
+
+    for table in (HabitLog.__table__, HabitStats.__table__, HabitDailyCount.__table__):
+        rebuild_table(conn, table)
+
+
+def add_journal_records(conn: Connection) -> None:
+    """
+    Add the journal_records table, which is created along with the other missing tables.
+
+    Args:
+        conn: The connection to migrate.
+    """
+
+
+def add_habits_version(conn: Connection) -> None:
+    """
+    Add the habits_version table and its triggers, which are created along with the
+    other missing tables.
+
+    Args:
+        conn: The connection to migrate.
+    """
+
+
+# Migrations indexed by the schema version they upgrade to.
+MIGRATIONS: dict[int, Callable[[Connection], None]] = {
+    1: add_lookup_indexes,
+    2: add_rollups,
+    3: add_log_counts,
+    4: merge_daily_logs,
+    5: cascade_habit_deletes,
+    6: add_journal_records,
+    7: add_habits_version,
+}
+
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+def get_schema_version(conn: Connection) -> int:
+    """
+    Get the schema version stored in the database.
+
+    Args:
+        conn: The database connection.
+    """
+
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def upgrade_schema(conn: Connection) -> None:
+    """
+    Create missing tables and upgrade existing ones to the latest schema version.
+    The schema version is stored in SQLite's user_version pragma, so databases that are
+    already up to date are left untouched without reflecting or creating any table.
+
+    Args:
+        conn: The database connection, inside a transaction.
+    """
+
+    version = get_schema_version(conn)
+    if version == SCHEMA_VERSION:
+        return
+
+    is_new_database = not inspect(conn).has_table("habits")
+
+    Base.metadata.create_all(conn)
+
+    if version < SCHEMA_VERSION and not is_new_database:
+        # Rows of deleted habits may exist until the tables are rebuilt with cascading
+        # foreign keys, so the keys are only checked when the upgrade commits.
+        conn.exec_driver_sql("PRAGMA defer_foreign_keys = on")
+        for target_version in range(version + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[target_version](conn)
+
+    conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def migrate(engine: Engine) -> None:
+    """
+    Upgrade the database of an engine to the latest schema version in a transaction.
+
+    Args:
+        engine: The engine bound to the database to migrate.
+    """
+
+    with engine.begin() as conn:
+        upgrade_schema(conn)
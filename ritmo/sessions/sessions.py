@@ -1,27 +1,118 @@
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
-from ritmo.models import Base
+from ritmo.journal import get_journal_path, has_pending_entries
+from ritmo.profiling import phase
+from ritmo.sessions.migrations import migrate
+from ritmo.sessions.settings import get_pool_options, get_sqlite_pragmas
 
+# Engines for file databases, cached by connection string for the lifetime of the process.
+_engines: dict[str, Engine] = {}
 
-def create_session(path: str) -> sessionmaker:
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
     """
-    Create a new session for the database at the given path.
+    Apply the configured PRAGMAs to a new SQLite connection.
+    """
+
+    cursor = dbapi_connection.cursor()
+    for pragma, value in get_sqlite_pragmas().items():
+        cursor.execute(f"PRAGMA {pragma} = {value}")
+    cursor.close()
+
+
+def is_memory_database(path: str) -> bool:
+    """
+    Check whether a connection string points to an in-memory SQLite database.
+
+    Args:
+        path: A valid SQLAlchemy connection string.
+    """
+
+    url = make_url(path)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def create_engine_for(path: str) -> Engine:
+    """
+    Create and migrate a new engine for the database at the given path.
+    SQLite file databases get a queue pool and the configured PRAGMAs on connect.
 
     Args:
         path: The path to the database. It must be a valid SQLAlchemy connection string.
     """
 
-    session = sessionmaker()
-    engine = create_engine(path, future=True)
+    with phase("engine"):
+        if is_memory_database(path):
+            engine = create_engine(path, future=True)
+        else:
+            connect_args = {}
+            if make_url(path).get_backend_name() == "sqlite":
+                # The pool hands each connection to a single thread at a time, so they
+                # can be reused by the threads of a long running process like the daemon.
+                connect_args["check_same_thread"] = False
 
-    Base.metadata.create_all(engine)
+            engine = create_engine(
+                path,
+                future=True,
+                poolclass=QueuePool,
+                connect_args=connect_args,
+                **get_pool_options(),
+            )
 
-    session.configure(bind=engine)
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", set_sqlite_pragmas)
 
-    return session
+    with phase("migrate"):
+        migrate(engine)
+
+    return engine
+
+
+def get_engine(path: str) -> Engine:
+    """
+    Get the engine for the database at the given path, creating it on first use.
+    Engines for file databases are cached, in-memory databases always get a new engine
+    since each one of them is a separate database.
+
+    Args:
+        path: The path to the database. It must be a valid SQLAlchemy connection string.
+    """
+
+    if is_memory_database(path):
+        return create_engine_for(path)
+
+    engine = _engines.get(path)
+    if engine is None:
+        engine = _engines[path] = create_engine_for(path)
+
+    return engine
+
+
+def dispose_engines() -> None:
+    """
+    Dispose every cached engine and close their pooled connections.
+    """
+
+    for engine in _engines.values():
+        engine.dispose()
+
+    _engines.clear()
+
+
+def create_session(path: str) -> sessionmaker:
+    """
+    Create a new session for the database at the given path.
+
+    Args:
+        path: The path to the database. It must be a valid SQLAlchemy connection string.
+    """
+
+    return sessionmaker(bind=get_engine(path))
 
 
 def create_memory_session() -> sessionmaker:
@@ -32,9 +123,9 @@ def create_memory_session() -> sessionmaker:
     return create_session("sqlite://")
 
 
-def create_local_session() -> sessionmaker:
+def get_local_path() -> Path:
     """
-    Create a new session for a local database at ~/.ritmo/ritmo.db.
+    Get the path of the local database at ~/.ritmo/ritmo.db, creating its folder.
     """
 
     home_dir = Path.home()
@@ -42,6 +133,20 @@ def create_local_session() -> sessionmaker:
     config_folder = home_dir / ".ritmo"
     config_folder.mkdir(exist_ok=True)
 
-    db_path = config_folder / "ritmo.db"
+    return config_folder / "ritmo.db"
+
 
-    return create_session(f"sqlite:///{db_path}")
+def create_local_session() -> sessionmaker:
+    """
+    Create a new session for a local database at ~/.ritmo/ritmo.db, merging the
+    completions journaled by `ritmo done` first so that commands see them.
+    """
+
+    session = create_session(f"sqlite:///{get_local_path()}")
+    if has_pending_entries(get_journal_path()):
+        from ritmo.journal.merge import merge_journal
+
+        with phase("journal"):
+            merge_journal(session)
+
+    return session
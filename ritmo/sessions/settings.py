@@ -0,0 +1,52 @@
+import os
+import re
+
+# PRAGMAs applied to every new SQLite connection. Each one can be overridden with a
+# RITMO_SQLITE_<PRAGMA> environment variable, e.g. RITMO_SQLITE_JOURNAL_MODE=delete.
+# Foreign keys must stay enforced, deleting a habit relies on them to cascade.
+DEFAULT_SQLITE_PRAGMAS = {
+    "foreign_keys": "on",
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "temp_store": "memory",
+    "mmap_size": "268435456",
+    "cache_size": "-64000",
+    "busy_timeout": "5000",
+}
+
+# Connection pool options for file databases, overridable with RITMO_<OPTION>, e.g.
+# RITMO_POOL_SIZE=1.
+DEFAULT_POOL_OPTIONS = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_timeout": 30,
+}
+
+PRAGMA_VALUE = re.compile(r"^-?[\w.]+$")
+
+
+def get_sqlite_pragmas() -> dict[str, str]:
+    """
+    Get the SQLite PRAGMAs to set on connect, with environment overrides applied.
+    """
+
+    pragmas = {}
+    for pragma, default in DEFAULT_SQLITE_PRAGMAS.items():
+        value = os.environ.get(f"RITMO_SQLITE_{pragma.upper()}", default)
+        if not PRAGMA_VALUE.match(value):
+            raise ValueError(f"Invalid value for SQLite PRAGMA {pragma}: {value!r}")
+
+        pragmas[pragma] = value
+
+    return pragmas
+
+
+def get_pool_options() -> dict[str, int]:
+    """
+    Get the connection pool options for file databases, with environment overrides applied.
+    """
+
+    return {
+        option: int(os.environ.get(f"RITMO_{option.upper()}", default))
+        for option, default in DEFAULT_POOL_OPTIONS.items()
+    }
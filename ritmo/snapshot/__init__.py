@@ -0,0 +1,14 @@
+# The snapshot is refreshed from the database by ritmo.snapshot.refresh, so that
+# reading it only imports the standard library.
+from .snapshot import (
+    DEFAULT_PROMPT_FORMAT,
+    format_prompt,
+    get_snapshot_path,
+    get_today,
+    get_today_habits,
+    read_snapshot,
+    record_done,
+    show_prompt,
+    update_snapshot,
+    write_snapshot,
+)
@@ -0,0 +1,56 @@
+import datetime
+import os
+from typing import Sequence
+
+from sqlalchemy.orm import Session
+
+from ritmo.service import DayLogRow, get_day_logs
+from ritmo.snapshot.snapshot import get_snapshot_path, update_snapshot, write_snapshot
+
+
+def refresh_snapshot(sess: Session, path: str | None = None) -> list[DayLogRow]:
+    """
+    Rewrite the snapshot of today's habits from the database.
+
+    Args:
+        sess: The database session.
+        path: The path of the snapshot. Defaults to get_snapshot_path().
+
+    Returns:
+        Today's logs of every habit.
+    """
+
+    today = datetime.datetime.utcnow().date()
+    rows = get_day_logs(sess, today)
+    write_snapshot(
+        path or get_snapshot_path(),
+        today.isoformat(),
+        [(row.type, row.times_done, row.name) for row in rows],
+    )
+
+    return rows
+
+
+def refresh_snapshot_habits(
+    sess: Session, names: Sequence[str], path: str | None = None
+) -> None:
+    """
+    Rewrite today's state of some habits in the snapshot from the database, with a
+    query for these habits only, removing the ones that no longer exist. Nothing is
+    read if the snapshot does not exist.
+
+    Args:
+        sess: The database session.
+        names: The names of the habits.
+        path: The path of the snapshot. Defaults to get_snapshot_path().
+    """
+
+    path = path or get_snapshot_path()
+    if not os.path.exists(path):
+        return
+
+    today = datetime.datetime.utcnow().date()
+    rows = get_day_logs(sess, today, names)
+    update_snapshot(
+        path, list(names), [(row.type, row.times_done, row.name) for row in rows]
+    )
@@ -0,0 +1,198 @@
+import os
+import time
+
+# The snapshot is read on every render of a shell prompt, so this module only imports
+# os and time, and paths are plain strings to avoid importing pathlib.
+
+DEFAULT_PROMPT_FORMAT = "{done}/{total}"
+
+
+def get_snapshot_path() -> str:
+    """
+    Get the path of the snapshot of today's habits, ~/.ritmo/snapshot.tsv.
+    """
+
+    return os.path.join(os.path.expanduser("~"), ".ritmo", "snapshot.tsv")
+
+
+def get_today() -> str:
+    """
+    Get today's date in 'Y-m-d' format, in UTC like the other commands.
+    """
+
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+def read_snapshot(path: str) -> tuple[str, list[tuple[str, int, str]]] | None:
+    """
+    Read a snapshot, a first line holding its day followed by a 'type, times done,
+    name' line per habit separated by tabs.
+
+    Returns:
+        The day and the type, times done and name of each habit, or None if the
+        snapshot does not exist or cannot be read.
+    """
+
+    try:
+        with open(path, encoding="utf-8") as file:
+            date, *lines = file.read().splitlines()
+        habits = []
+        for line in lines:
+            type, times_done, name = line.split("\t", 2)
+            habits.append((type, int(times_done), name))
+    except (OSError, ValueError):
+        return None
+
+    return date, habits
+
+
+def write_snapshot(path: str, date: str, habits: list[tuple[str, int, str]]) -> None:
+    """
+    Replace a snapshot atomically, so readers never see a partial one.
+
+    Args:
+        path: The path of the snapshot.
+        date: The day of the snapshot in 'Y-m-d' format.
+        habits: The type, times done and name of each habit.
+    """
+
+    lines = [date]
+    for type, times_done, name in habits:
+        if "\n" not in name:
+            lines.append(f"{type}\t{times_done}\t{name}")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    os.replace(temporary_path, path)
+
+
+def get_today_habits(path: str) -> list[tuple[str, int, str]] | None:
+    """
+    Get today's state of each habit from a snapshot. A snapshot of a previous day rolls
+    over to today with no habit done.
+    """
+
+    snapshot = read_snapshot(path)
+    if snapshot is None:
+        return None
+
+    date, habits = snapshot
+    if date != get_today():
+        return [(type, 0, name) for type, _, name in habits]
+
+    return habits
+
+
+def record_done(path: str, names: list[str], date: str) -> None:
+    """
+    Add completions journaled by `ritmo done` to the snapshot, if it exists. Boolean
+    habits are done at most once per day and unknown habits are ignored. Concurrent
+    updates may lose a completion until the next command changing habits rewrites
+    the snapshot from the database.
+
+    Args:
+        path: The path of the snapshot.
+        names: The names of the completed habits.
+        date: The day the habits were completed, in 'Y-m-d' format.
+    """
+
+    habits = get_today_habits(path)
+    if habits is None:
+        return
+
+    today = get_today()
+    if date == today:
+        done_names = set(names)
+        habits = [
+            (
+                type,
+                (
+                    (1 if type == "boolean" else times_done + 1)
+                    if name in done_names
+                    else times_done
+                ),
+                name,
+            )
+            for type, times_done, name in habits
+        ]
+
+    write_snapshot(path, today, habits)
+
+
+def update_snapshot(
+    path: str, names: list[str], habits: list[tuple[str, int, str]]
+) -> None:
+    """
+    Replace today's state of some habits in the snapshot, if it exists, keeping the
+    state of the others. Habits missing from the snapshot are added at the end, and
+    habits without a state, like deleted or renamed ones, are removed.
+
+    Args:
+        path: The path of the snapshot.
+        names: The names of the changed habits.
+        habits: The type, times done today and name of each changed habit that exists.
+    """
+
+    current_habits = get_today_habits(path)
+    if current_habits is None:
+        return
+
+    changed = {name: (type, times_done, name) for type, times_done, name in habits}
+    removed = set(names) - changed.keys()
+    updated_habits = [
+        changed.pop(name, (type, times_done, name))
+        for type, times_done, name in current_habits
+        if name not in removed
+    ]
+    write_snapshot(path, get_today(), updated_habits + list(changed.values()))
+
+
+def format_prompt(habits: list[tuple[str, int, str]], format: str) -> str:
+    """
+    Format today's habits for a shell prompt.
+
+    Args:
+        habits: The type, times done and name of each habit.
+        format: A format string with the {done}, {total} and {pending} placeholders,
+            the number of habits done today, the number of habits and the names of the
+            habits not done yet.
+    """
+
+    pending = [name for _, times_done, name in habits if times_done == 0]
+    return format.format(
+        done=len(habits) - len(pending), total=len(habits), pending=",".join(pending)
+    )
+
+
+def show_prompt(args: list[str]) -> int | None:
+    """
+    Print the summary of `ritmo prompt` from the snapshot.
+
+    Args:
+        args: The command line arguments, without the program name.
+
+    Returns:
+        0 once the summary is printed, or None if the command must run normally because
+        the snapshot does not exist yet or the arguments need the full command.
+    """
+
+    format = DEFAULT_PROMPT_FORMAT
+    if args[1:2] == ["--format"] and len(args) == 3:
+        format = args[2]
+    elif len(args) == 2 and args[1].startswith("--format="):
+        format = args[1].partition("=")[2]
+    elif len(args) != 1:
+        return None
+
+    habits = get_today_habits(get_snapshot_path())
+    if habits is None:
+        return None
+
+    try:
+        print(format_prompt(habits, format))
+    except (KeyError, IndexError, ValueError):
+        return None
+
+    return 0
@@ -0,0 +1,12 @@
+from .rollups import (
+    check_rollups,
+    compute_streaks,
+    get_stats,
+    rebuild_rollups,
+    rebuild_streaks,
+    record_done,
+    record_imported,
+    record_many_done,
+    record_undone,
+    update_streaks,
+)
@@ -0,0 +1,433 @@
+import datetime
+from itertools import groupby
+from typing import Iterable, Mapping
+
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ritmo.models import Habit, HabitDailyCount, HabitLog, HabitStats
+
+
+def compute_streaks(
+    dates: Iterable[datetime.date],
+) -> tuple[int, int, datetime.date | None]:
+    """
+    Compute the streaks of a habit from the days it was completed.
+
+    Args:
+        dates: The distinct days the habit was completed, in ascending order.
+
+    Returns:
+        The streak ending on the last completed day, the longest streak and the last completed day.
+    """
+
+    current_streak = longest_streak = 0
+    last_completed = None
+
+    for date in dates:
+        if last_completed and (date - last_completed).days == 1:
+            current_streak += 1
+        else:
+            current_streak = 1
+
+        longest_streak = max(longest_streak, current_streak)
+        last_completed = date
+
+    return current_streak, longest_streak, last_completed
+
+
+def update_streaks(sess: Session, habit_id: int) -> None:
+    """
+    Recompute the rolled up stats of a habit from its daily counts.
+
+    Args:
+        sess: The database session.
+        habit_id: The id of the habit.
+    """
+
+    dates = sess.scalars(
+        select(HabitDailyCount.date)
+        .where(HabitDailyCount.habit_id == habit_id)
+        .order_by(HabitDailyCount.date)
+    ).all()
+    current_streak, longest_streak, last_completed = compute_streaks(dates)
+
+    stats = sess.get(HabitStats, habit_id) or HabitStats(habit_id=habit_id)
+    stats.current_streak = current_streak
+    stats.longest_streak = longest_streak
+    stats.last_completed = last_completed
+    stats.completed_days = len(dates)
+    sess.add(stats)
+
+
+def record_done(
+    sess: Session, habit_id: int, date: datetime.date, count: int = 1
+) -> None:
+    """
+    Update the rollups of a habit after it was completed on a day.
+
+    Args:
+        sess: The database session.
+        habit_id: The id of the habit.
+        date: The day the habit was completed.
+        count: The number of times it was completed.
+    """
+
+    record_many_done(sess, {(habit_id, date): count})
+
+
+def record_many_done(
+    sess: Session,
+    counts: Mapping[tuple[int, datetime.date], int],
+    max_count: int | None = None,
+) -> set[tuple[int, datetime.date]]:
+    """
+    Update the rollups of habits after they were completed on some days.
+    Completing a habit on new days after its last completed one extends or restarts its
+    current streak without reading its history.
+
+    The days are first inserted with a zero count when missing, so the new days are the
+    ones still at zero. That insert takes the write lock of the database, so another
+    process completing the same days waits for this transaction and finds them done.
+
+    Args:
+        sess: The database session.
+        counts: The number of completions per habit id and day.
+        max_count: The maximum daily count, like 1 for boolean habits.
+
+    Returns:
+        The habit ids and days that had no completions before.
+    """
+
+    if not counts:
+        return set()
+
+    sess.execute(
+        sqlite_insert(HabitDailyCount).on_conflict_do_nothing(
+            index_elements=[HabitDailyCount.habit_id, HabitDailyCount.date]
+        ),
+        [{"habit_id": habit_id, "date": date, "count": 0} for habit_id, date in counts],
+    )
+    added_days = counts.keys() & set(
+        sess.execute(
+            select(HabitDailyCount.habit_id, HabitDailyCount.date).where(
+                HabitDailyCount.habit_id.in_({habit_id for habit_id, _ in counts}),
+                HabitDailyCount.date.in_({date for _, date in counts}),
+                HabitDailyCount.count == 0,
+            )
+        ).all()
+    )
+    record_imported(sess, counts, max_count)
+
+    new_days = sorted(added_days)
+    all_stats = {
+        stats.habit_id: stats
+        for stats in sess.query(HabitStats).filter(
+            HabitStats.habit_id.in_({habit_id for habit_id, _ in new_days})
+        )
+    }
+
+    for habit_id, days in groupby(new_days, key=lambda key: key[0]):
+        dates = [date for _, date in days]
+
+        stats = all_stats.get(habit_id)
+        if stats is None:
+            stats = HabitStats(
+                habit_id=habit_id, current_streak=0, longest_streak=0, completed_days=0
+            )
+            sess.add(stats)
+
+        if stats.last_completed and dates[0] < stats.last_completed:
+            update_streaks(sess, habit_id)
+            continue
+
+        for date in dates:
+            if stats.last_completed and (date - stats.last_completed).days == 1:
+                stats.current_streak += 1
+            else:
+                stats.current_streak = 1
+
+            stats.longest_streak = max(stats.longest_streak, stats.current_streak)
+            stats.last_completed = date
+            stats.completed_days += 1
+
+    return added_days
+
+
+def remove_last_completed(sess: Session, stats: HabitStats) -> bool:
+    """
+    Update the rolled up stats of a habit after its last completed day was removed,
+    reading at most as many days as its longest streak instead of its whole history.
+
+    Args:
+        sess: The database session.
+        stats: The stats of the habit, whose last completed day has no completions left.
+
+    Returns:
+        False if the longest streak may have changed, which needs the whole history.
+    """
+
+    if stats.current_streak > 1:
+        if stats.current_streak == stats.longest_streak:
+            return False
+
+        stats.current_streak -= 1
+        stats.last_completed -= datetime.timedelta(days=1)
+    else:
+        # The previous streak is at most as long as the longest one.
+        dates = sess.scalars(
+            select(HabitDailyCount.date)
+            .where(
+                HabitDailyCount.habit_id == stats.habit_id,
+                HabitDailyCount.date < stats.last_completed,
+            )
+            .order_by(HabitDailyCount.date.desc())
+            .limit(max(stats.longest_streak, 1))
+        ).all()
+        stats.current_streak, _, stats.last_completed = compute_streaks(dates[::-1])
+        if not dates:
+            stats.longest_streak = 0
+
+    stats.completed_days -= 1
+    return True
+
+
+def record_undone(
+    sess: Session, habit_id: int, date: datetime.date, count: int = 1
+) -> None:
+    """
+    Update the rollups of a habit after some of its completions on a day were removed.
+
+    Args:
+        sess: The database session.
+        habit_id: The id of the habit.
+        date: The day the removed completions belonged to.
+        count: The number of completions removed.
+    """
+
+    is_same_day = and_(
+        HabitDailyCount.habit_id == habit_id, HabitDailyCount.date == date
+    )
+    sess.execute(
+        update(HabitDailyCount)
+        .where(is_same_day)
+        .values(count=HabitDailyCount.count - count)
+    )
+    emptied_days = sess.execute(
+        delete(HabitDailyCount).where(is_same_day, HabitDailyCount.count <= 0)
+    ).rowcount
+
+    if emptied_days:
+        stats = sess.get(HabitStats, habit_id)
+        if (
+            stats is None
+            or date != stats.last_completed
+            or not remove_last_completed(sess, stats)
+        ):
+            update_streaks(sess, habit_id)
+
+
+def record_imported(
+    sess: Session,
+    counts: Mapping[tuple[int, datetime.date], int],
+    max_count: int | None = None,
+):
+    """
+    Add daily counts of habits. Streaks are left untouched, so after importing logs in
+    batches, the streaks of the imported habits must be updated with update_streaks.
+
+    Args:
+        sess: The database session.
+        counts: The number of logs per habit id and day.
+        max_count: The maximum daily count, like 1 for boolean habits.
+    """
+
+    stmt = sqlite_insert(HabitDailyCount)
+    count = HabitDailyCount.count + stmt.excluded.count
+    if max_count is not None:
+        count = func.min(count, max_count)
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[HabitDailyCount.habit_id, HabitDailyCount.date],
+        set_={"count": count},
+    )
+    sess.execute(
+        stmt,
+        [
+            {"habit_id": habit_id, "date": date, "count": count}
+            for (habit_id, date), count in counts.items()
+        ],
+    )
+
+
+def get_daily_counts(sess: Session) -> dict[tuple[int, datetime.date], int]:
+    """
+    Aggregate the daily counts of every habit from its logs.
+
+    Args:
+        sess: The database session.
+    """
+
+    rows = sess.execute(select(HabitLog.habit_id, HabitLog.date, HabitLog.count))
+    return {(habit_id, date): count for habit_id, date, count in rows}
+
+
+def get_expected_stats(
+    daily_counts: Mapping[tuple[int, datetime.date], int],
+) -> dict[int, tuple[int, int, datetime.date | None, int]]:
+    """
+    Compute the stats of every habit from its daily counts.
+
+    Args:
+        daily_counts: The number of logs per habit id and day.
+    """
+
+    expected_stats: dict[int, tuple[int, int, datetime.date | None, int]] = {}
+    for habit_id, days in groupby(sorted(daily_counts), key=lambda key: key[0]):
+        dates = [date for _, date in days]
+        expected_stats[habit_id] = (*compute_streaks(dates), len(dates))
+
+    return expected_stats
+
+
+def check_rollups(sess: Session) -> list[str]:
+    """
+    Compare the rollups with the ones computed from the habit logs.
+
+    Args:
+        sess: The database session.
+
+    Returns:
+        The names of the habits whose rollups are inconsistent.
+    """
+
+    daily_counts = get_daily_counts(sess)
+    expected_stats = get_expected_stats(daily_counts)
+
+    stored_counts = {
+        (habit_id, date): count
+        for habit_id, date, count in sess.execute(
+            select(
+                HabitDailyCount.habit_id, HabitDailyCount.date, HabitDailyCount.count
+            )
+        )
+    }
+    stored_stats = {
+        habit_id: tuple(stats)
+        for habit_id, *stats in sess.execute(
+            select(
+                HabitStats.habit_id,
+                HabitStats.current_streak,
+                HabitStats.longest_streak,
+                HabitStats.last_completed,
+                HabitStats.completed_days,
+            ).where(HabitStats.completed_days > 0)
+        )
+    }
+
+    inconsistent_ids = {
+        habit_id for (habit_id, _), _ in daily_counts.items() ^ stored_counts.items()
+    }
+    inconsistent_ids |= {
+        habit_id for habit_id, _ in expected_stats.items() ^ stored_stats.items()
+    }
+
+    return sess.scalars(
+        select(Habit.name).where(Habit.id.in_(inconsistent_ids)).order_by(Habit.name)
+    ).all()
+
+
+def rebuild_rollups(sess: Session) -> None:
+    """
+    Recompute the rollups of every habit from scratch.
+
+    Args:
+        sess: The database session.
+    """
+
+    sess.execute(delete(HabitStats))
+    sess.execute(delete(HabitDailyCount))
+    sess.execute(
+        insert(HabitDailyCount).from_select(
+            ["habit_id", "date", "count"],
+            select(HabitLog.habit_id, HabitLog.date, HabitLog.count),
+        )
+    )
+    rebuild_streaks(sess)
+
+
+def rebuild_streaks(sess: Session) -> None:
+    """
+    Compute the stats of every habit from its daily counts, which must be up to date
+    and have no stats yet.
+
+    Args:
+        sess: The database session.
+    """
+
+    rows = sess.execute(
+        select(HabitDailyCount.habit_id, HabitDailyCount.date).order_by(
+            HabitDailyCount.habit_id, HabitDailyCount.date
+        )
+    )
+    stats = []
+    for habit_id, days in groupby(rows, key=lambda row: row.habit_id):
+        dates = [row.date for row in days]
+        current_streak, longest_streak, last_completed = compute_streaks(dates)
+        stats.append(
+            {
+                "habit_id": habit_id,
+                "current_streak": current_streak,
+                "longest_streak": longest_streak,
+                "last_completed": last_completed,
+                "completed_days": len(dates),
+            }
+        )
+
+    if stats:
+        sess.execute(insert(HabitStats), stats)
+
+
+def get_stats(sess: Session, today: datetime.date) -> list[dict]:
+    """
+    Get the stats of every habit as of a day, reading only its rollups.
+    The current streak is 0 if the habit was not completed on that day or the day before,
+    and the completion rate is the share of days since the habit started it was completed.
+
+    Args:
+        sess: The database session.
+        today: The day to compute the stats for.
+    """
+
+    rows = sess.execute(
+        select(
+            Habit.name,
+            Habit.start_date,
+            Habit.end_date,
+            HabitStats.current_streak,
+            HabitStats.longest_streak,
+            HabitStats.last_completed,
+            HabitStats.completed_days,
+        )
+        .outerjoin(HabitStats, HabitStats.habit_id == Habit.id)
+        .order_by(Habit.name)
+    )
+
+    stats = []
+    for row in rows:
+        last_day = min(row.end_date, today) if row.end_date else today
+        active_days = max((last_day - row.start_date).days + 1, 1)
+        is_on_streak = row.last_completed and (today - row.last_completed).days <= 1
+
+        stats.append(
+            {
+                "name": row.name,
+                "current_streak": row.current_streak if is_on_streak else 0,
+                "longest_streak": row.longest_streak or 0,
+                "last_completed": row.last_completed,
+                "completion_rate": min((row.completed_days or 0) / active_days, 1.0),
+            }
+        )
+
+    return stats
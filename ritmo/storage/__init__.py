@@ -0,0 +1,16 @@
+import importlib
+
+from .base import LogRow, Storage
+from .log import LogStorage
+from .memory import MemoryStorage
+
+# The SQLAlchemy storage is imported on first access, so that the other storages do
+# not pay for importing SQLAlchemy.
+_SQL_NAMES = {"SQLAlchemyStorage", "as_storage"}
+
+
+def __getattr__(name: str):
+    if name not in _SQL_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(".sql", __name__), name)
@@ -0,0 +1,198 @@
+import datetime
+from typing import Iterable, Iterator, NamedTuple, Protocol, Sequence
+
+from ritmo.domain import DayLogRow, HabitRow, ServiceError
+
+HABIT_TYPES = ("boolean", "numerical")
+
+# Sort keys of the sorting criteria of habits. Habits without an end date are last.
+SORT_KEYS = {
+    "name": lambda habit: habit.name,
+    "start-date": lambda habit: habit.start_date,
+    "end-date": lambda habit: (
+        habit.end_date is None,
+        habit.end_date or datetime.date.min,
+    ),
+}
+
+
+class LogRow(NamedTuple):
+    """
+    The number of times a habit was completed on a day.
+    """
+
+    name: str
+    date: datetime.date
+    times: int
+
+
+class Storage(Protocol):
+    """
+    Storage of habits and of their logs, one log per habit and day holding the number
+    of times it was completed. Commands taking a database session also run on any
+    storage implementing this protocol.
+    """
+
+    def get_habit(self, name: str) -> HabitRow | None:
+        """
+        Get a habit by name, or None if it does not exist.
+        """
+
+    def put_habit(self, habit: HabitRow, name: str | None = None) -> bool:
+        """
+        Add a habit, or replace the habit with the given name, keeping its logs.
+
+        Args:
+            habit: The habit to store.
+            name: The current name of the habit to replace, a new habit is added if
+                not given.
+
+        Returns:
+            Whether the habit was stored, False if adding a habit whose name exists.
+
+        Raises:
+            HabitNotFoundError: If the habit to replace does not exist.
+            ServiceError: If the habit is invalid or renamed to an existing name.
+        """
+
+    def delete_habits(
+        self, names: Sequence[str] = (), pattern: str | None = None
+    ) -> list[str]:
+        """
+        Delete habits with their logs, by name or by glob pattern.
+
+        Returns:
+            The names of the deleted habits.
+        """
+
+    def iter_habits(
+        self,
+        sort_by: str = "name",
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        name_filter: str | None = None,
+    ) -> Iterator[HabitRow]:
+        """
+        Iterate over habits sorted by 'name', 'start-date' or 'end-date', keeping the
+        order they were added in ties. See ritmo.service.iter_habits.
+        """
+
+    def append_logs(
+        self, names: Sequence[str], dates: Sequence[datetime.date]
+    ) -> dict[str, int | None]:
+        """
+        Add a completion of habits on some days. Boolean habits are done at most once a
+        day.
+
+        Returns:
+            The number of completions added per habit name, None for habits that were
+            not found.
+        """
+
+    def remove_logs(
+        self, names: Sequence[str], dates: Sequence[datetime.date], times: int = 1
+    ) -> dict[str, int | None]:
+        """
+        Remove completions of habits on some days, removing logs left without any.
+
+        Returns:
+            The number of completions removed per habit name, None for habits that
+            were not found.
+
+        Raises:
+            ServiceError: If times is not positive.
+        """
+
+    def scan_logs(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        names: Sequence[str] | None = None,
+    ) -> Iterator[LogRow]:
+        """
+        Iterate over the logs of a range of days, inclusive, ordered by day and then
+        in the order habits were added.
+
+        Args:
+            start: The first day.
+            end: The last day.
+            names: Only scan the logs of these habits.
+        """
+
+    def count_logs(self, start: datetime.date, end: datetime.date) -> dict[str, int]:
+        """
+        Get the number of completions of each habit completed within a range of days,
+        inclusive.
+        """
+
+    def iter_day_logs(self, date: datetime.date) -> Iterator[DayLogRow]:
+        """
+        Iterate over how many times each habit was completed on a day, in the order
+        habits were added.
+        """
+
+    def close(self) -> None:
+        """
+        Release the resources of the storage, writing pending changes.
+        """
+
+
+def check_habit(habit: HabitRow) -> None:
+    """
+    Check a habit before storing it.
+
+    Raises:
+        ServiceError: If the name is empty, the type is unknown or the end date is
+            before the start date.
+    """
+
+    if not habit.name or habit.name.isspace():
+        raise ServiceError("Habit name must be specified.")
+
+    if habit.type not in HABIT_TYPES:
+        raise ServiceError(f"Habit type must be one of {', '.join(HABIT_TYPES)}.")
+
+    if habit.end_date and habit.end_date < habit.start_date:
+        raise ServiceError("End date must be after start date.")
+
+
+def check_times(times: int) -> None:
+    if times < 1:
+        raise ServiceError("Times must be a positive number.")
+
+
+def to_date(value: datetime.date | None) -> datetime.date | None:
+    """
+    Get the day of a date or datetime, as given by click's DateTime parameters.
+    """
+
+    if isinstance(value, datetime.datetime):
+        return value.date()
+
+    return value
+
+
+def sort_habits(
+    habits: Iterable[HabitRow],
+    sort_by: str = "name",
+    reverse: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+    name_filter: str | None = None,
+) -> list[HabitRow]:
+    """
+    Sort, filter and paginate habits given in the order they were added, like
+    ritmo.service.iter_habits does in the database.
+    """
+
+    if name_filter:
+        needle = name_filter.lower()
+        habits = [habit for habit in habits if needle in habit.name.lower()]
+
+    key = SORT_KEYS.get(sort_by, SORT_KEYS["name"])
+    # Sorting is stable in both directions, so ties keep the order habits were added.
+    habits = sorted(habits, key=key, reverse=reverse)
+    stop = None if limit is None else offset + limit
+
+    return habits[offset:stop]
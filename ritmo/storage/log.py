@@ -0,0 +1,195 @@
+import datetime
+import json
+import os
+from typing import Sequence
+
+from ritmo.domain import HabitRow
+from ritmo.storage.memory import MemoryStorage
+
+# A log with fewer records than this is never compacted.
+MIN_COMPACTION_RECORDS = 1000
+
+# A log is compacted when opened once it holds this many records per live one.
+COMPACTION_RATIO = 4
+
+
+def format_record(record: list) -> str:
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def to_record(habit: HabitRow, name: str | None) -> list:
+    return [
+        "put",
+        name,
+        habit.name,
+        habit.description,
+        habit.type,
+        habit.start_date.isoformat(),
+        habit.end_date.isoformat() if habit.end_date else None,
+    ]
+
+
+def from_record(record: list) -> tuple[HabitRow, str | None]:
+    _, name, habit_name, description, type, start_date, end_date = record
+    habit = HabitRow(
+        habit_name,
+        description,
+        type,
+        datetime.date.fromisoformat(start_date),
+        datetime.date.fromisoformat(end_date) if end_date else None,
+    )
+
+    return habit, name
+
+
+class LogStorage(MemoryStorage):
+    """
+    Storage appending every change to a file, one JSON record per line, and serving
+    reads from memory. Completing a habit writes a line, without reading or rewriting
+    anything, which suits write-heavy use.
+
+    The file is replayed into memory when opened, and compacted into a record per
+    habit and log once it holds COMPACTION_RATIO times as many records as that.
+    """
+
+    def __init__(self, path: str | os.PathLike, sync: bool = False):
+        """
+        Args:
+            path: The path of the log file, created if it does not exist.
+            sync: Sync the file to disk after each change instead of leaving it to
+                the operating system.
+        """
+
+        super().__init__()
+        self.path = os.fspath(path)
+        self.sync = sync
+        self.records = 0
+        self.pending: list[str] = []
+        self.file = None
+
+        self.replay()
+        live_records = len(self.habits) + sum(map(len, self.logs.values()))
+        if self.records >= max(MIN_COMPACTION_RECORDS, COMPACTION_RATIO * live_records):
+            self.compact()
+
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def replay(self) -> None:
+        """
+        Apply the records of the file. A last record cut short by a crash is dropped.
+        """
+
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+
+        with file:
+            valid_size = 0
+            for line in file:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Incomplete record.")
+                    record = json.loads(line)
+                except ValueError:
+                    break
+
+                self.apply(record)
+                self.records += 1
+                valid_size += len(line)
+
+        if valid_size < os.path.getsize(self.path):
+            os.truncate(self.path, valid_size)
+
+    def apply(self, record: list) -> None:
+        if record[0] == "put":
+            MemoryStorage.store_habit(self, *from_record(record))
+        elif record[0] == "delete":
+            MemoryStorage.drop_habit(self, record[1])
+        else:
+            _, name, day, count = record
+            MemoryStorage.add_count(self, name, day, count)
+
+    def append(self, record: list) -> None:
+        self.pending.append(format_record(record))
+
+    def store_habit(self, habit: HabitRow, name: str | None = None) -> None:
+        super().store_habit(habit, name)
+        self.append(to_record(habit, name))
+
+    def drop_habit(self, name: str) -> None:
+        super().drop_habit(name)
+        self.append(["delete", name])
+
+    def add_count(self, name: str, day: int, count: int) -> None:
+        super().add_count(name, day, count)
+        self.append(["log", name, day, count])
+
+    def write(self) -> None:
+        """
+        Write the records of a change with a single write.
+        """
+
+        if not self.pending or self.file is None:
+            return
+
+        self.file.write("".join(self.pending))
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+        self.records += len(self.pending)
+        self.pending.clear()
+
+    def compact(self) -> None:
+        """
+        Replace the file atomically by a record per habit and per log.
+        """
+
+        self.write()
+        temporary_path = f"{self.path}.{os.getpid()}"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            records = 0
+            for name, habit in self.habits.items():
+                file.write(format_record(to_record(habit, None)))
+                for day, count in zip(self.logs[name].days, self.logs[name].counts):
+                    file.write(format_record(["log", name, day, count]))
+                    records += 1
+                records += 1
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.path)
+        self.records = records
+
+        if self.file is not None:
+            self.file.close()
+            self.file = open(self.path, "a", encoding="utf-8")
+
+    def put_habit(self, habit: HabitRow, name: str | None = None) -> bool:
+        stored = super().put_habit(habit, name)
+        self.write()
+        return stored
+
+    def delete_habits(
+        self, names: Sequence[str] = (), pattern: str | None = None
+    ) -> list[str]:
+        deleted = super().delete_habits(names, pattern)
+        self.write()
+        return deleted
+
+    def append_logs(
+        self, names: Sequence[str], dates: Sequence[datetime.date]
+    ) -> dict[str, int | None]:
+        results = super().append_logs(names, dates)
+        self.write()
+        return results
+
+    def remove_logs(
+        self, names: Sequence[str], dates: Sequence[datetime.date], times: int = 1
+    ) -> dict[str, int | None]:
+        results = super().remove_logs(names, dates, times)
+        self.write()
+        return results
+
+    def close(self) -> None:
+        self.write()
+        self.file.close()
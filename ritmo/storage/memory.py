@@ -0,0 +1,236 @@
+import bisect
+import datetime
+import fnmatch
+import heapq
+from array import array
+from typing import Iterator, Sequence
+
+from ritmo.domain import DayLogRow, HabitNotFoundError, HabitRow, ServiceError
+from ritmo.storage.base import LogRow, check_habit, check_times, sort_habits, to_date
+
+
+class DayCounts:
+    """
+    The logs of a habit as two parallel arrays, the sorted ordinals of the days it was
+    completed and the number of times it was completed on each of them.
+    """
+
+    __slots__ = ("days", "counts")
+
+    def __init__(self):
+        self.days = array("l")
+        self.counts = array("l")
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def get(self, day: int) -> int:
+        index = bisect.bisect_left(self.days, day)
+        if index < len(self.days) and self.days[index] == day:
+            return self.counts[index]
+
+        return 0
+
+    def add(self, day: int, count: int) -> None:
+        """
+        Add to the count of a day, dropping the day once its count reaches zero.
+        Appending a day after the last one, like today, does not move the others.
+        """
+
+        index = bisect.bisect_left(self.days, day)
+        if index < len(self.days) and self.days[index] == day:
+            self.counts[index] += count
+            if self.counts[index] <= 0:
+                del self.days[index]
+                del self.counts[index]
+        elif count > 0:
+            self.days.insert(index, day)
+            self.counts.insert(index, count)
+
+    def scan(self, start: int, end: int) -> Iterator[tuple[int, int]]:
+        """
+        Iterate over the days and counts of a range of days, inclusive.
+        """
+
+        first = bisect.bisect_left(self.days, start)
+        last = bisect.bisect_right(self.days, end)
+        return zip(self.days[first:last], self.counts[first:last])
+
+
+def scan_habit(
+    position: int, name: str, logs: DayCounts, start: int, end: int
+) -> Iterator[tuple[int, int, str, int]]:
+    """
+    Iterate over the logs of a habit within a range of days, keyed by day and then by
+    the position of the habit, so the scans of several habits can be merged.
+    """
+
+    for day, count in logs.scan(start, end):
+        yield day, position, name, count
+
+
+class MemoryStorage:
+    """
+    Storage keeping habits in a dict, in the order they were added, and their logs in
+    arrays. Nothing is persisted, it is meant for tests and for embedding ritmo.
+
+    Changes go through store_habit, drop_habit and add_count, so that subclasses can
+    persist them.
+    """
+
+    def __init__(self):
+        self.habits: dict[str, HabitRow] = {}
+        self.logs: dict[str, DayCounts] = {}
+
+    def store_habit(self, habit: HabitRow, name: str | None = None) -> None:
+        """
+        Add a habit, or replace the habit with the given name keeping its position.
+        """
+
+        if name is None:
+            self.habits[habit.name] = habit
+            self.logs[habit.name] = DayCounts()
+        elif name == habit.name:
+            self.habits[name] = habit
+        else:
+            self.habits = {
+                habit.name if key == name else key: habit if key == name else value
+                for key, value in self.habits.items()
+            }
+            self.logs[habit.name] = self.logs.pop(name)
+
+    def drop_habit(self, name: str) -> None:
+        del self.habits[name]
+        del self.logs[name]
+
+    def add_count(self, name: str, day: int, count: int) -> None:
+        """
+        Add to the count of the log of a habit on a day, given by its ordinal, or
+        remove from it with a negative count.
+        """
+
+        self.logs[name].add(day, count)
+
+    def get_habit(self, name: str) -> HabitRow | None:
+        return self.habits.get(name)
+
+    def put_habit(self, habit: HabitRow, name: str | None = None) -> bool:
+        habit = habit._replace(
+            start_date=to_date(habit.start_date), end_date=to_date(habit.end_date)
+        )
+        check_habit(habit)
+
+        if name is None:
+            if habit.name in self.habits:
+                return False
+        elif name not in self.habits:
+            raise HabitNotFoundError(name)
+        elif habit.name != name and habit.name in self.habits:
+            raise ServiceError(f"Habit '{habit.name}' already exists.")
+
+        self.store_habit(habit, name)
+        return True
+
+    def delete_habits(
+        self, names: Sequence[str] = (), pattern: str | None = None
+    ) -> list[str]:
+        wanted = set(names)
+        deleted = [
+            name
+            for name in self.habits
+            if name in wanted
+            or (pattern is not None and fnmatch.fnmatchcase(name, pattern))
+        ]
+        for name in deleted:
+            self.drop_habit(name)
+
+        return deleted
+
+    def iter_habits(
+        self,
+        sort_by: str = "name",
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        name_filter: str | None = None,
+    ) -> Iterator[HabitRow]:
+        return iter(
+            sort_habits(
+                self.habits.values(), sort_by, reverse, limit, offset, name_filter
+            )
+        )
+
+    def append_logs(
+        self, names: Sequence[str], dates: Sequence[datetime.date]
+    ) -> dict[str, int | None]:
+        results: dict[str, int | None] = dict.fromkeys(names)
+        days = [date.toordinal() for date in dict.fromkeys(dates)]
+        for name in results:
+            habit = self.habits.get(name)
+            if habit is None:
+                continue
+
+            results[name] = 0
+            logs = self.logs[name]
+            for day in days:
+                if habit.type == "boolean" and logs.get(day):
+                    continue
+                self.add_count(name, day, 1)
+                results[name] += 1
+
+        return results
+
+    def remove_logs(
+        self, names: Sequence[str], dates: Sequence[datetime.date], times: int = 1
+    ) -> dict[str, int | None]:
+        check_times(times)
+
+        results: dict[str, int | None] = dict.fromkeys(names)
+        days = [date.toordinal() for date in dict.fromkeys(dates)]
+        for name in results:
+            if name not in self.habits:
+                continue
+
+            results[name] = 0
+            logs = self.logs[name]
+            for day in days:
+                removed = min(logs.get(day), times)
+                if removed:
+                    self.add_count(name, day, -removed)
+                    results[name] += removed
+
+        return results
+
+    def scan_logs(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        names: Sequence[str] | None = None,
+    ) -> Iterator[LogRow]:
+        first_day, last_day = start.toordinal(), end.toordinal()
+        wanted = None if names is None else set(names)
+        scans = [
+            scan_habit(position, name, self.logs[name], first_day, last_day)
+            for position, name in enumerate(self.habits)
+            if wanted is None or name in wanted
+        ]
+        for day, _, name, count in heapq.merge(*scans):
+            yield LogRow(name, datetime.date.fromordinal(day), count)
+
+    def count_logs(self, start: datetime.date, end: datetime.date) -> dict[str, int]:
+        first_day, last_day = start.toordinal(), end.toordinal()
+        counts = {}
+        for name in self.habits:
+            total = sum(count for _, count in self.logs[name].scan(first_day, last_day))
+            if total:
+                counts[name] = total
+
+        return counts
+
+    def iter_day_logs(self, date: datetime.date) -> Iterator[DayLogRow]:
+        day = date.toordinal()
+        for name, habit in self.habits.items():
+            yield DayLogRow(name, habit.type, self.logs[name].get(day))
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,128 @@
+import datetime
+from typing import Iterator, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ritmo.domain import DayLogRow, HabitRow
+from ritmo.models import Habit, HabitLog
+from ritmo.service import (
+    create_habit,
+    iter_day_logs,
+    iter_habits,
+    mark_many_as_done,
+    mark_many_as_undone,
+    remove_habits,
+    replace_habit,
+)
+from ritmo.service.queries import stream
+from ritmo.storage.base import LogRow, Storage, check_habit
+
+
+class SQLAlchemyStorage:
+    """
+    Storage in a SQL database through a SQLAlchemy session, running the queries of
+    ritmo.service. Logs are added and removed with their rollups.
+    """
+
+    def __init__(self, sess: Session, batch_size: int = 1000):
+        """
+        Args:
+            sess: The database session, which must stay open while iterating.
+            batch_size: The number of rows fetched at a time by scans.
+        """
+
+        self.sess = sess
+        self.batch_size = batch_size
+
+    def get_habit(self, name: str) -> HabitRow | None:
+        row = self.sess.execute(
+            select(
+                Habit.name,
+                Habit.description,
+                Habit.type,
+                Habit.start_date,
+                Habit.end_date,
+            ).where(Habit.name == name)
+        ).first()
+
+        return None if row is None else HabitRow._make(row)
+
+    def put_habit(self, habit: HabitRow, name: str | None = None) -> bool:
+        check_habit(habit)
+        if name is None:
+            return create_habit(self.sess, *habit)
+
+        replace_habit(self.sess, name, habit)
+        return True
+
+    def delete_habits(
+        self, names: Sequence[str] = (), pattern: str | None = None
+    ) -> list[str]:
+        return remove_habits(self.sess, names, pattern)
+
+    def iter_habits(
+        self,
+        sort_by: str = "name",
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        name_filter: str | None = None,
+    ) -> Iterator[HabitRow]:
+        return iter_habits(
+            self.sess, sort_by, reverse, limit, offset, name_filter, self.batch_size
+        )
+
+    def append_logs(
+        self, names: Sequence[str], dates: Sequence[datetime.date]
+    ) -> dict[str, int | None]:
+        return mark_many_as_done(self.sess, names, dates)
+
+    def remove_logs(
+        self, names: Sequence[str], dates: Sequence[datetime.date], times: int = 1
+    ) -> dict[str, int | None]:
+        return mark_many_as_undone(self.sess, names, dates, times)
+
+    def scan_logs(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        names: Sequence[str] | None = None,
+    ) -> Iterator[LogRow]:
+        stmt = (
+            select(Habit.name, HabitLog.date, HabitLog.count)
+            .join(Habit, Habit.id == HabitLog.habit_id)
+            .where(HabitLog.date.between(start, end))
+            .order_by(HabitLog.date, Habit.id)
+        )
+        if names is not None:
+            stmt = stmt.where(Habit.name.in_(names))
+
+        yield from map(LogRow._make, stream(self.sess, stmt, self.batch_size))
+
+    def count_logs(self, start: datetime.date, end: datetime.date) -> dict[str, int]:
+        stmt = (
+            select(Habit.name, func.sum(HabitLog.count))
+            .join(Habit, Habit.id == HabitLog.habit_id)
+            .where(HabitLog.date.between(start, end))
+            .group_by(Habit.id)
+        )
+
+        return dict(self.sess.execute(stmt).all())
+
+    def iter_day_logs(self, date: datetime.date) -> Iterator[DayLogRow]:
+        return iter_day_logs(self.sess, date, self.batch_size)
+
+    def close(self) -> None:
+        pass
+
+
+def as_storage(sess: Session | Storage) -> Storage:
+    """
+    Get the storage of a database session, or the given storage.
+    """
+
+    if isinstance(sess, Session):
+        return SQLAlchemyStorage(sess)
+
+    return sess
@@ -0,0 +1,110 @@
+import datetime
+
+import pytest
+
+from ritmo.commands.import_logs import import_logs
+from ritmo.models import Habit
+from ritmo.sessions import create_memory_session
+
+np = pytest.importorskip("numpy")
+
+from ritmo.analytics import completion_report, load_active_habits, rolling_mean
+
+SINCE = datetime.date(2023, 1, 2)
+UNTIL = datetime.date(2023, 2, 5)
+
+
+def create_session_with_logs():
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        sess.add(Habit(name="Read", start_date=SINCE))
+        sess.add(
+            Habit(
+                name="Run",
+                start_date=SINCE,
+                end_date=SINCE + datetime.timedelta(days=6),
+            )
+        )
+        sess.commit()
+
+        rows = [
+            {"habit": "Read", "date": str(SINCE + datetime.timedelta(days=day))}
+            for day in range(0, 35, 2)
+        ]
+        rows += [{"habit": "Run", "date": str(SINCE)}] * 2
+        import_logs(sess, rows)
+
+    return mem_session
+
+
+def test_rolling_mean():
+    """
+    Test the trailing mean uses fewer values until the window is full.
+    """
+
+    values = np.array([1.0, 0.0, 1.0, 1.0])
+
+    assert rolling_mean(values, 2).tolist() == [1.0, 0.5, 0.5, 1.0]
+
+
+def test_load_active_habits():
+    """
+    Test counting the habits active on each day from their start and end dates.
+    """
+
+    with create_session_with_logs()() as sess:
+        active = load_active_habits(sess, SINCE, UNTIL)
+
+    assert active[:7].tolist() == [2] * 7
+    assert active[7:].tolist() == [1] * 28
+
+
+def test_completion_report():
+    """
+    Test weekly and monthly completion rates and the weekday distribution.
+    """
+
+    with create_session_with_logs()() as sess:
+        report = completion_report(sess, SINCE, UNTIL)
+
+    assert len(report["dates"]) == 35
+    assert report["daily_rate"][0] == 1.0
+    assert report["daily_rate"][1] == 0.0
+
+    assert report["weeks"][0] == np.datetime64("2023-01-02")
+    # First week: Read on 4 of 7 days and Run on 1 of 7 days.
+    assert report["weekly_rate"][0] == pytest.approx(5 / 14)
+    assert report["weekly_rate"][1] == pytest.approx(3 / 7)
+
+    assert report["months"].astype(str).tolist() == ["2023-01", "2023-02"]
+    assert report["monthly_rate"][1] == pytest.approx(3 / 5)
+
+    # Read is done every other day from a Monday, Run once on that Monday.
+    assert report["weekday_completions"].tolist() == [4, 2, 3, 2, 3, 2, 3]
+    assert report["weekday_completions"].sum() == 19
+
+
+def test_completion_report_counts_completions_and_habits_done():
+    """
+    Test that the weekday distribution counts each completion of a habit done several
+    times on a day, while the rates count the habits done.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        sess.add(Habit(name="Read", type="boolean", start_date=SINCE))
+        sess.add(Habit(name="Pushups", type="numerical", start_date=SINCE))
+        sess.commit()
+
+        rows = [{"habit": "Read", "date": str(SINCE)}]
+        rows += [{"habit": "Pushups", "date": str(SINCE)}] * 3
+        rows += [{"habit": "Pushups", "date": str(SINCE + datetime.timedelta(1))}]
+        import_logs(sess, rows)
+
+        report = completion_report(sess, SINCE, UNTIL)
+
+    assert report["weekday_completions"].tolist() == [4, 1, 0, 0, 0, 0, 0]
+    # Rates count the habits done, not the completions of each.
+    assert report["daily_rate"][:2].tolist() == [1.0, 0.5]
+    # First week: 2 habits done on the first day and 1 on the second, of 2 every day.
+    assert report["weekly_rate"][0] == pytest.approx(3 / 14)
@@ -0,0 +1,89 @@
+from sqlalchemy import event
+
+from ritmo.commands.add_habit import add_habit
+from ritmo.commands.calendar_heatmap import load_year, render_heatmap, show_calendar
+from ritmo.commands.import_logs import import_logs
+from ritmo.sessions import create_memory_session
+
+
+def create_session_with_logs(habits: int = 2):
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        for i in range(habits):
+            add_habit(sess, f"Habit {i}", None, "numerical", None, None)
+
+        rows = [
+            {"habit": "Habit 0", "date": "2026-01-01"},
+            {"habit": "Habit 0", "date": "2026-01-01"},
+            {"habit": "Habit 0", "date": "2026-12-31"},
+            {"habit": "Habit 1", "date": "2026-03-15"},
+            {"habit": "Habit 1", "date": "2025-12-31"},
+        ]
+        import_logs(sess, rows)
+
+    return mem_session
+
+
+def test_load_year_fills_a_dense_array():
+    """
+    Test loading the daily counts of every habit in a year.
+    """
+
+    with create_session_with_logs()() as sess:
+        names, counts = load_year(sess, 2026)
+
+    assert names == ["Habit 0", "Habit 1"]
+    assert len(counts) == 2 * 365
+    assert counts[0] == 2
+    assert counts[364] == 1
+    assert counts[365 + 73] == 1
+    assert sum(counts) == 4
+
+
+def test_load_year_of_a_habit():
+    """
+    Test loading the daily counts of a single habit.
+    """
+
+    with create_session_with_logs()() as sess:
+        names, counts = load_year(sess, 2025, "Habit 1")
+
+    assert names == ["Habit 1"]
+    assert list(counts).index(1) == 364
+
+
+def test_show_calendar_runs_a_single_query():
+    """
+    Test that showing the calendar of every habit runs a single query.
+    """
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with create_session_with_logs(habits=20)() as sess:
+        engine = sess.get_bind()
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        show_calendar(sess, 2026)
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert len(statements) == 1
+
+
+def test_render_heatmap():
+    """
+    Test rendering a heatmap with a column per week and a row per weekday.
+    """
+
+    _, counts = load_year(create_session_with_logs()(), 2026, "Habit 0")
+
+    heatmap = render_heatmap("Habit 0", counts, 2026)
+    lines = "".join(segment.text for segment in heatmap.segments).splitlines()
+
+    assert lines[0] == "Habit 0"
+    assert lines[1].startswith("    Jan")
+    assert len(lines) == 9
+    # 2026 starts on a Thursday, so the first week has no Monday.
+    assert lines[2] == "Mon  " + "■" * 52
+    assert lines[5] == "    " + "■" * 53
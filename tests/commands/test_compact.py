@@ -0,0 +1,147 @@
+import datetime
+
+from click.testing import CliRunner
+from sqlalchemy import func, insert, select
+
+from ritmo.cli import cli
+from ritmo.commands.add_habit import add_habit
+from ritmo.commands.compact import compact_logs, compact_to_file
+from ritmo.commands.import_logs import import_logs
+from ritmo.models import HabitLog, HabitLogArchive
+from ritmo.service import get_day_logs
+from ritmo.sessions import create_memory_session
+from ritmo.sessions.sessions import create_session
+from ritmo.stats import check_rollups, get_stats
+from ritmo.stats.rollups import get_daily_counts
+
+FIRST_DAY = datetime.date(2023, 1, 1)
+
+HORIZON = datetime.date(2023, 1, 15)
+
+
+def add_logs(sess) -> None:
+    """
+    Add a habit completed a varying number of times on each day of January 2023, with
+    the original logs of each completion kept in the archive table as merged by the
+    upgrade to one log per day.
+    """
+
+    add_habit(sess, "Read", None, "numerical", datetime.datetime(2023, 1, 1), None)
+    rows = []
+    archived = []
+    for day in range(31):
+        date = FIRST_DAY + datetime.timedelta(day)
+        rows += [{"habit": "Read", "date": date.isoformat()}] * (day % 4)
+        archived += [
+            {
+                "habit_id": 1,
+                "date": date,
+                "completed": True,
+                "completed_at": date,
+                "count": 1,
+            }
+        ] * (day % 4)
+    import_logs(sess, rows)
+    sess.execute(insert(HabitLogArchive), archived)
+
+
+def get_reports(sess) -> dict:
+    return {
+        "day_logs": [
+            get_day_logs(sess, FIRST_DAY + datetime.timedelta(day)) for day in range(31)
+        ],
+        "daily_counts": get_daily_counts(sess),
+        "stats": get_stats(sess, datetime.date(2023, 1, 31)),
+    }
+
+
+def count_rows(sess, model) -> int:
+    return sess.execute(select(func.count()).select_from(model)).scalar()
+
+
+def test_compact_logs_removes_archived_logs_of_deleted_habits():
+    """
+    Test that compacting keeps the reports and removes the archived logs of habits that
+    no longer exist.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_logs(sess)
+        sess.execute(
+            insert(HabitLogArchive),
+            [
+                {
+                    "habit_id": 2,
+                    "date": FIRST_DAY,
+                    "completed": True,
+                    "completed_at": FIRST_DAY,
+                    "count": 1,
+                }
+            ],
+        )
+        reports = get_reports(sess)
+        archived = count_rows(sess, HabitLogArchive)
+
+        assert compact_logs(sess, HORIZON) == (0, 1)
+        sess.commit()
+
+        assert count_rows(sess, HabitLogArchive) == archived - 1
+        assert get_reports(sess) == reports
+        assert compact_logs(sess, HORIZON) == (0, 0)
+
+
+def test_compact_to_archive_file(tmp_path):
+    """
+    Test that the archived logs before the horizon are moved to a separate database file.
+    """
+
+    local_session = create_session(f"sqlite:///{tmp_path / 'ritmo.db'}")
+    with local_session() as sess:
+        add_logs(sess)
+        sess.commit()
+        reports = get_reports(sess)
+        logs = count_rows(sess, HabitLog)
+
+    engine = local_session.kw["bind"]
+    with engine.connect() as conn:
+        archived, removed = compact_to_file(conn, HORIZON, tmp_path / "archive.db")
+
+    # 14 days before the horizon, completed 0, 1, 2 and 3 times in turn.
+    assert (archived, removed) == (19, 0)
+
+    archive_session = create_session(f"sqlite:///{tmp_path / 'archive.db'}")
+    with local_session() as sess, archive_session() as archive_sess:
+        assert count_rows(archive_sess, HabitLogArchive) == archived
+        assert sess.scalar(select(func.min(HabitLogArchive.date))) == HORIZON
+        assert count_rows(sess, HabitLog) == logs
+        assert get_reports(sess) == reports
+        assert check_rollups(sess) == []
+
+
+def test_compact_cmd_requires_an_archive_file_for_a_horizon(tmp_path, monkeypatch):
+    """
+    Test that a horizon given without an archive file is rejected, as only the archive
+    has a history to move, and that compacting without one removes the archived logs
+    of deleted habits.
+    """
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("RITMO_NO_DAEMON", "1")
+
+    result = CliRunner().invoke(cli, ["compact", "--keep-days", "30"])
+    assert result.exit_code == 2
+    assert "--keep-days and --before require --archive-file" in result.output
+
+    result = CliRunner().invoke(cli, ["compact", "--no-vacuum"])
+    assert result.exit_code == 0
+    assert result.output == "Removed 0 archived logs of deleted habits.\n"
+
+    archive_path = tmp_path / "archive.db"
+    result = CliRunner().invoke(
+        cli,
+        ["compact", "--keep-days", "30", "--archive-file", str(archive_path)],
+    )
+    assert result.exit_code == 0
+    assert result.output.startswith("Moved 0 archived logs before ")
+    assert archive_path.exists()
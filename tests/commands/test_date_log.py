@@ -0,0 +1,84 @@
+import datetime
+
+from sqlalchemy import event
+
+from ritmo.commands.add_habit import add_habit
+from ritmo.commands.date_log import get_by_date
+from ritmo.commands.done_habit import mark_as_done
+from ritmo.sessions import create_memory_session
+
+
+def count_statements(sess, date: datetime.datetime) -> int:
+    """
+    Count the SQL statements emitted while building the report for a date.
+    """
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = sess.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        get_by_date(sess, date)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return len(statements)
+
+
+def test_get_by_date_shows_completed_habits(capsys):
+    """
+    Test showing the habit logs for today.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Boolean habit", None, None, None, None)
+        add_habit(sess, "Numerical habit", None, "numerical", None, None)
+        add_habit(sess, "Pending habit", None, None, None, None)
+
+        mark_as_done(sess, "Boolean habit")
+        mark_as_done(sess, "Numerical habit")
+        mark_as_done(sess, "Numerical habit")
+
+        get_by_date(sess, datetime.datetime.utcnow())
+
+        output = capsys.readouterr().out
+        assert "Yes" in output
+        assert "2 times" in output
+        assert "No" in output
+
+
+def test_get_by_date_without_habits(capsys):
+    """
+    Test showing the habit logs when there are no habits.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        get_by_date(sess, datetime.datetime.utcnow())
+
+        assert "No habits to show." in capsys.readouterr().out
+
+
+def test_get_by_date_query_count_does_not_grow_with_habits():
+    """
+    Test that the report for a date is built with a constant number of queries.
+    """
+
+    today_date = datetime.datetime.utcnow()
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Habit 0", None, None, None, None)
+        mark_as_done(sess, "Habit 0")
+        few_habits_statements = count_statements(sess, today_date)
+
+        for i in range(1, 50):
+            add_habit(sess, f"Habit {i}", None, "numerical", None, None)
+            mark_as_done(sess, f"Habit {i}")
+        many_habits_statements = count_statements(sess, today_date)
+
+        assert few_habits_statements == many_habits_statements
@@ -1,9 +1,9 @@
 import datetime
 
 from ritmo.commands.add_habit import add_habit
-from ritmo.commands.delete_habit import delete_habit
+from ritmo.commands.delete_habit import delete_habit, delete_habits
 from ritmo.commands.done_habit import mark_as_done
-from ritmo.models import Habit, HabitLog
+from ritmo.models import Habit, HabitDailyCount, HabitLog, HabitStats
 from ritmo.sessions import create_memory_session
 
 
@@ -60,3 +60,23 @@ def test_delete_habit_with_logs():
 
         habit_day = sess.query(HabitLog).filter(HabitLog.habit_id == habit_id).first()
         assert habit_day is None
+
+
+def test_delete_habits_by_name_and_pattern(capsys):
+    """
+    Test deleting several habits with their logs and rollups in one transaction.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        for name in ("Read book", "Read news", "Run"):
+            add_habit(sess, name, None, None, None, None)
+            mark_as_done(sess, name)
+
+        delete_habits(sess, ["Run", "Swim"], "Read *")
+
+        assert sess.query(Habit).count() == 0
+        for model in (HabitLog, HabitStats, HabitDailyCount):
+            assert sess.query(model).count() == 0
+
+    assert "Habit 'Swim' not found." in capsys.readouterr().out
@@ -1,7 +1,18 @@
+import datetime
+
+import click
+import pytest
+from sqlalchemy import event, func, select
+
 from ritmo.commands.add_habit import add_habit
-from ritmo.commands.done_habit import mark_as_done, mark_as_undone
+from ritmo.commands.done_habit import get_dates, mark_as_done, mark_as_undone
 from ritmo.models import Habit, HabitLog
+from ritmo.service import mark_many_as_done, mark_many_as_undone
 from ritmo.sessions import create_memory_session
+from ritmo.sessions.sessions import create_session
+from ritmo.stats import check_rollups
+
+DATES = [datetime.date(2026, 10, 16), datetime.date(2026, 10, 17)]
 
 
 def test_mark_habit_as_done():
@@ -63,5 +74,163 @@ def test_mark_numerical_habit_done_multiples_times():
         for i in range(times_done):
             mark_as_done(sess, "Test habit")
 
-        habit_logs = sess.query(HabitLog).filter(HabitLog.habit_id == habit.id).count()
-        assert habit_logs == times_done
+        habit_log = sess.query(HabitLog).filter(HabitLog.habit_id == habit.id).one()
+        assert habit_log.count == times_done
+
+
+def test_mark_many_habits_as_done():
+    """
+    Test marking several habits as done on several days at once.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Boolean habit", None, None, None, None)
+        add_habit(sess, "Numerical habit", None, "numerical", None, None)
+
+        results = mark_many_as_done(
+            sess, ["Boolean habit", "Numerical habit", "Missing habit"], DATES
+        )
+        assert results == {
+            "Boolean habit": 2,
+            "Numerical habit": 2,
+            "Missing habit": None,
+        }
+
+        results = mark_many_as_done(sess, ["Boolean habit", "Numerical habit"], DATES)
+        assert results == {"Boolean habit": 0, "Numerical habit": 2}
+
+        dates = sorted(
+            sess.scalars(
+                select(HabitLog.date)
+                .join(Habit, Habit.id == HabitLog.habit_id)
+                .where(Habit.name == "Boolean habit")
+            ).all()
+        )
+        assert dates == DATES
+        assert sess.query(HabitLog).count() == 4
+        assert sess.query(func.sum(HabitLog.count)).scalar() == 6
+        assert check_rollups(sess) == []
+
+
+def test_mark_many_habits_as_done_in_constant_statements():
+    """
+    Test that marking habits as done runs the same number of statements for any number of habits.
+    """
+
+    def count_statements(habits: int) -> int:
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        mem_session = create_memory_session()
+        with mem_session() as sess:
+            names = [f"Habit {i}" for i in range(habits)]
+            for name in names:
+                add_habit(sess, name, None, None, None, None)
+
+            engine = sess.get_bind()
+            event.listen(engine, "before_cursor_execute", before_cursor_execute)
+            mark_many_as_done(sess, names, DATES)
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+        return len(statements)
+
+    assert count_statements(2) == count_statements(40)
+
+
+def test_boolean_habit_done_meanwhile_by_another_process(tmp_path):
+    """
+    Test that a boolean habit done by another connection between the lookup of the
+    habit and the first write is not done twice.
+    """
+
+    local_session = create_session(f"sqlite:///{tmp_path / 'ritmo.db'}")
+    with local_session() as sess:
+        add_habit(sess, "Boolean habit", None, None, None, None)
+
+    engine = local_session.kw["bind"]
+    other_writes = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.startswith("INSERT") and not other_writes:
+            other_writes.append(statement)
+            with local_session() as other_sess:
+                assert mark_many_as_done(other_sess, ["Boolean habit"], DATES[:1]) == {
+                    "Boolean habit": 1
+                }
+
+    with local_session() as sess:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            results = mark_many_as_done(sess, ["Boolean habit"], DATES[:1])
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert results == {"Boolean habit": 0}
+    with local_session() as sess:
+        assert sess.query(func.sum(HabitLog.count)).scalar() == 1
+        assert check_rollups(sess) == []
+
+
+def test_mark_many_habits_as_undone():
+    """
+    Test marking several habits as undone on a single day.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Boolean habit", None, None, None, None)
+        add_habit(sess, "Numerical habit", None, "numerical", None, None)
+        names = ["Boolean habit", "Numerical habit"]
+        mark_many_as_done(sess, names, DATES)
+        mark_many_as_done(sess, ["Numerical habit"], DATES)
+
+        results = mark_many_as_undone(sess, [*names, "Missing habit"], DATES[:1])
+        assert results == {
+            "Boolean habit": 1,
+            "Numerical habit": 1,
+            "Missing habit": None,
+        }
+
+        remaining = sess.execute(select(HabitLog.date, HabitLog.count)).all()
+        assert sorted(remaining) == [(DATES[0], 1), (DATES[1], 1), (DATES[1], 2)]
+        assert check_rollups(sess) == []
+
+
+def test_undo_removes_several_completions_of_a_day():
+    """
+    Test undoing several completions at once without touching the other days.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Numerical habit", None, "numerical", None, None)
+        for _ in range(3):
+            mark_many_as_done(sess, ["Numerical habit"], DATES)
+
+        results = mark_many_as_undone(sess, ["Numerical habit"], DATES[:1], times=2)
+        assert results == {"Numerical habit": 2}
+
+        results = mark_many_as_undone(sess, ["Numerical habit"], DATES, times=2)
+        assert results == {"Numerical habit": 3}
+
+        remaining = sess.execute(select(HabitLog.date, HabitLog.count)).all()
+        assert remaining == [(DATES[1], 1)]
+        assert check_rollups(sess) == []
+
+
+def test_get_dates_of_a_range():
+    """
+    Test that a date range gives each of its days and must not be reversed.
+    """
+
+    first_day, last_day = (
+        datetime.datetime.combine(date, datetime.time()) for date in DATES
+    )
+    assert get_dates(None, (first_day, last_day)) == DATES
+    assert get_dates(None, (first_day, first_day)) == DATES[:1]
+
+    with pytest.raises(click.BadParameter):
+        get_dates(None, (last_day, first_day))
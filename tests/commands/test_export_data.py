@@ -0,0 +1,86 @@
+import csv
+import datetime
+import json
+
+import pytest
+
+from ritmo.commands.add_habit import add_habit
+from ritmo.commands.export_data import export_data, select_habits, select_logs
+from ritmo.commands.import_logs import import_logs
+from ritmo.sessions import create_memory_session
+
+LOGS = [
+    {"habit": "Read", "date": "2023-01-01"},
+    {"habit": "Read", "date": "2023-01-02"},
+    {"habit": "Run", "date": "2023-01-02"},
+    {"habit": "Read", "date": "2023-01-03"},
+]
+
+
+def create_session_with_logs():
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Read", "Read a book", None, None, None)
+        add_habit(sess, "Run", None, None, None, None)
+        import_logs(sess, LOGS)
+
+    return mem_session
+
+
+def test_export_logs_to_csv(tmp_path):
+    """
+    Test exporting every habit log to a CSV file.
+    """
+
+    output = tmp_path / "logs.csv"
+
+    with create_session_with_logs()() as sess:
+        exported = export_data(
+            sess, str(output), select_logs([], None, None), "csv", batch_size=3
+        )
+
+    assert exported == 4
+    with open(output, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [(row["habit"], row["date"]) for row in rows] == [
+        (log["habit"], log["date"]) for log in LOGS
+    ]
+
+
+def test_export_logs_with_filters_to_ndjson(tmp_path):
+    """
+    Test exporting the habit logs of a habit within a date range to a JSON Lines file.
+    """
+
+    output = tmp_path / "logs.ndjson"
+    stmt = select_logs(["Read"], datetime.date(2023, 1, 2), datetime.date(2023, 1, 3))
+
+    with create_session_with_logs()() as sess:
+        exported = export_data(sess, str(output), stmt, "ndjson")
+
+    assert exported == 2
+    with open(output) as file:
+        rows = [json.loads(line) for line in file]
+    assert [(row["habit"], row["date"]) for row in rows] == [
+        ("Read", "2023-01-02"),
+        ("Read", "2023-01-03"),
+    ]
+
+
+def test_export_habits_to_parquet(tmp_path):
+    """
+    Test exporting habits to a Parquet file.
+    """
+
+    parquet = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "habits.parquet"
+
+    with create_session_with_logs()() as sess:
+        exported = export_data(
+            sess, str(output), select_habits([]), "parquet", batch_size=1
+        )
+
+    assert exported == 2
+    table = parquet.read_table(output)
+    assert table.column("name").to_pylist() == ["Read", "Run"]
+    assert table.column("description").to_pylist() == ["Read a book", None]
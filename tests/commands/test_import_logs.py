@@ -0,0 +1,135 @@
+import datetime
+import io
+
+from ritmo.commands.add_habit import add_habit
+from ritmo.commands.import_logs import import_logs, read_rows
+from ritmo.models import Habit, HabitLog
+from ritmo.sessions import create_memory_session
+from ritmo.stats import check_rollups
+
+
+def test_import_logs_from_csv():
+    """
+    Test importing habit logs from a CSV file.
+    """
+
+    file = io.StringIO(
+        "habit,date\n"
+        "Test habit,2023-01-01\n"
+        "Test habit,2023-01-02\n"
+        "Other habit,2023-01-02\n"
+    )
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Test habit", None, None, None, None)
+        add_habit(sess, "Other habit", None, None, None, None)
+
+        imported, skipped = import_logs(sess, read_rows(file, "csv"))
+        assert (imported, skipped) == (3, 0)
+
+        habit = sess.query(Habit).filter(Habit.name == "Test habit").first()
+        dates = [log.date for log in habit.habit_logs]
+        assert dates == [datetime.date(2023, 1, 1), datetime.date(2023, 1, 2)]
+
+
+def test_import_logs_from_ndjson_in_batches():
+    """
+    Test importing more habit logs than fit in a single batch from a JSON Lines file.
+    """
+
+    file = io.StringIO(
+        "".join(
+            f'{{"habit": "Test habit", "date": "2023-01-{day:02}"}}\n'
+            for day in range(1, 32)
+        )
+    )
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Test habit", None, "numerical", None, None)
+
+        imported, skipped = import_logs(sess, read_rows(file, "ndjson"), batch_size=4)
+        assert (imported, skipped) == (31, 0)
+        assert sess.query(HabitLog).count() == 31
+
+
+def test_import_logs_skips_invalid_rows():
+    """
+    Test that rows for unknown habits or with invalid dates are skipped.
+    """
+
+    rows = [
+        {"habit": "Test habit", "date": "2023-01-01"},
+        {"habit": "Unknown habit", "date": "2023-01-01"},
+        {"habit": "Test habit", "date": "yesterday"},
+        {"habit": "Test habit"},
+    ]
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Test habit", None, None, None, None)
+
+        imported, skipped = import_logs(sess, rows)
+        assert (imported, skipped) == (1, 3)
+        assert sess.query(HabitLog).count() == 1
+
+
+def test_import_logs_skips_malformed_rows():
+    """
+    Test that malformed lines, rows that are not objects and counts that are not
+    positive integers are skipped instead of failing the import.
+    """
+
+    file = io.StringIO(
+        '{"habit": "Test habit", "date": "2023-01-01"}\n'
+        '{"habit": "Test habit", "date": "2023-01-02", "count": null}\n'
+        '{"habit": "Test habit", "date": "2023-01-03", "count": "2"}\n'
+        '{"habit": "Test habit", "date": "2023-01-04", "count": 0}\n'
+        '{"habit": "Test habit", "date": "2023-01-04", "count": 2.5}\n'
+        '{"habit": "Test habit", "date": "2023-01-04", "count": true}\n'
+        '{"habit": ["Test habit"], "date": "2023-01-04"}\n'
+        "[1, 2]\n"
+        '{"habit": "Test habit",\n'
+    )
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Test habit", None, "numerical", None, None)
+
+        imported, skipped = import_logs(sess, read_rows(file, "ndjson"))
+        assert (imported, skipped) == (3, 6)
+
+        counts = {log.date.day: log.count for log in sess.query(HabitLog)}
+        assert counts == {1: 1, 2: 1, 3: 2}
+
+
+def test_import_logs_done_boolean_habits_once_a_day():
+    """
+    Test that boolean habits are done at most once per day, across rows and imports,
+    while the completions of numerical habits add up.
+    """
+
+    content = (
+        "habit,date,count\n"
+        "Test habit,2023-01-01,1\n"
+        "Test habit,2023-01-01,1\n"
+        "Test habit,2023-01-02,3\n"
+        "Numerical habit,2023-01-01,2\n"
+    )
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Test habit", None, None, None, None)
+        add_habit(sess, "Numerical habit", None, "numerical", None, None)
+
+        for _ in range(2):
+            import_logs(sess, read_rows(io.StringIO(content), "csv"), batch_size=2)
+
+        counts = {(log.habit.name, log.date): log.count for log in sess.query(HabitLog)}
+        assert counts == {
+            ("Test habit", datetime.date(2023, 1, 1)): 1,
+            ("Test habit", datetime.date(2023, 1, 2)): 1,
+            ("Numerical habit", datetime.date(2023, 1, 1)): 4,
+        }
+        assert check_rollups(sess) == []
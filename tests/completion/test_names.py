@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+from ritmo.commands.add_habit import add_habit
+from ritmo.completion import (
+    complete,
+    load_names,
+    match_names,
+    read_name_index,
+    write_name_index,
+)
+from ritmo.completion.refresh import refresh_name_index
+from ritmo.sessions import create_memory_session, dispose_engines
+from ritmo.sessions.sessions import create_session
+
+NAMES = ["Meditate", "Read", "Run", "Water", "read-news"]
+
+
+def test_names_are_matched_by_prefix_then_fuzzily():
+    """
+    Test that prefixes are matched exactly first, then ignoring case and as substrings
+    or subsequences of the names.
+    """
+
+    assert match_names(NAMES, "") == NAMES
+    assert match_names(NAMES, "R") == ["Read", "Run"]
+    assert match_names(NAMES, "Rea") == ["Read"]
+    assert match_names(NAMES, "re") == ["read-news"]
+    assert match_names(NAMES, "RE") == ["Read", "read-news"]
+    assert match_names(NAMES, "at") == ["Meditate", "Water"]
+    assert match_names(NAMES, "mdt") == ["Meditate"]
+    assert match_names(NAMES, "xyz") == []
+
+
+def test_name_index_is_refreshed_from_the_database(tmp_path):
+    """
+    Test that refreshing the index writes the sorted names of every habit.
+    """
+
+    path = str(tmp_path / "names.idx")
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        for name in ("Water", "Read", "Run"):
+            add_habit(sess, name, None, None, None, None)
+        refresh_name_index(sess, path)
+
+    assert read_name_index(path) == ["Read", "Run", "Water"]
+
+
+def test_stale_name_index_is_rebuilt(tmp_path):
+    """
+    Test that an index older than the database is rebuilt from it, and a newer one is
+    read as is.
+    """
+
+    index_path = str(tmp_path / "names.idx")
+    db_path = str(tmp_path / "ritmo.db")
+    session = create_session(f"sqlite:///{db_path}")
+    with session() as sess:
+        add_habit(sess, "Read", None, None, None, None)
+    dispose_engines()
+
+    assert load_names(index_path, db_path) == ["Read"]
+    assert read_name_index(index_path) == ["Read"]
+
+    write_name_index(index_path, ["Read", "Run"])
+    assert load_names(index_path, db_path) == ["Read", "Run"]
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO habits (name, type, start_date) VALUES ('Water', 'boolean', '2024-01-01')"
+    )
+    conn.commit()
+    conn.close()
+    os.utime(index_path, ns=(0, 0))
+
+    assert load_names(index_path, db_path) == ["Read", "Water"]
+
+
+def test_completion_serves_habit_names(tmp_path, monkeypatch, capsys):
+    """
+    Test that the habit names of done, undo, delete and update are completed from the
+    index, and options are left to the CLI.
+    """
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    write_name_index(str(tmp_path / ".ritmo" / "names.idx"), NAMES)
+
+    def run(instruction, words, cword):
+        monkeypatch.setenv("_RITMO_COMPLETE", instruction)
+        monkeypatch.setenv("COMP_WORDS", words)
+        monkeypatch.setenv("COMP_CWORD", cword)
+        return complete(), capsys.readouterr().out
+
+    assert run("bash_complete", "ritmo done R", "2") == (0, "plain,Read\nplain,Run\n")
+    assert run("bash_complete", "ritmo delete Read ", "3") == (
+        0,
+        "".join(f"plain,{name}\n" for name in NAMES),
+    )
+    assert run("zsh_complete", "ritmo undo mdt", "2") == (0, "plain\nMeditate\n_\n")
+    assert run("fish_complete", "ritmo update Wa", "Wa") == (0, "plain,Water\n")
+    assert run("bash_complete", "ritmo update Read R", "3") == (None, "")
+    assert run("bash_complete", "ritmo done --date ", "3") == (None, "")
+    assert run("bash_complete", "ritmo done 'R", "2") == (None, "")
+    assert run("bash_complete", "ritmo list ", "2") == (None, "")
+    assert run("bash_source", "", "") == (None, "")
+
+
+def test_completion_does_not_import_the_cli(tmp_path):
+    """
+    Test that completing a habit name imports neither click, SQLAlchemy nor Rich.
+    """
+
+    write_name_index(str(tmp_path / ".ritmo" / "names.idx"), NAMES)
+    code = (
+        "import sys; from ritmo.main import run_fast_path;"
+        "assert run_fast_path(['done']) == 0;"
+        "print(sorted(m for m in sys.modules"
+        " if m.startswith(('click', 'sqlalchemy', 'rich'))))"
+    )
+    env = {
+        **os.environ,
+        "HOME": str(tmp_path),
+        "_RITMO_COMPLETE": "bash_complete",
+        "COMP_WORDS": "ritmo done Wa",
+        "COMP_CWORD": "2",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.splitlines() == ["plain,Water", "[]"]
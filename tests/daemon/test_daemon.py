@@ -0,0 +1,110 @@
+import socket
+import threading
+
+import pytest
+
+from ritmo.daemon import client, forward
+from ritmo.daemon.server import CommandHandler, create_server, run_command
+from ritmo.sessions import dispose_engines
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch):
+    """
+    Run a daemon for a database in a temporary home directory.
+    """
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / ".ritmo").mkdir()
+    path = tmp_path / ".ritmo" / "ritmo.sock"
+
+    server = create_server(path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield path
+
+    server.shutdown()
+    thread.join()
+    server.server_close()
+    dispose_engines()
+
+
+def test_forward_runs_commands_in_the_daemon(socket_path, capsys):
+    """
+    Test forwarding commands to the daemon and printing their output.
+    """
+
+    assert forward(["add", "Test habit"], socket_path) == 0
+    assert forward(["done", "Test habit", "Missing habit"], socket_path) == 0
+
+    output = capsys.readouterr().out
+    assert "Habit 'Test habit' marked as done 1 time." in output
+    assert "Habit 'Missing habit' not found." in output
+
+
+def test_forward_returns_the_exit_code(socket_path, capsys):
+    """
+    Test that usage errors are reported with their exit code and to the standard error.
+    """
+
+    assert forward(["done"], socket_path) == 2
+    assert "Missing argument" in capsys.readouterr().err
+
+
+def test_forward_falls_back_without_daemon(tmp_path):
+    """
+    Test that commands run locally when the daemon is not running or not supported.
+    """
+
+    assert forward(["done", "Test habit"], tmp_path / "ritmo.sock") is None
+    assert forward(["export", "-"], tmp_path / "ritmo.sock") is None
+
+
+def test_forward_falls_back_when_the_daemon_does_not_answer(tmp_path, monkeypatch):
+    """
+    Test that commands run locally when the daemon closes the connection or does not
+    answer in time.
+    """
+
+    monkeypatch.setattr(client, "TIMEOUT", 0.1)
+    path = tmp_path / "ritmo.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen()
+
+        def close_connection():
+            connection, _ = server.accept()
+            connection.recv(4096)
+            connection.close()
+
+        thread = threading.Thread(target=close_connection)
+        thread.start()
+        assert forward(["done", "Test habit"], path) is None
+        thread.join()
+
+        assert forward(["done", "Test habit"], path) is None
+
+
+def test_daemon_is_not_blocked_by_an_idle_client(socket_path, monkeypatch, capsys):
+    """
+    Test that a client that never sends its request does not block the others.
+    """
+
+    monkeypatch.setattr(CommandHandler, "timeout", 0.1)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle_client:
+        idle_client.connect(str(socket_path))
+
+        assert forward(["add", "Test habit"], socket_path) == 0
+        assert forward(["done", "Test habit"], socket_path) == 0
+        assert "marked as done" in capsys.readouterr().out
+
+
+def test_daemon_rejects_unsupported_commands():
+    """
+    Test that the daemon only runs the commands it supports.
+    """
+
+    response = run_command(["serve"])
+
+    assert response["exit_code"] == 2
+    assert "not supported" in response["stderr"]
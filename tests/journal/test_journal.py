@@ -0,0 +1,133 @@
+import datetime
+import os
+
+import pytest
+from sqlalchemy import select
+
+from ritmo.commands.add_habit import add_habit
+from ritmo.journal import JournalEntry, append_done, append_entries, read_entries
+from ritmo.journal.merge import merge_journal
+from ritmo.models import HabitLog, JournalRecord
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+from ritmo.stats import check_rollups
+
+DATE = datetime.date(2024, 1, 2)
+
+
+@pytest.fixture
+def session(tmp_path):
+    local_session = create_session(f"sqlite:///{tmp_path / 'ritmo.db'}")
+    with local_session() as sess:
+        add_habit(sess, "Read", None, None, None, None)
+        add_habit(sess, "Water", None, "numerical", None, None)
+
+    yield local_session
+    dispose_engines()
+
+
+def read_journal(path) -> list[JournalEntry]:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return read_entries(fd)
+    finally:
+        os.close(fd)
+
+
+def get_logs(local_session) -> list[tuple]:
+    with local_session() as sess:
+        assert check_rollups(sess) == []
+        return sess.execute(
+            select(HabitLog.habit_id, HabitLog.date, HabitLog.count).order_by(
+                HabitLog.habit_id
+            )
+        ).all()
+
+
+def test_truncated_and_corrupted_entries_are_skipped(tmp_path):
+    """
+    Test that entries cut short by a crash or corrupted are not read back.
+    """
+
+    path = tmp_path / "ritmo.journal"
+    entries = [JournalEntry(f"{i:016x}", DATE, DATE, "Read") for i in range(3)]
+    append_entries(entries, path)
+
+    data = path.read_bytes().replace(b" Read\n", b" Reed\n", 1)
+    path.write_bytes(data + b"0000000000000003 2024-01-02 2024")
+
+    assert read_journal(path) == entries[1:]
+
+
+def test_only_plain_done_commands_are_journaled(tmp_path, monkeypatch):
+    """
+    Test that done is journaled when enabled, and other options run the full command.
+    """
+
+    path = tmp_path / "ritmo.journal"
+    assert append_done(["done", "Read"], path) is None
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("RITMO_JOURNAL", "1")
+    assert append_done(["done", "Read", "--date-range", "2024-01-01"], path) is None
+    assert append_done(["done", "--help"], path) is None
+    assert append_done(["undo", "Read"], path) is None
+    assert (
+        append_done(["done", "Read", "Water", "Read", "--date", "2024-01-02"], path)
+        == 0
+    )
+
+    entries = read_journal(path)
+    assert [(entry.name, entry.date) for entry in entries] == [
+        ("Read", DATE),
+        ("Water", DATE),
+    ]
+    assert len({entry.id for entry in entries}) == 2
+
+
+def test_journal_is_merged_once(tmp_path, session, capsys):
+    """
+    Test that journaled completions are merged like done and the journal is removed.
+    """
+
+    path = tmp_path / "ritmo.journal"
+    append_entries(
+        [
+            JournalEntry(f"{i:016x}", DATE, DATE, name)
+            for i, name in enumerate(["Read", "Read", "Water", "Water", "Run"])
+        ],
+        path,
+    )
+
+    results = merge_journal(session, path)
+    assert results == {"Read": 1, "Water": 2, "Run": None}
+    assert "Habit 'Run' not found" in capsys.readouterr().err
+    assert get_logs(session) == [(1, DATE, 1), (2, DATE, 2)]
+
+    assert not path.exists()
+    assert merge_journal(session, path) == {}
+    with session() as sess:
+        assert sess.scalars(select(JournalRecord.id)).all() == []
+
+
+def test_interrupted_merge_is_replayed_without_duplicates(
+    tmp_path, session, monkeypatch
+):
+    """
+    Test that a journal merged before a crash is not added twice on the next merge.
+    """
+
+    path = tmp_path / "ritmo.journal"
+    append_entries([JournalEntry("0" * 16, DATE, DATE, "Water")], path)
+
+    def crash(path):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "unlink", crash)
+        with pytest.raises(KeyboardInterrupt):
+            merge_journal(session, path)
+
+    append_entries([JournalEntry("1" * 16, DATE, DATE, "Water")], path)
+    assert merge_journal(session, path) == {"Water": 1}
+    assert get_logs(session) == [(2, DATE, 2)]
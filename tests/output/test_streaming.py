@@ -0,0 +1,81 @@
+import datetime
+import json
+import subprocess
+import sys
+
+from ritmo.output import echo_rows
+
+ROWS = [
+    ("Read", "Twenty\tpages", datetime.date(2026, 1, 1)),
+    ("Run", None, datetime.date(2026, 1, 2)),
+]
+FIELDS = ["name", "description", "start_date"]
+
+
+def test_echo_rows_as_tsv(capsys):
+    """
+    Test printing rows as tab separated values with a header.
+    """
+
+    assert echo_rows(ROWS, FIELDS, "tsv") == 2
+    assert capsys.readouterr().out.splitlines() == [
+        "name\tdescription\tstart_date",
+        "Read\tTwenty pages\t2026-01-01",
+        "Run\t\t2026-01-02",
+    ]
+
+
+def test_echo_rows_as_json(capsys):
+    """
+    Test printing rows as one JSON object per line.
+    """
+
+    assert echo_rows(ROWS, FIELDS, "json") == 2
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"name": "Read", "description": "Twenty\tpages", "start_date": "2026-01-01"},
+        {"name": "Run", "description": None, "start_date": "2026-01-02"},
+    ]
+
+
+def test_echo_rows_as_table_in_chunks(capsys):
+    """
+    Test that tables printed in chunks show the header once and keep every row.
+    """
+
+    rows = [(f"Habit {i:02}", None, datetime.date(2026, 1, 1)) for i in range(25)]
+
+    assert echo_rows(rows, FIELDS, "table", title="Habits", chunk_size=10) == 25
+    output = capsys.readouterr().out
+    assert output.count("Habits") == 1
+    assert output.count("start_date") == 1
+    assert all(f"Habit {i:02} " in output for i in range(25))
+
+
+def test_echo_rows_without_rows(capsys):
+    """
+    Test that tables without rows print nothing and other formats print their header.
+    """
+
+    assert echo_rows([], FIELDS, "table") == 0
+    assert capsys.readouterr().out == ""
+
+    assert echo_rows([], FIELDS, "tsv") == 0
+    assert capsys.readouterr().out == "name\tdescription\tstart_date\n"
+
+
+def test_machine_readable_formats_do_not_import_rich():
+    """
+    Test that printing rows as TSV or JSON does not import Rich.
+    """
+
+    code = (
+        "import sys; from ritmo.output import echo_rows;"
+        "echo_rows([(1,)], ['id'], 'tsv'); echo_rows([(1,)], ['id'], 'json');"
+        "print('rich' in sys.modules, file=sys.stderr)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stderr.strip() == "False"
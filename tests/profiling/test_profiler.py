@@ -0,0 +1,72 @@
+import json
+
+from click.testing import CliRunner
+from sqlalchemy import select
+
+from ritmo.cli import cli
+from ritmo.models import Habit
+from ritmo.profiling import Profiler, get_profiler, phase
+from ritmo.service import create_habit
+from ritmo.sessions import dispose_engines
+from ritmo.sessions.sessions import create_session
+
+
+def test_phase_is_ignored_without_profiler():
+    """
+    Test that phases run without being timed when no command is profiled.
+    """
+
+    assert get_profiler() is None
+    with phase("render"):
+        pass
+
+
+def test_profiler_traces_statements_and_phases(tmp_path):
+    """
+    Test that the profiler records every statement with the rows it returned or changed.
+    """
+
+    profiler = Profiler()
+    profiler.start()
+    try:
+        local_session = create_session(f"sqlite:///{tmp_path / 'ritmo.db'}")
+        with local_session() as sess:
+            create_habit(sess, "Read")
+            create_habit(sess, "Run")
+
+        with local_session() as sess, phase("render"):
+            assert len(sess.scalars(select(Habit.name)).all()) == 2
+    finally:
+        profiler.stop()
+        dispose_engines()
+
+    assert get_profiler() is None
+    assert {"engine", "migrate", "render", "other"} <= profiler.to_dict()[
+        "phases_ms"
+    ].keys()
+
+    traces = [
+        (trace.statement.split()[0], trace.rows)
+        for trace in profiler.statements
+        if "habits" in trace.statement and "sqlite_master" not in trace.statement
+    ]
+    assert ("INSERT", 1) in traces
+    assert traces[-1] == ("SELECT", 2)
+
+
+def test_cli_prints_json_trace(tmp_path, monkeypatch):
+    """
+    Test that RITMO_TRACE=json prints the profile of a command to the standard error.
+    """
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("RITMO_TRACE", "json")
+
+    result = CliRunner().invoke(cli, ["list", "--format", "tsv"])
+    dispose_engines()
+
+    assert result.exit_code == 0
+    assert result.stdout.startswith("name\t")
+    trace = json.loads(result.stderr)
+    assert trace["phases_ms"]["import"] >= 0
+    assert trace["sql"]["statements"] == len(trace["statements"]) > 0
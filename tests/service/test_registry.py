@@ -0,0 +1,117 @@
+from sqlalchemy import delete, update
+
+from ritmo.models import Habit
+from ritmo.service import (
+    create_habit,
+    get_registry,
+    mark_many_as_done,
+    modify_habit,
+    remove_habit,
+)
+from ritmo.sessions import create_memory_session
+
+
+def test_registry_caches_lookups():
+    """
+    Test that habits are looked up once and counted as hits afterwards.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        create_habit(sess, "Test habit", type="numerical")
+        registry = get_registry(sess.get_bind())
+        registry.hits = registry.misses = 0
+
+        record = registry.get(sess, "Test habit")
+        assert record.type == "numerical"
+        assert registry.get(sess, "Test habit") is record
+        assert registry.get(sess, "Missing habit") is None
+        assert registry.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+        mark_many_as_done(sess, ["Test habit"], [record.start_date])
+        assert registry.stats()["hits"] == 2
+
+
+def test_registry_is_invalidated_by_changes():
+    """
+    Test that adding, updating, renaming and deleting habits invalidates their records.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        registry = get_registry(sess.get_bind())
+        assert registry.get(sess, "Test habit") is None
+
+        create_habit(sess, "Test habit")
+        assert registry.get(sess, "Test habit").type == "boolean"
+
+        modify_habit(sess, "Test habit", type="numerical")
+        assert registry.get(sess, "Test habit").type == "numerical"
+
+        modify_habit(sess, "Test habit", new_name="New habit")
+        assert registry.get(sess, "Test habit") is None
+        assert registry.get(sess, "New habit") is not None
+
+        remove_habit(sess, "New habit")
+        assert registry.get(sess, "New habit") is None
+        assert registry.stats()["size"] == 0
+
+
+def test_registries_are_kept_per_database():
+    """
+    Test that each database gets a registry of its own.
+    """
+
+    first_session, second_session = create_memory_session(), create_memory_session()
+    with first_session() as first_sess, second_session() as second_sess:
+        create_habit(first_sess, "Test habit")
+
+        assert get_registry(first_sess.get_bind()).get(first_sess, "Test habit")
+        assert (
+            get_registry(second_sess.get_bind()).get(second_sess, "Test habit") is None
+        )
+
+
+def test_registry_is_dropped_when_habits_change_elsewhere():
+    """
+    Test that habits changed without going through the queries, like by another
+    process, are not served from the cache.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        create_habit(sess, "Test habit")
+        registry = get_registry(sess.get_bind())
+        assert registry.get(sess, "Test habit").type == "boolean"
+
+        sess.execute(update(Habit).values(type="numerical"))
+        assert registry.get(sess, "Test habit").type == "numerical"
+
+        sess.execute(delete(Habit))
+        assert registry.get(sess, "Test habit") is None
+
+
+def test_registry_keeps_other_records_after_its_own_changes():
+    """
+    Test that changing habits through the queries only drops their records, while a
+    change made elsewhere in between drops the whole cache.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        for name in ("Read", "Run", "Walk"):
+            create_habit(sess, name)
+        registry = get_registry(sess.get_bind())
+        registry.get_many(sess, ["Read", "Run", "Walk"])
+
+        modify_habit(sess, "Read", type="numerical")
+        modify_habit(sess, "Read", type="numerical")
+        remove_habit(sess, "Walk")
+        assert set(registry.records) == {"Run"}
+
+        assert registry.get(sess, "Read").type == "numerical"
+        assert set(registry.records) == {"Read", "Run"}
+
+        sess.execute(update(Habit).where(Habit.name == "Run").values(type="numerical"))
+        modify_habit(sess, "Read", type="boolean")
+        assert registry.get(sess, "Run").type == "numerical"
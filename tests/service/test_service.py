@@ -0,0 +1,162 @@
+import asyncio
+import datetime
+
+import pytest
+
+from ritmo.service import (
+    HabitNotFoundError,
+    HabitService,
+    ServiceError,
+    create_habit,
+    get_day_logs,
+    get_habits,
+    modify_habit,
+    remove_habit,
+    remove_habits,
+)
+from ritmo.sessions import create_memory_session
+from ritmo.stats import check_rollups
+
+
+def test_queries_return_plain_data():
+    """
+    Test that the queries return plain rows instead of printing.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        assert create_habit(sess, "Test habit") is True
+        assert create_habit(sess, "Test habit") is False
+
+        habits = get_habits(sess)
+        assert [habit.name for habit in habits] == ["Test habit"]
+        assert habits[0].type == "boolean"
+
+        today = datetime.datetime.utcnow().date()
+        assert get_day_logs(sess, today) == [("Test habit", "boolean", 0)]
+
+        assert remove_habit(sess, "Test habit") is True
+        assert remove_habit(sess, "Test habit") is False
+
+
+def test_remove_habits_by_name_and_pattern():
+    """
+    Test that habits are deleted by name and by glob pattern at once.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        for name in ("read-book", "read-news", "run", "swim", "walk"):
+            create_habit(sess, name)
+
+        deleted = remove_habits(sess, ["swim", "missing"], "read-*")
+        assert sorted(deleted) == ["read-book", "read-news", "swim"]
+        assert [habit.name for habit in get_habits(sess)] == ["run", "walk"]
+
+        assert remove_habits(sess) == []
+        assert remove_habits(sess, pattern="x*") == []
+
+
+def test_queries_raise_service_errors():
+    """
+    Test that invalid requests raise errors with a message for the user.
+    """
+
+    today = datetime.datetime.utcnow().date()
+    yesterday = today - datetime.timedelta(days=1)
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        with pytest.raises(ServiceError, match="name must be specified"):
+            create_habit(sess, " ")
+
+        with pytest.raises(ServiceError, match="End date must be after start date"):
+            create_habit(sess, "Test habit", start_date=today, end_date=yesterday)
+
+        with pytest.raises(HabitNotFoundError):
+            modify_habit(sess, "Missing habit", new_name="Test habit")
+
+
+def test_service_handles_concurrent_clients(tmp_path):
+    """
+    Test marking habits as done from many concurrent clients against one database.
+    """
+
+    pytest.importorskip("aiosqlite")
+
+    async def run_clients() -> list[dict]:
+        service = await HabitService.connect(
+            f"sqlite+aiosqlite:///{tmp_path / 'ritmo.db'}"
+        )
+        try:
+            await service.add_habit("Boolean habit")
+            await service.add_habit("Numerical habit", type="numerical")
+            await asyncio.gather(
+                *(
+                    service.mark_done(["Boolean habit", "Numerical habit"])
+                    for _ in range(20)
+                )
+            )
+            assert await service.read(check_rollups) == []
+            return await service.get_day_logs()
+        finally:
+            await service.close()
+
+    assert asyncio.run(run_clients()) == [
+        ("Boolean habit", "boolean", 1),
+        ("Numerical habit", "numerical", 20),
+    ]
+
+
+def test_service_raises_service_errors(tmp_path):
+    """
+    Test that the service raises the errors of the queries.
+    """
+
+    pytest.importorskip("aiosqlite")
+
+    async def update_missing_habit():
+        service = await HabitService.connect(
+            f"sqlite+aiosqlite:///{tmp_path / 'ritmo.db'}"
+        )
+        try:
+            await service.update_habit("Missing habit", new_name="Test habit")
+        finally:
+            await service.close()
+
+    with pytest.raises(HabitNotFoundError):
+        asyncio.run(update_missing_habit())
+
+
+def test_get_habits_sorts_and_paginates_in_the_database():
+    """
+    Test sorting, filtering and paginating habits.
+    """
+
+    today = datetime.datetime.utcnow().date()
+    days = [today + datetime.timedelta(days=offset) for offset in range(4)]
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        create_habit(sess, "Walk", start_date=days[2])
+        create_habit(sess, "Read", start_date=days[0], end_date=days[3])
+        create_habit(sess, "Run", start_date=days[1], end_date=days[2])
+        create_habit(sess, "100% run", start_date=days[0])
+
+        def names(**kwargs) -> list[str]:
+            return [habit.name for habit in get_habits(sess, **kwargs)]
+
+        assert names() == ["100% run", "Read", "Run", "Walk"]
+        assert names(reverse=True) == ["Walk", "Run", "Read", "100% run"]
+        assert names(sort_by="start-date") == ["Read", "100% run", "Run", "Walk"]
+        assert names(sort_by="end-date") == ["Run", "Read", "Walk", "100% run"]
+        assert names(sort_by="end-date", reverse=True) == [
+            "Walk",
+            "100% run",
+            "Read",
+            "Run",
+        ]
+        assert names(limit=2, offset=1) == ["Read", "Run"]
+        assert names(offset=3) == ["Walk"]
+        assert names(name_filter="RUN") == ["100% run", "Run"]
+        assert names(name_filter="%") == ["100% run"]
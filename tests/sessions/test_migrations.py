@@ -0,0 +1,195 @@
+import datetime
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event, insert, inspect, select
+from sqlalchemy.exc import IntegrityError
+
+from ritmo.models import Habit, HabitLog, HabitLogArchive, HabitStats
+from ritmo.sessions import (
+    SCHEMA_VERSION,
+    create_memory_session,
+    dispose_engines,
+    migrate,
+)
+from ritmo.sessions.sessions import create_session
+
+# Schema created by ritmo before schema versioning was introduced.
+UNVERSIONED_SCHEMA = """
+CREATE TABLE habits (
+    id INTEGER NOT NULL PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    description VARCHAR,
+    type VARCHAR NOT NULL CHECK (type='boolean' OR type='numerical'),
+    start_date DATE NOT NULL,
+    end_date DATE
+);
+CREATE TABLE habit_logs (
+    id INTEGER NOT NULL PRIMARY KEY,
+    habit_id INTEGER NOT NULL REFERENCES habits (id),
+    date DATE NOT NULL,
+    completed BOOLEAN NOT NULL,
+    completed_at DATE NOT NULL
+);
+"""
+
+
+def create_unversioned_database(path) -> None:
+    """
+    Create a database file with the unversioned schema and some duplicated habits.
+    """
+
+    with sqlite3.connect(path) as conn:
+        conn.executescript(UNVERSIONED_SCHEMA)
+        conn.executemany(
+            "INSERT INTO habits (id, name, type, start_date) VALUES (?, ?, 'boolean', '2023-01-01')",
+            [(1, "Read"), (2, "Run"), (3, "Read")],
+        )
+        conn.executemany(
+            "INSERT INTO habit_logs (habit_id, date, completed, completed_at) VALUES (?, '2023-01-02', 1, '2023-01-02')",
+            [(1,), (2,), (3,)],
+        )
+    conn.close()
+
+
+def get_index_names(engine, table_name: str) -> set[str]:
+    return {index["name"] for index in inspect(engine).get_indexes(table_name)}
+
+
+def test_new_database_is_created_at_latest_version():
+    """
+    Test that a new database gets the lookup indexes and the latest schema version.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        engine = sess.get_bind()
+        assert "ix_habits_name" in get_index_names(engine, "habits")
+        assert "ix_habit_logs_habit_id_date" in get_index_names(engine, "habit_logs")
+
+        version = sess.connection().exec_driver_sql("PRAGMA user_version").scalar()
+        assert version == SCHEMA_VERSION
+
+
+def test_unversioned_database_is_upgraded_in_place(tmp_path):
+    """
+    Test that an existing database is upgraded and duplicated habits are merged.
+    """
+
+    db_path = tmp_path / "ritmo.db"
+    create_unversioned_database(db_path)
+
+    local_session = create_session(f"sqlite:///{db_path}")
+    with local_session() as sess:
+        engine = sess.get_bind()
+        assert "ix_habits_name" in get_index_names(engine, "habits")
+        assert "ix_habit_logs_habit_id_date" in get_index_names(engine, "habit_logs")
+
+        habits = sess.query(Habit).order_by(Habit.id).all()
+        assert [habit.name for habit in habits] == ["Read", "Run"]
+
+        read_log = sess.query(HabitLog).filter(HabitLog.habit_id == 1).one()
+        assert read_log.count == 2
+
+        read_stats = sess.get(HabitStats, 1)
+        assert read_stats.completed_days == 1
+        assert read_stats.current_streak == 1
+
+    with sqlite3.connect(db_path) as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    assert version == SCHEMA_VERSION
+
+
+def test_up_to_date_database_is_not_migrated(tmp_path):
+    """
+    Test that opening an up to date database only reads its schema version.
+    """
+
+    db_path = tmp_path / "ritmo.db"
+    create_session(f"sqlite:///{db_path}")
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    migrate(engine)
+
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_logs_are_merged_into_one_log_per_day(tmp_path):
+    """
+    Test that a database storing one log per completion gets one log per habit and day.
+    """
+
+    db_path = tmp_path / "ritmo.db"
+    create_session(f"sqlite:///{db_path}")
+    dispose_engines()
+
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(
+            """
+            DROP INDEX ix_habit_logs_habit_id_date;
+            CREATE INDEX ix_habit_logs_habit_id_date ON habit_logs (habit_id, date);
+            INSERT INTO habits (id, name, type, start_date)
+            VALUES (1, 'Water', 'numerical', '2023-01-01');
+            PRAGMA user_version = 3;
+            """
+        )
+        conn.executemany(
+            "INSERT INTO habit_logs (habit_id, date, completed, completed_at) VALUES (1, ?, 1, ?)",
+            [("2023-01-01", "2023-01-01")] * 3 + [("2023-01-02", "2023-01-03")],
+        )
+    conn.close()
+
+    local_session = create_session(f"sqlite:///{db_path}")
+    with local_session() as sess:
+        logs = sess.execute(
+            select(HabitLog.id, HabitLog.date, HabitLog.count).order_by(HabitLog.id)
+        ).all()
+        assert logs == [
+            (3, datetime.date(2023, 1, 1), 3),
+            (4, datetime.date(2023, 1, 2), 1),
+        ]
+        archived_ids = sess.scalars(select(HabitLogArchive.id)).all()
+        assert sorted(archived_ids) == [1, 2, 3]
+
+        with pytest.raises(IntegrityError):
+            sess.execute(
+                insert(HabitLog),
+                {
+                    "habit_id": 1,
+                    "date": datetime.date(2023, 1, 2),
+                    "completed_at": datetime.date(2023, 1, 2),
+                },
+            )
+
+
+def test_habit_deletes_cascade_after_upgrade(tmp_path):
+    """
+    Test that upgraded tables delete the logs and rollups of a habit along with it.
+    """
+
+    db_path = tmp_path / "ritmo.db"
+    create_unversioned_database(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO habit_logs (habit_id, date, completed, completed_at) VALUES (9, '2023-01-02', 1, '2023-01-02')"
+        )
+    conn.close()
+
+    create_session(f"sqlite:///{db_path}")
+    dispose_engines()
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA foreign_keys = on")
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        conn.execute("DELETE FROM habits WHERE name = 'Read'")
+        for table in ("habit_logs", "habit_stats", "habit_daily_counts"):
+            habit_ids = conn.execute(f"SELECT DISTINCT habit_id FROM {table}")
+            assert habit_ids.fetchall() == [(2,)]
+    conn.close()
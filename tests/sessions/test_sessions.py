@@ -0,0 +1,74 @@
+import pytest
+
+from ritmo.sessions import create_memory_session, dispose_engines, get_engine
+from ritmo.sessions.settings import get_sqlite_pragmas
+
+
+@pytest.fixture(autouse=True)
+def cached_engines():
+    yield
+    dispose_engines()
+
+
+def get_pragma(engine, pragma: str):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+
+
+def test_file_engines_are_cached(tmp_path):
+    """
+    Test that engines for file databases are reused across calls.
+    """
+
+    path = f"sqlite:///{tmp_path / 'ritmo.db'}"
+
+    assert get_engine(path) is get_engine(path)
+
+
+def test_memory_engines_are_not_shared():
+    """
+    Test that every in-memory session gets its own database.
+    """
+
+    first_session = create_memory_session()
+    second_session = create_memory_session()
+
+    assert first_session.kw["bind"] is not second_session.kw["bind"]
+
+
+def test_sqlite_pragmas_are_set_on_connect(tmp_path):
+    """
+    Test that the tuned PRAGMAs are applied to file database connections.
+    """
+
+    engine = get_engine(f"sqlite:///{tmp_path / 'ritmo.db'}")
+
+    assert get_pragma(engine, "journal_mode") == "wal"
+    assert get_pragma(engine, "synchronous") == 1
+    assert get_pragma(engine, "temp_store") == 2
+    assert get_pragma(engine, "busy_timeout") == 5000
+
+
+def test_sqlite_pragmas_can_be_overridden(tmp_path, monkeypatch):
+    """
+    Test that PRAGMAs can be overridden with environment variables.
+    """
+
+    monkeypatch.setenv("RITMO_SQLITE_JOURNAL_MODE", "delete")
+    monkeypatch.setenv("RITMO_SQLITE_SYNCHRONOUS", "full")
+
+    engine = get_engine(f"sqlite:///{tmp_path / 'ritmo.db'}")
+
+    assert get_pragma(engine, "journal_mode") == "delete"
+    assert get_pragma(engine, "synchronous") == 2
+
+
+def test_invalid_sqlite_pragma_value(monkeypatch):
+    """
+    Test that PRAGMA values that could inject SQL are rejected.
+    """
+
+    monkeypatch.setenv("RITMO_SQLITE_CACHE_SIZE", "1; DROP TABLE habits")
+
+    with pytest.raises(ValueError):
+        get_sqlite_pragmas()
@@ -0,0 +1,183 @@
+import datetime
+import os
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+import ritmo.snapshot.snapshot
+from ritmo.cli import cli
+from ritmo.commands.add_habit import add_habit
+from ritmo.service import mark_many_as_done
+from ritmo.sessions import create_memory_session
+from ritmo.snapshot import (
+    format_prompt,
+    get_today_habits,
+    read_snapshot,
+    record_done,
+    update_snapshot,
+    write_snapshot,
+)
+from ritmo.snapshot.refresh import refresh_snapshot, refresh_snapshot_habits
+
+TODAY = "2024-01-02"
+HABITS = [("boolean", 0, "Read"), ("numerical", 2, "Water")]
+
+
+def test_snapshot_rolls_over_at_midnight(tmp_path, monkeypatch):
+    """
+    Test that a snapshot of a previous day is read as today with no habit done.
+    """
+
+    path = str(tmp_path / "snapshot.tsv")
+    write_snapshot(path, TODAY, HABITS)
+    assert read_snapshot(path) == (TODAY, HABITS)
+
+    monkeypatch.setattr(ritmo.snapshot.snapshot, "get_today", lambda: TODAY)
+    assert get_today_habits(path) == HABITS
+
+    monkeypatch.setattr(ritmo.snapshot.snapshot, "get_today", lambda: "2024-01-03")
+    assert get_today_habits(path) == [("boolean", 0, "Read"), ("numerical", 0, "Water")]
+    assert format_prompt(get_today_habits(path), "{done}/{total} {pending}") == (
+        "0/2 Read,Water"
+    )
+
+
+def test_journaled_completions_update_the_snapshot(tmp_path, monkeypatch):
+    """
+    Test that completions of today are added like done, and other days are ignored.
+    """
+
+    path = str(tmp_path / "snapshot.tsv")
+    monkeypatch.setattr(ritmo.snapshot.snapshot, "get_today", lambda: TODAY)
+
+    record_done(path, ["Read"], TODAY)
+    assert read_snapshot(path) is None
+
+    write_snapshot(path, TODAY, HABITS)
+    record_done(path, ["Read", "Water", "Run"], TODAY)
+    record_done(path, ["Read", "Water"], TODAY)
+    record_done(path, ["Water"], "2024-01-01")
+    assert read_snapshot(path) == (
+        TODAY,
+        [("boolean", 1, "Read"), ("numerical", 4, "Water")],
+    )
+
+
+def test_snapshot_is_refreshed_from_the_database(tmp_path):
+    """
+    Test that refreshing the snapshot writes today's logs of every habit.
+    """
+
+    path = str(tmp_path / "snapshot.tsv")
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Read", None, None, None, None)
+        add_habit(sess, "Water", None, "numerical", None, None)
+        today = datetime.datetime.utcnow().date()
+        mark_many_as_done(sess, ["Water"], [today])
+        mark_many_as_done(sess, ["Water"], [today])
+        refresh_snapshot(sess, path)
+
+    assert read_snapshot(path) == (today.isoformat(), HABITS)
+
+
+def test_snapshot_habits_are_updated_from_the_database(tmp_path):
+    """
+    Test that refreshing some habits rewrites their state only, and that nothing is
+    written without a snapshot to update.
+    """
+
+    path = str(tmp_path / "snapshot.tsv")
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        add_habit(sess, "Read", None, None, None, None)
+        add_habit(sess, "Water", None, "numerical", None, None)
+        today = datetime.datetime.utcnow().date()
+        mark_many_as_done(sess, ["Read", "Water"], [today])
+
+        refresh_snapshot_habits(sess, ["Read"], path)
+        assert read_snapshot(path) is None
+
+        write_snapshot(path, today.isoformat(), HABITS)
+        refresh_snapshot_habits(sess, ["Read"], path)
+
+    assert read_snapshot(path) == (
+        today.isoformat(),
+        [("boolean", 1, "Read"), ("numerical", 2, "Water")],
+    )
+
+
+def test_snapshot_is_updated(tmp_path, monkeypatch):
+    """
+    Test replacing, adding and removing habits of a snapshot.
+    """
+
+    path = str(tmp_path / "snapshot.tsv")
+    monkeypatch.setattr(ritmo.snapshot.snapshot, "get_today", lambda: TODAY)
+
+    update_snapshot(path, ["Read"], [("boolean", 1, "Read")])
+    assert read_snapshot(path) is None
+
+    write_snapshot(path, TODAY, HABITS)
+    update_snapshot(
+        path,
+        ["Water", "Run", "Read"],
+        [("numerical", 3, "Water"), ("boolean", 1, "Run")],
+    )
+    assert read_snapshot(path) == (
+        TODAY,
+        [("numerical", 3, "Water"), ("boolean", 1, "Run")],
+    )
+
+
+def test_commands_update_the_snapshot_rows_they_change(tmp_path, monkeypatch):
+    """
+    Test that adding, renaming, deleting habits and importing logs update the rows of
+    these habits in the snapshot instead of removing it.
+    """
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("RITMO_NO_DAEMON", "1")
+    path = str(tmp_path / ".ritmo" / "snapshot.tsv")
+    today = datetime.datetime.utcnow().date().isoformat()
+    runner = CliRunner()
+
+    runner.invoke(cli, ["add", "Read"])
+    runner.invoke(cli, ["add", "Water", "--type", "numerical"])
+    assert runner.invoke(cli, ["prompt"]).output == "0/2\n"
+
+    runner.invoke(cli, ["add", "Run"])
+    runner.invoke(cli, ["update", "Read", "--new-name", "Study"])
+    runner.invoke(cli, ["delete", "Water"])
+    logs = tmp_path / "logs.csv"
+    logs.write_text(f"habit,date\nRun,{today}\nStudy,2020-01-01\n")
+    runner.invoke(cli, ["import", str(logs)])
+
+    assert read_snapshot(path) == (
+        today,
+        [("boolean", 1, "Run"), ("boolean", 0, "Study")],
+    )
+
+
+def test_prompt_does_not_import_the_cli(tmp_path):
+    """
+    Test that `ritmo prompt` reads the snapshot without importing click, SQLAlchemy or Rich.
+    """
+
+    write_snapshot(str(tmp_path / ".ritmo" / "snapshot.tsv"), TODAY, HABITS)
+    code = (
+        "import sys; from ritmo.main import run_fast_path;"
+        "assert run_fast_path(['prompt', '--format', '{total}:{pending}']) == 0;"
+        "print(sorted(m for m in sys.modules"
+        " if m.startswith(('click', 'sqlalchemy', 'rich'))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "HOME": str(tmp_path)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.splitlines() == ["2:Read,Water", "[]"]
@@ -0,0 +1,208 @@
+import datetime
+
+from ritmo.commands.add_habit import add_habit
+from ritmo.commands.import_logs import import_logs
+from ritmo.models import Habit, HabitLog, HabitStats
+from ritmo.service import upsert_logs
+from ritmo.sessions import create_memory_session
+from ritmo.stats import (
+    check_rollups,
+    compute_streaks,
+    get_stats,
+    rebuild_rollups,
+    record_done,
+    record_undone,
+)
+
+FIRST_DAY = datetime.date(2023, 1, 1)
+
+
+def log_done(sess, habit_id: int, day: int) -> None:
+    date = FIRST_DAY + datetime.timedelta(days=day)
+    sess.execute(
+        upsert_logs(), {"habit_id": habit_id, "date": date, "completed_at": date}
+    )
+    record_done(sess, habit_id, date)
+    sess.commit()
+
+
+def log_undone(sess, habit_id: int, day: int) -> None:
+    date = FIRST_DAY + datetime.timedelta(days=day)
+    habit_log = (
+        sess.query(HabitLog)
+        .filter(HabitLog.habit_id == habit_id, HabitLog.date == date)
+        .first()
+    )
+    if habit_log.count > 1:
+        habit_log.count -= 1
+    else:
+        sess.delete(habit_log)
+    record_undone(sess, habit_id, date)
+    sess.commit()
+
+
+def create_habit(sess, name: str = "Test habit") -> int:
+    add_habit(sess, name, None, "numerical", None, None)
+    return sess.query(Habit.id).filter(Habit.name == name).scalar()
+
+
+def test_compute_streaks():
+    """
+    Test computing the current and longest streaks from the completed days.
+    """
+
+    days = [0, 1, 2, 5, 6, 9]
+    dates = [FIRST_DAY + datetime.timedelta(days=day) for day in days]
+
+    assert compute_streaks(dates) == (1, 3, dates[-1])
+    assert compute_streaks([]) == (0, 0, None)
+
+
+def test_record_done_updates_streaks_incrementally():
+    """
+    Test that completing a habit on consecutive days extends its streak.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        habit_id = create_habit(sess)
+
+        for day in [0, 1, 1, 2, 4, 5]:
+            log_done(sess, habit_id, day)
+
+        stats = sess.get(HabitStats, habit_id)
+        assert stats.current_streak == 2
+        assert stats.longest_streak == 3
+        assert stats.last_completed == FIRST_DAY + datetime.timedelta(days=5)
+        assert stats.completed_days == 5
+        assert check_rollups(sess) == []
+
+
+def test_record_done_on_a_past_day():
+    """
+    Test that completing a habit on a day before the last completed one joins both streaks.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        habit_id = create_habit(sess)
+
+        for day in [0, 1, 3, 4, 2]:
+            log_done(sess, habit_id, day)
+
+        stats = sess.get(HabitStats, habit_id)
+        assert stats.current_streak == 5
+        assert stats.longest_streak == 5
+        assert check_rollups(sess) == []
+
+
+def test_record_undone_recomputes_streaks():
+    """
+    Test that removing the only completion of a day breaks the streak.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        habit_id = create_habit(sess)
+
+        for day in [0, 1, 1, 2]:
+            log_done(sess, habit_id, day)
+
+        log_undone(sess, habit_id, 1)
+        assert sess.get(HabitStats, habit_id).longest_streak == 3
+
+        log_undone(sess, habit_id, 1)
+        stats = sess.get(HabitStats, habit_id)
+        assert stats.current_streak == 1
+        assert stats.longest_streak == 1
+        assert stats.completed_days == 2
+        assert check_rollups(sess) == []
+
+
+def test_record_undone_of_last_completed_days():
+    """
+    Test that removing the last completed days one after another keeps the streaks right.
+    """
+
+    days = [0, 1, 2, 5, 6, 7, 8, 10]
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        habit_id = create_habit(sess)
+        for day in days:
+            log_done(sess, habit_id, day)
+
+        for day in reversed(days):
+            log_undone(sess, habit_id, day)
+            assert check_rollups(sess) == []
+
+        stats = sess.get(HabitStats, habit_id)
+        assert (stats.current_streak, stats.longest_streak) == (0, 0)
+        assert stats.last_completed is None
+
+
+def test_import_logs_updates_rollups():
+    """
+    Test that importing logs in batches keeps the rollups consistent.
+    """
+
+    rows = [
+        {"habit": "Test habit", "date": f"2023-01-{day:02}"} for day in [3, 1, 2, 2, 7]
+    ]
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        habit_id = create_habit(sess)
+
+        import_logs(sess, rows, batch_size=2)
+
+        stats = sess.get(HabitStats, habit_id)
+        assert stats.longest_streak == 3
+        assert stats.current_streak == 1
+        assert stats.completed_days == 4
+        assert check_rollups(sess) == []
+
+
+def test_rebuild_rollups_fixes_inconsistencies():
+    """
+    Test that inconsistent rollups are detected and rebuilt from the habit logs.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        habit_id = create_habit(sess)
+        for day in [0, 1]:
+            log_done(sess, habit_id, day)
+
+        sess.get(HabitStats, habit_id).longest_streak = 10
+        sess.commit()
+        assert check_rollups(sess) == ["Test habit"]
+
+        rebuild_rollups(sess)
+        sess.commit()
+        assert check_rollups(sess) == []
+        assert sess.get(HabitStats, habit_id).longest_streak == 2
+
+
+def test_get_stats_as_of_a_day():
+    """
+    Test that the current streak is broken when the habit was not completed yesterday.
+    """
+
+    mem_session = create_memory_session()
+    with mem_session() as sess:
+        habit_id = create_habit(sess)
+        create_habit(sess, "Other habit")
+        for day in [0, 1, 2]:
+            log_done(sess, habit_id, day)
+
+        stats = {
+            habit_stats["name"]: habit_stats
+            for habit_stats in get_stats(sess, FIRST_DAY + datetime.timedelta(days=3))
+        }
+        assert stats["Test habit"]["current_streak"] == 3
+        assert stats["Other habit"]["current_streak"] == 0
+
+        stats = get_stats(sess, FIRST_DAY + datetime.timedelta(days=4))
+        assert stats[1]["current_streak"] == 0
+        assert stats[1]["longest_streak"] == 3
@@ -0,0 +1,176 @@
+import datetime
+
+import pytest
+
+from ritmo.commands.add_habit import add_habit
+from ritmo.commands.date_log import get_by_date
+from ritmo.commands.done_habit import mark_as_done
+from ritmo.commands.update_habit import update_habit
+from ritmo.service import DayLogRow, HabitNotFoundError, HabitRow, ServiceError
+from ritmo.sessions import create_memory_session
+from ritmo.storage import LogRow, LogStorage, MemoryStorage, SQLAlchemyStorage
+
+DAY = datetime.date(2024, 1, 1)
+
+
+def habit(name: str, type: str = "boolean", start_date=DAY, end_date=None):
+    return HabitRow(name, None, type, start_date, end_date)
+
+
+@pytest.fixture(params=["sqlalchemy", "memory", "log"])
+def store(request, tmp_path):
+    if request.param == "sqlalchemy":
+        with create_memory_session()() as sess:
+            yield SQLAlchemyStorage(sess)
+    elif request.param == "memory":
+        yield MemoryStorage()
+    else:
+        store = LogStorage(tmp_path / "ritmo.log")
+        yield store
+        store.close()
+
+
+def test_habits_are_put_and_replaced(store):
+    """
+    Test adding habits, and replacing them by name while keeping their logs.
+    """
+
+    assert store.put_habit(habit("Read"))
+    assert not store.put_habit(habit("Read", "numerical"))
+    assert store.get_habit("Read") == habit("Read")
+    assert store.get_habit("Run") is None
+
+    store.append_logs(["Read"], [DAY])
+    assert store.put_habit(habit("Reading", end_date=DAY), "Read")
+    assert store.get_habit("Read") is None
+    assert store.get_habit("Reading") == habit("Reading", end_date=DAY)
+    assert list(store.iter_day_logs(DAY)) == [DayLogRow("Reading", "boolean", 1)]
+
+    store.put_habit(habit("Run"))
+    with pytest.raises(ServiceError):
+        store.put_habit(habit("Run"), "Reading")
+    with pytest.raises(HabitNotFoundError):
+        store.put_habit(habit("Walk"), "Walk")
+    with pytest.raises(ServiceError):
+        store.put_habit(habit(" "))
+    with pytest.raises(ServiceError):
+        store.put_habit(habit("Walk", end_date=DAY - datetime.timedelta(1)))
+
+
+def test_habits_are_sorted_and_paginated(store):
+    """
+    Test that every storage sorts, filters and paginates habits like the database.
+    """
+
+    store.put_habit(habit("b", end_date=DAY + datetime.timedelta(2)))
+    store.put_habit(habit("a", start_date=DAY + datetime.timedelta(1)))
+    store.put_habit(habit("c", end_date=DAY + datetime.timedelta(1)))
+    store.put_habit(habit("ab"))
+
+    def names(*args):
+        return [habit.name for habit in store.iter_habits(*args)]
+
+    assert names() == ["a", "ab", "b", "c"]
+    assert names("start-date") == ["b", "c", "ab", "a"]
+    assert names("start-date", True) == ["a", "b", "c", "ab"]
+    assert names("end-date") == ["c", "b", "a", "ab"]
+    assert names("end-date", True) == ["a", "ab", "b", "c"]
+    assert names("name", False, 2, 1) == ["ab", "b"]
+    assert names("name", False, None, 0, "A") == ["a", "ab"]
+
+
+def test_logs_are_appended_and_removed(store):
+    """
+    Test that boolean habits are done once a day, numerical habits count their
+    completions, and removing completions drops emptied logs.
+    """
+
+    store.put_habit(habit("Read"))
+    store.put_habit(habit("Water", "numerical"))
+    days = [DAY, DAY + datetime.timedelta(1)]
+
+    assert store.append_logs(["Read", "Water", "Run"], days) == {
+        "Read": 2,
+        "Water": 2,
+        "Run": None,
+    }
+    assert store.append_logs(["Read", "Water"], [DAY, DAY]) == {"Read": 0, "Water": 1}
+    assert store.remove_logs(["Water", "Run"], days, times=2) == {
+        "Water": 3,
+        "Run": None,
+    }
+    assert list(store.scan_logs(DAY, days[-1])) == [
+        LogRow("Read", DAY, 1),
+        LogRow("Read", days[1], 1),
+    ]
+
+    with pytest.raises(ServiceError):
+        store.remove_logs(["Read"], [DAY], times=0)
+
+
+def test_logs_are_scanned_and_counted_by_range(store):
+    """
+    Test that scans are ordered by day then by habit, and counts cover a range.
+    """
+
+    store.put_habit(habit("Water", "numerical"))
+    store.put_habit(habit("Read"))
+    days = [DAY + datetime.timedelta(offset) for offset in range(5)]
+    store.append_logs(["Read"], days[1:4])
+    store.append_logs(["Water"], days[::2])
+    store.append_logs(["Water"], [days[2]])
+
+    assert list(store.scan_logs(days[1], days[2])) == [
+        LogRow("Read", days[1], 1),
+        LogRow("Water", days[2], 2),
+        LogRow("Read", days[2], 1),
+    ]
+    assert list(store.scan_logs(days[0], days[4], ["Read"])) == [
+        LogRow("Read", day, 1) for day in days[1:4]
+    ]
+    assert store.count_logs(days[2], days[4]) == {"Water": 3, "Read": 2}
+    assert store.count_logs(days[4] + datetime.timedelta(1), days[4]) == {}
+
+
+def test_deleting_habits_deletes_their_logs(store):
+    """
+    Test deleting habits by name and by glob pattern.
+    """
+
+    for name in ("Read", "read-news", "read-book", "Run"):
+        store.put_habit(habit(name))
+    store.append_logs(["Read", "read-news", "Run"], [DAY])
+
+    assert sorted(store.delete_habits(["Read", "Walk"], "read-*")) == [
+        "Read",
+        "read-book",
+        "read-news",
+    ]
+    assert list(store.scan_logs(DAY, DAY)) == [LogRow("Run", DAY, 1)]
+
+    store.put_habit(habit("Read"))
+    assert list(store.iter_day_logs(DAY)) == [
+        DayLogRow("Run", "boolean", 1),
+        DayLogRow("Read", "boolean", 0),
+    ]
+
+
+def test_commands_run_on_every_storage(store, capsys):
+    """
+    Test that the commands print the same output whatever the storage.
+    """
+
+    add_habit(store, "Read", None, None, None, None)
+    add_habit(store, "Water", "Glasses", "numerical", None, None)
+    update_habit(store, "Read", "Reading", None, None, None, None)
+    mark_as_done(store, "Water")
+    mark_as_done(store, "Water")
+    mark_as_done(store, "Run")
+    get_by_date(store, datetime.datetime.utcnow(), "tsv")
+
+    assert capsys.readouterr().out == (
+        "Habit 'Run' not found.\n"
+        "name\ttype\ttimes_done\n"
+        "Reading\tboolean\t0\n"
+        "Water\tnumerical\t2\n"
+    )
@@ -0,0 +1,86 @@
+import datetime
+import subprocess
+import sys
+
+import ritmo.storage.log
+from ritmo.domain import HabitRow
+from ritmo.storage import LogRow, LogStorage
+
+DAY = datetime.date(2024, 1, 1)
+
+
+def test_log_is_replayed_when_opened(tmp_path):
+    """
+    Test that reopening a log restores habits, renames, deletes and logs, dropping a
+    last record cut short.
+    """
+
+    path = tmp_path / "ritmo.log"
+    store = LogStorage(path)
+    store.put_habit(HabitRow("Read", None, "boolean", DAY, None))
+    store.put_habit(HabitRow("Water", None, "numerical", DAY, None))
+    store.put_habit(HabitRow("Run", None, "boolean", DAY, None))
+    store.append_logs(["Read", "Water"], [DAY])
+    store.append_logs(["Water"], [DAY])
+    store.put_habit(HabitRow("Reading", "Books", "boolean", DAY, None), "Read")
+    store.delete_habits(["Run"])
+    store.close()
+
+    with open(path, "a") as file:
+        file.write('["log","Water",')
+
+    store = LogStorage(path)
+    assert store.get_habit("Reading") == HabitRow(
+        "Reading", "Books", "boolean", DAY, None
+    )
+    assert store.get_habit("Run") is None
+    assert list(store.scan_logs(DAY, DAY)) == [
+        LogRow("Reading", DAY, 1),
+        LogRow("Water", DAY, 2),
+    ]
+
+    store.remove_logs(["Water"], [DAY])
+    store.close()
+    assert list(LogStorage(path).scan_logs(DAY, DAY))[-1] == LogRow("Water", DAY, 1)
+
+
+def test_log_is_compacted(tmp_path, monkeypatch):
+    """
+    Test that a log holding many records per live one is rewritten when opened.
+    """
+
+    monkeypatch.setattr(ritmo.storage.log, "MIN_COMPACTION_RECORDS", 10)
+    path = tmp_path / "ritmo.log"
+    store = LogStorage(path)
+    store.put_habit(HabitRow("Water", None, "numerical", DAY, None))
+    for _ in range(20):
+        store.append_logs(["Water"], [DAY])
+        store.remove_logs(["Water"], [DAY])
+    store.append_logs(["Water"], [DAY, DAY + datetime.timedelta(1)])
+    store.close()
+
+    store = LogStorage(path)
+    assert store.records == 3
+    assert len(path.read_text().splitlines()) == 3
+    assert store.count_logs(DAY, DAY + datetime.timedelta(1)) == {"Water": 2}
+
+    store.append_logs(["Water"], [DAY])
+    store.close()
+    assert LogStorage(path).count_logs(DAY, DAY) == {"Water": 2}
+
+
+def test_log_storage_does_not_import_sqlalchemy(tmp_path):
+    """
+    Test that the storages not using SQL do not import SQLAlchemy.
+    """
+
+    code = (
+        "import sys; from ritmo.storage import LogStorage, MemoryStorage;"
+        f"LogStorage({str(tmp_path / 'ritmo.log')!r}).close();"
+        "print(sorted(m for m in sys.modules if m.startswith('sqlalchemy')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.splitlines() == ["[]"]
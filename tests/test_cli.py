@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from ritmo.cli import cli
+
+
+def test_cli_lists_every_command():
+    """
+    Test that the help lists every lazily loaded command.
+    """
+
+    result = CliRunner().invoke(cli, ["--help"])
+
+    assert result.exit_code == 0
+    for name in cli.lazy_commands:
+        assert name in result.output
+
+
+def test_cli_import_does_not_load_commands():
+    """
+    Test that importing the CLI does not import any command module or their dependencies.
+    """
+
+    code = (
+        "import sys, ritmo.cli;"
+        "print(sorted(m for m in sys.modules"
+        " if m.startswith(('ritmo.commands.', 'sqlalchemy', 'rich'))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_cli_dispatch_loads_only_the_command_module():
+    """
+    Test that dispatching a command imports its module and not the others.
+    """
+
+    code = (
+        "import sys, click, ritmo.cli;"
+        "ctx = click.Context(ritmo.cli.cli);"
+        "ritmo.cli.cli.get_command(ctx, 'done');"
+        "print(sorted(m for m in sys.modules if m.startswith('ritmo.commands.')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "['ritmo.commands.done_habit']"